@@ -1,31 +1,184 @@
+"""NAMM-50 strategy backtests per symbol -> docs/backtests.json.
 
-import os, json
-import pandas as pd
+    python backtest_runner.py --start 2015-01-01 --version v1.6.1 --out docs/backtests.json \\
+        --registry docs/am_registry.json --symbols TQQQ,SOXL
+
+Daily closes come from the local price store (only the missing tail is fetched). Each
+symbol is backtested with the published model weights on the factor z-scores the
+weight search ranks on (models.namm50.train.load_z_frame: each factor's rolling z over
+its own rows, placed on the session it becomes known), in a process pool. Equity and
+metrics start at --start. Rolling Sharpe / Sortino / vol over 63 and 252 sessions, drawdown and days
+under water come from core.metrics as one columnar `rolling` block per symbol. The
+first symbol fills the `models.namm50` summary fields; every symbol is under
+`models.namm50.symbols`.
+"""
+import os, sys, time, argparse
 import numpy as np
-from core.utils import ensure_dir, ts_now_iso, write_json
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from core.utils import ts_now_iso, read_json, series_rows
+from core.artifacts import write_artifact, report
+from core.backtest import walk_forward
+from core import metrics, costs, perf
+from core.shared_panel import SharedPanel, init_worker, worker_panel
+from core.price_store import get_store
+from models.namm50 import signal
 
-PRICES_JSON = "docs/prices.json"
 OUT_JSON = "docs/backtests.json"
+REGISTRY_JSON = "docs/am_registry.json"
+START = "2015-01-01"
+SYMBOLS = "TQQQ,SOXL"
+SHARPE_WINDOW = 63
+WINDOWS = (SHARPE_WINDOW, 252)
+# every metrics.scalars key, for symbols with too few days to measure
+EMPTY_METRICS = dict.fromkeys(metrics.summary(np.zeros(1)), None)
+WORKERS = int(os.environ.get("BACKTEST_WORKERS", "0")) or os.cpu_count() or 1
+
+
+def load_weights(path: str = signal.MODEL) -> dict:
+    from models.namm50.train import DEFAULT_WEIGHTS
+    w = read_json(path, {}).get("weights") or {}
+    w = {k: float(v) for k, v in w.items() if isinstance(v, (int, float))}
+    return w or dict(DEFAULT_WEIGHTS)
+
+
+def load_history(symbol: str) -> pd.Series:
+    from models.namm50.train import fetch_alpha_daily
+    return fetch_alpha_daily(symbol, os.getenv("ALPHAVANTAGE_API_KEY", ""), outputsize="full")
+
+
+def backtest_symbol(close: pd.Series, factors: pd.DataFrame, weights: dict, start: str,
+                    cost_bps: float = 0.0) -> dict:
+    """Equity curve, rolling Sharpe and metrics of the model on one close series, net of
+    `cost_bps` per unit turnover (gross metrics and turnover alongside). `factors` holds
+    z-scores (see models.namm50.train.load_z_frame)."""
+    t0 = time.perf_counter()
+    bt = walk_forward(factors, close, weights, mode="none", keep_returns=True, cost_bps=cost_bps,
+                      band=costs.BAND, min_trade=costs.MIN_TRADE)
+    keep = bt["index"] >= pd.Timestamp(start)
+    # turnover traded at close t is paid out of day t+1's return
+    paid = np.zeros(len(keep))
+    paid[1:] = bt["turnover_path"][0][:-1]
+    paid = paid[keep]
+    ret = bt["returns"][0][keep]
+    gross = ret + paid * (cost_bps / 1e4)
+    idx = bt["index"][keep]
+    equity = np.cumprod(1.0 + ret)
+    roll = metrics.payload(idx, ret, windows=WINDOWS)
+    out = {
+        "days": int(len(ret)),
+        "equity_curve": series_rows(pd.Series(np.round(equity, 6), index=idx)),
+        "rolling_sharpe_63d": [list(r) for r in zip(roll["dates"], roll[f"sharpe_{SHARPE_WINDOW}"])],
+        "metrics": metrics.scalars(ret) if len(ret) > 1 else dict(EMPTY_METRICS),
+        "gross": metrics.scalars(gross) if len(ret) > 1 else dict(EMPTY_METRICS),
+        "costs": {"bps": round(cost_bps, 3), "band": costs.BAND, "min_trade": costs.MIN_TRADE,
+                  "turnover": round(float(paid.sum() / max(len(ret), 1) * metrics.ANN), 3),
+                  "cost_drag": round(float(paid.sum() * cost_bps / 1e4 / max(len(ret), 1) * metrics.ANN), 6)},
+        "rolling": roll,
+    }
+    out["seconds"] = round(time.perf_counter() - t0, 4)
+    return out
+
+
+_shared = {}
+
+
+def _init_worker(spec, weights, start):
+    # factors and closes are attached from shared memory, not pickled into each worker
+    init_worker(spec)
+    _shared.update(weights=weights, start=start)
+
+
+def _pool_job(symbol):
+    panel = worker_panel()
+    return backtest_symbol(panel.get(f"close:{symbol}"), panel.get("factors"), _shared["weights"],
+                           _shared["start"], costs.trade_bps(symbol))
+
+
+@perf.step("backtests")
+def run(symbols, start: str, factors: pd.DataFrame, weights: dict, loader=None,
+        workers: int = WORKERS) -> dict:
+    """{symbol: result | {"error": ...}}; histories are loaded here, backtests run in the pool."""
+    loader = loader or load_history
+    results, jobs = {}, []
+    for sym in symbols:
+        try:
+            close = loader(sym)
+        except Exception as e:
+            print(f"[warn] {sym}: no price history: {e}")
+            results[sym] = {"error": str(e)}
+            continue
+        if close is None or close[close.index >= pd.Timestamp(start)].empty:
+            results[sym] = {"error": f"no prices since {start}"}
+            continue
+        jobs.append((sym, close))
+    if workers > 1 and len(jobs) > 1:
+        items = {"factors": factors, **{f"close:{s}": c for s, c in jobs}}
+        with SharedPanel.create(items) as panel, \
+                ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                                    initargs=(panel.spec, weights, start)) as ex:
+            done = list(ex.map(_pool_job, [s for s, _ in jobs]))
+    else:
+        done = [backtest_symbol(c, factors, weights, start, costs.trade_bps(s)) for s, c in jobs]
+    for (sym, _), res in zip(jobs, done):
+        results[sym] = res
+        m = res["metrics"]
+        print(f"[backtest] {sym}: {res['days']} days in {res['seconds'] * 1e3:.1f} ms, "
+              f"ann_return={m['ann_return']} max_dd={m['max_dd']} sharpe={m['sharpe']} "
+              f"(gross {res['gross']['sharpe']}, turnover {res['costs']['turnover']}x/yr)")
+    return {s: results[s] for s in symbols}
+
+
+def build_payload(results: dict, version: str, start: str, weights: dict) -> dict:
+    model = {"version": version, "start": start, "weights": weights,
+             "equity_curve": [], "rolling_sharpe_63d": [],
+             "metrics": dict(EMPTY_METRICS)}
+    primary = next((s for s, r in results.items() if "error" not in r), None)
+    if primary:
+        model["symbol"] = primary
+        for k in ("equity_curve", "rolling_sharpe_63d", "metrics"):
+            model[k] = results[primary][k]
+    model["symbols"] = results
+    return {"as_of": ts_now_iso(), "models": {"namm50": model}}
+
+
+def update_registry(path: str, version: str, start: str, symbols, weights: dict) -> None:
+    """Record which symbols, start date and weights each published version was run with."""
+    reg = read_json(path, {})
+    reg = reg if isinstance(reg, dict) else {}
+    versions = reg.get("versions") if isinstance(reg.get("versions"), dict) else {}
+    versions[version] = {"model": "namm50", "start": start, "symbols": list(symbols), "weights": weights}
+    write_artifact(path, {"as_of": ts_now_iso(), "latest": version, "versions": versions})
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backtest NAMM-50 on daily closes per symbol.")
+    ap.add_argument("--start", default=START)
+    ap.add_argument("--version", default="dev")
+    ap.add_argument("--out", default=OUT_JSON)
+    ap.add_argument("--registry", default="", help="version registry JSON to update")
+    ap.add_argument("--symbols", default=SYMBOLS, help="comma-separated")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    a = ap.parse_args(argv)
+    symbols = [s.strip().upper() for s in a.symbols.split(",") if s.strip()]
+    if not symbols:
+        ap.error("no symbols")
+    from models.namm50.train import load_z_frame
+    factors = load_z_frame()
+    weights = load_weights()
+    if factors.empty:
+        print(f"[warn] no factor history in {signal.FACT}; positions stay flat")
+    t0 = time.perf_counter()
+    results = run(symbols, a.start, factors, weights, workers=a.workers)
+    print(f"[backtest] {len(symbols)} symbols in {time.perf_counter() - t0:.2f}s (workers={a.workers})")
+    write_artifact(a.out, build_payload(results, a.version, a.start, weights))
+    if a.registry:
+        update_registry(a.registry, a.version, a.start, symbols, weights)
+    print(get_store().report())
+    print(report())
+    return 0 if any("error" not in r for r in results.values()) else 1
 
-def sharpe(series):
-    if len(series) < 2: return 0.0
-    rets = pd.Series(series).pct_change().dropna()
-    if rets.std(ddof=0) == 0 or rets.empty: return 0.0
-    return float(rets.mean() / rets.std(ddof=0))
-
-def main():
-    if not os.path.exists(PRICES_JSON):
-        write_json(OUT_JSON, {"as_of": ts_now_iso(), "error": "no prices.json"})
-        return
-    with open(PRICES_JSON, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    prices = data.get("prices", {})
-    sharpe_map = {}
-    for sym, rows in prices.items():
-        closes = [v for _, v in rows]
-        sharpe_map[sym] = round(sharpe(closes), 4)
-    out = {"as_of": ts_now_iso(), "model": "Backtest from docs/prices.json", "sharpe": sharpe_map}
-    write_json(OUT_JSON, out)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(perf.run("backtests", main))
@@ -0,0 +1,70 @@
+"""Point-in-time alignment of mixed-frequency sources onto the trading calendar:
+per-source pandas (shift dates by the lag, merge_asof onto sessions) vs core.calendar.asof_join.
+
+    python benchmarks/bench_calendar.py --sources 50 --years 25
+"""
+import os, sys, time, argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core import calendar
+import synthetic
+
+END = "2024-12-31"
+
+
+def pandas_join(series, index, lags):
+    out = {}
+    sess = pd.DataFrame({"date": index, "pos": np.arange(len(index))})
+    for k, s in series.items():
+        d, n = lags[k]
+        obs = pd.DataFrame({"avail": s.index + pd.Timedelta(days=d), "v": s.to_numpy()}).dropna()
+        # first session on or after the shifted date, then n sessions later
+        m = pd.merge_asof(obs.sort_values("avail"), sess, left_on="avail", right_on="date", direction="forward")
+        m = m.dropna(subset=["pos"])
+        m["pos"] = m["pos"].astype(int) + n
+        m = m[m["pos"] < len(index)].groupby("pos")["v"].last()
+        out[k] = pd.Series(m.to_numpy(), index=index[m.index]).reindex(index).ffill()
+    return pd.DataFrame(out, index=index)
+
+
+def best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sources", type=int, default=50)
+    ap.add_argument("--years", type=float, default=25)
+    ap.add_argument("--repeat", type=int, default=5)
+    a = ap.parse_args()
+    # daily (calendar-day, with weekends), weekly and monthly series with random gaps
+    freqs, lag_of = ["D", "B", "W-WED", "MS"], [(0, 1), (0, 0), (1, 0), (35, 0)]
+    names = [f"s{i:03d}" for i in range(a.sources)]
+    start = pd.Timestamp(END) - pd.DateOffset(years=int(a.years))
+    series = synthetic.walks(names, start=start, end=END, freq={k: freqs[i % 4] for i, k in enumerate(names)},
+                             missing=0.05)
+    lags = {k: lag_of[i % 4] for i, k in enumerate(names)}
+    rows = sum(len(s) for s in series.values())
+    index = calendar.sessions(min(s.index.min() for s in series.values()), END)
+
+    calendar._all_sessions.cache_clear()
+    t0 = time.perf_counter(); calendar.sessions("1990-01-01", "2040-12-31"); t_cal = time.perf_counter() - t0
+    ref = pandas_join(series, index, lags)
+    got = calendar.asof_join(series, index, lags)
+    pd.testing.assert_frame_equal(ref, got, check_names=False)
+
+    t_pd = best(lambda: pandas_join(series, index, lags), a.repeat)
+    t_np = best(lambda: calendar.asof_join(series, index, lags), a.repeat)
+    print(f"{a.sources} sources x {a.years:g} years: {rows} observations -> {len(index)} sessions x {a.sources}")
+    print(f"calendar table (1990-2040, built once): {t_cal * 1e3:8.2f} ms")
+    print(f"per-source merge_asof + ffill:          {t_pd * 1e3:8.2f} ms")
+    print(f"calendar.asof_join:                     {t_np * 1e3:8.2f} ms  ({t_pd / t_np:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Factor payload load time and size: nested-list JSON vs the columnar .npz copy.
+
+    python benchmarks/bench_factor_io.py --factors 20 --years 20
+"""
+import os, sys, json, time, argparse, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.utils import write_json
+from core.factor_io import write_npz, load_frame
+import synthetic
+
+
+def load_json_frame(path):
+    """Row-by-row parse into one DataFrame, as pipelines/train_models.load_factors does."""
+    with open(path, "r") as f:
+        fac = json.load(f)["factors"]
+    cols = {}
+    for fid, spec in fac.items():
+        df = pd.DataFrame([[r[0], r[1]] for r in spec["series"]], columns=["date", "value"])
+        df["date"] = pd.to_datetime(df["date"])
+        cols[fid] = df.set_index("date")["value"]
+    return pd.DataFrame(cols).sort_index()
+
+
+def best_of(fn, n=3):
+    ts = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        out = fn()
+        ts.append(time.perf_counter() - t0)
+    return min(ts), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--factors", type=int, default=20)
+    ap.add_argument("--years", type=float, default=20)
+    a = ap.parse_args()
+    factors = synthetic.walk_factors([f"factor_{i:02d}" for i in range(a.factors)], int(252 * a.years), level=50.0)
+    with tempfile.TemporaryDirectory() as d:
+        pj, pn = os.path.join(d, "f.json"), os.path.join(d, "f.npz")
+        t_wj, _ = best_of(lambda: write_json(pj, {"as_of": "", "factors": factors}, indent=2), 1)
+        t_wn, _ = best_of(lambda: write_npz(pn, factors), 1)
+        t_j, ref = best_of(lambda: load_json_frame(pj))
+        t_n, got = best_of(lambda: load_frame(pn))
+        t_c, _ = best_of(lambda: load_frame(pn, mmap=False))
+        sj, sn = os.path.getsize(pj), os.path.getsize(pn)
+    err = np.nanmax(np.abs(ref.to_numpy() - got.to_numpy(dtype=float)))
+    print(f"{a.factors} factors x {len(ref)} days, max |float32 - json| = {err:.1e}")
+    print(f"json : {sj / 1e6:7.2f} MB  write {t_wj * 1e3:8.1f} ms  load {t_j * 1e3:8.1f} ms")
+    print(f"npz  : {sn / 1e6:7.2f} MB  write {t_wn * 1e3:8.1f} ms  load {t_n * 1e3:8.1f} ms (mmap), "
+          f"{t_c * 1e3:.1f} ms (read)")
+    print(f"size x{sj / sn:.1f} smaller, load x{t_j / t_n:.0f} faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Model JSON write/load time: per-row strftime + json.dump vs the fast write_json path.
+
+    python benchmarks/bench_json.py --years 20
+"""
+import os, sys, json, time, argparse, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.utils import write_json, read_json, series_rows, rows_series
+import synthetic
+
+
+def old_write(path, equity):
+    """As pipelines/train_models.main used to build and write the payload."""
+    eq_list = [[d.strftime("%Y-%m-%d"), float(v)] for d, v in equity.dropna().items()]
+    with open(path, "w") as f:
+        json.dump({"model": "NAMM-50", "equity_curve": eq_list}, f, indent=2)
+
+
+def old_load(path):
+    with open(path, "r") as f:
+        rows = json.load(f)["equity_curve"]
+    s = pd.Series({pd.Timestamp(d): v for d, v in rows})
+    return s
+
+
+def new_write(path, equity):
+    write_json(path, {"model": "NAMM-50", "equity_curve": series_rows(equity.dropna())}, indent=None, fast=True)
+
+
+def new_load(path):
+    return rows_series(read_json(path)["equity_curve"])
+
+
+def best_of(fn, n=5):
+    ts = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        out = fn()
+        ts.append(time.perf_counter() - t0)
+    return min(ts), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=float, default=20)
+    a = ap.parse_args()
+    equity = synthetic.close_series(int(252 * a.years), drift=3e-4) / 100.0
+    try:
+        import orjson  # noqa: F401
+        backend = "orjson"
+    except ImportError:
+        backend = "stdlib"
+    with tempfile.TemporaryDirectory() as d:
+        po, pn = os.path.join(d, "old.json"), os.path.join(d, "new.json")
+        t_wo, _ = best_of(lambda: old_write(po, equity))
+        t_wn, _ = best_of(lambda: new_write(pn, equity))
+        t_lo, ref = best_of(lambda: old_load(po))
+        t_ln, got = best_of(lambda: new_load(pn))
+        so, sn = os.path.getsize(po), os.path.getsize(pn)
+    assert np.allclose(ref.to_numpy(), got.to_numpy())
+    print(f"equity curve: {len(equity)} days, fast path backend: {backend}")
+    print(f"old : {so / 1e6:6.2f} MB  write {t_wo * 1e3:7.1f} ms  load {t_lo * 1e3:7.1f} ms")
+    print(f"fast: {sn / 1e6:6.2f} MB  write {t_wn * 1e3:7.1f} ms  load {t_ln * 1e3:7.1f} ms")
+    print(f"write x{t_wo / t_wn:.1f} faster, load x{t_lo / t_ln:.1f} faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Rolling Sharpe / Sortino / vol, drawdown and time under water for many strategies:
+pandas rolling per column vs core.metrics prefix sums over the whole (C, T) array.
+
+    python benchmarks/bench_metrics.py --strategies 1000 --days 5000
+"""
+import os, sys, time, argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.metrics import rolling, WINDOWS, ANN
+import synthetic
+
+
+def pandas_rolling(R, windows=WINDOWS):
+    df = pd.DataFrame(R.T)
+    out = {}
+    for n in windows:
+        mu = df.rolling(n).mean()
+        sd = df.rolling(n).std(ddof=0)
+        down = np.sqrt((df.clip(upper=0.0) ** 2).rolling(n).mean())
+        out[f"vol_{n}"] = sd * np.sqrt(ANN)
+        out[f"sharpe_{n}"] = mu / sd * np.sqrt(ANN)
+        out[f"sortino_{n}"] = mu / down * np.sqrt(ANN)
+    eq = (1.0 + df).cumprod()
+    out["drawdown"] = eq / eq.cummax() - 1.0
+    # days since the last high, one column at a time
+    uw = np.empty(df.shape, dtype=int)
+    for j in range(df.shape[1]):
+        last = 0
+        for t, d in enumerate(out["drawdown"][j].to_numpy()):
+            if d >= 0:
+                last = t
+            uw[t, j] = t - last
+    out["underwater"] = uw
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--strategies", type=int, default=1000)
+    ap.add_argument("--days", type=int, default=5000)
+    ap.add_argument("--skip-pandas", action="store_true")
+    a = ap.parse_args()
+    R = synthetic.returns_matrix(a.strategies, a.days, mean=3e-4)
+    rolling(R[:2])
+    t0 = time.perf_counter()
+    fast = rolling(R)
+    t_fast = time.perf_counter() - t0
+    print(f"{a.strategies} strategies x {a.days} days, windows {WINDOWS}")
+    print(f"core.metrics : {t_fast:7.3f}s")
+    if a.skip_pandas:
+        return
+    t0 = time.perf_counter()
+    ref = pandas_rolling(R)
+    t_pd = time.perf_counter() - t0
+    err = max(np.nanmax(np.abs(np.asarray(ref[k]).T - fast[k])) for k in fast)
+    print(f"pandas       : {t_pd:7.3f}s  (x{t_pd / t_fast:.0f} slower), max |diff| = {err:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Cold vs warm start of the local price store against a simulated Alpha Vantage.
+
+    python benchmarks/bench_price_store.py --symbols 6 --years 20
+"""
+import os, sys, time, argparse, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.price_store import PriceStore, av_outputsize, last_session
+
+# rough wall time of a TIME_SERIES_DAILY_ADJUSTED round trip incl. JSON parse
+LATENCY = {"full": 1.5, "compact": 0.25}
+
+
+_PATHS = {}
+
+
+def fake_history(symbol, years, end):
+    # one fixed path per symbol so consecutive "days" share an identical prefix
+    if symbol not in _PATHS:
+        idx = pd.bdate_range(start="1995-01-02", end=pd.Timestamp.today() + pd.offsets.BDay(30))
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        _PATHS[symbol] = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    return _PATHS[symbol].loc[:end].tail(int(252 * years))
+
+
+def run(store, symbols, years, end, latency):
+    calls = {"full": 0, "compact": 0}
+
+    def fetcher(sym):
+        def fetch_tail(since):
+            size = av_outputsize(since, now=end + pd.offsets.BDay(1))
+            calls[size] += 1
+            time.sleep(latency[size])
+            full = fake_history(sym, years, end)
+            return full if size == "full" else full.tail(100)
+        return fetch_tail
+
+    t0 = time.perf_counter()
+    for sym in symbols:
+        store.sync(sym, fetcher(sym), now=end + pd.offsets.BDay(1))
+    return time.perf_counter() - t0, calls
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, default=6)
+    ap.add_argument("--years", type=float, default=20)
+    ap.add_argument("--scale-latency", type=float, default=0.1, help="multiply simulated latency")
+    a = ap.parse_args()
+    latency = {k: v * a.scale_latency for k, v in LATENCY.items()}
+    symbols = [f"SYM{i}" for i in range(a.symbols)]
+    end = last_session() - pd.offsets.BDay(3)
+    with tempfile.TemporaryDirectory() as d:
+        store = PriceStore(d)
+        cold_t, cold = run(store, symbols, a.years, end, latency)
+        # three new sessions since the last run
+        warm_t, warm = run(store, symbols, a.years, end + pd.offsets.BDay(3), latency)
+        fresh_t, fresh = run(store, symbols, a.years, end + pd.offsets.BDay(3), latency)
+    print(f"cold : {cold_t:7.3f}s  requests full={cold['full']} compact={cold['compact']}")
+    print(f"warm : {warm_t:7.3f}s  requests full={warm['full']} compact={warm['compact']}")
+    print(f"fresh: {fresh_t:7.3f}s  requests full={fresh['full']} compact={fresh['compact']}")
+
+
+if __name__ == "__main__":
+    main()
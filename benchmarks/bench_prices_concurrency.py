@@ -0,0 +1,73 @@
+"""Serial vs pooled quote fetching against a local mock Alpha Vantage.
+
+The mock answers GLOBAL_QUOTE after a fixed latency and fails every 10th symbol so
+the TIME_SERIES_DAILY fallback path is exercised too. The token bucket is opened
+wide (premium-style key), so the numbers show pure request overlap.
+
+    python benchmarks/bench_prices_concurrency.py --latency 0.05 --sizes 6,25,100,200
+"""
+import os, sys, json, time, argparse, tempfile, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("ALPHAVANTAGE_API_KEY", "bench")
+os.environ["AV_RPM"] = "1000000"
+os.environ["AV_STATE_DIR"] = tempfile.mkdtemp(prefix="am_av_bench_")
+
+import fetchers.prices as prices
+
+
+class MockAV(BaseHTTPRequestHandler):
+    latency = 0.05
+
+    def do_GET(self):
+        q = parse_qs(urlparse(self.path).query)
+        fn, sym = q.get("function", [""])[0], q.get("symbol", [""])[0]
+        time.sleep(self.latency)
+        if fn == "GLOBAL_QUOTE" and not sym.endswith("9"):
+            body = {"Global Quote": {"01. symbol": sym, "05. price": "100.00"}}
+        elif fn == "TIME_SERIES_DAILY":
+            body = {"Time Series (Daily)": {"2024-06-28": {"4. close": "99.00"}}}
+        else:
+            body = {"Global Quote": {}}
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--sizes", default="6,25,100,200")
+    ap.add_argument("--concurrency", type=int, default=16)
+    a = ap.parse_args()
+    MockAV.latency = a.latency
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), MockAV)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    prices.BASE = f"http://127.0.0.1:{srv.server_address[1]}/query"
+    print(f"{'symbols':>8} {'serial_s':>9} {'pooled_s':>9} {'speedup':>8}")
+    try:
+        for n in [int(x) for x in a.sizes.split(",")]:
+            syms = [f"S{i:03d}" for i in range(n)]
+            t0 = time.perf_counter()
+            r1 = prices.fetch_all(syms, concurrency=1)
+            t_serial = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            r2 = prices.fetch_all(syms, concurrency=a.concurrency)
+            t_pool = time.perf_counter() - t0
+            assert r1 == r2
+            print(f"{n:>8} {t_serial:>9.3f} {t_pool:>9.3f} {t_serial / t_pool:>7.1f}x")
+    finally:
+        srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Stance-threshold / hysteresis sweep: per-point loop vs core.regime's one-pass grid.
+
+    python benchmarks/bench_regime.py --years 25 --levels 20 --workers 4
+
+The per-point baseline labels the score the way signals.namm50.regime_from used to
+(object Series, three mask assignments) for points without band / hold, and steps a
+plain Python state machine for the others; both are timed on a sample of points and
+extrapolated to the grid.
+"""
+import os, sys, time, argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core import regime
+import synthetic
+
+
+def labels_loop(score, on, off):
+    r = pd.Series(index=score.index, dtype=object)
+    r[score >= on] = "Risk-On"
+    r[score <= off] = "Risk-Off"
+    r[(score < on) & (score > off)] = "Neutral"
+    return r
+
+
+def state_loop(x, on, off, band, hold):
+    state, held, out = 0, 10 ** 9, []
+    for v in x:
+        if v == v:
+            target = -1 if v <= off else 1 if v >= on else 0
+            if (state == 1 and v >= on - band) or (state == -1 and v <= off + band):
+                target = state
+            if target != state and held >= hold:
+                state, held = target, 0
+        held += 1
+        out.append(state)
+    return out
+
+
+def per_point(score, fwd, p):
+    if p.band <= 0 and p.hold <= 1:
+        lab = labels_loop(score, p.on, p.off)
+        codes = np.where(lab == "Risk-On", 1, np.where(lab == "Risk-Off", -1, 0))
+    else:
+        codes = np.array(state_loop(score.to_numpy(), p.on, p.off, p.band, p.hold))
+    ok = np.isfinite(fwd)
+    out = {}
+    for c in (1, 0, -1):
+        m = (codes == c) & ok
+        out[c] = (fwd[m].sum() / m.sum() if m.any() else np.nan, m.sum())
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=float, default=25)
+    ap.add_argument("--levels", type=int, default=20, help="on and off thresholds each")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--sample", type=int, default=40, help="grid points timed with the per-point loop")
+    a = ap.parse_args()
+    n = int(252 * a.years)
+    x, px = synthetic.score_walk(n, scale=0.15, drift=2e-4, vol=0.012)
+    idx = synthetic.calendar(n, "B")
+    score, close = pd.Series(x, index=idx), pd.Series(px, index=idx)
+    g = regime.grid(on=np.linspace(0.0, 2.0, a.levels), off=-np.linspace(0.0, 2.0, a.levels),
+                    band=(0.0, 0.1, 0.25, 0.5), hold=(1, 3, 5, 10))
+    fwd = regime.forward_returns(close.to_numpy())
+
+    pick = g.sample(min(a.sample, len(g)), random_state=0)
+    t0 = time.perf_counter()
+    for p in pick.itertuples(index=False):
+        per_point(score, fwd, p)
+    t_loop = (time.perf_counter() - t0) / len(pick) * len(g)
+
+    one = regime.sweep(score, close, g)
+    print(f"{n} days x {len(g)} grid points ({(g['band'] > 0).sum() + ((g['band'] <= 0) & (g['hold'] > 1)).sum()} "
+          f"with band or hold)")
+    print(f"per-point loop:          {t_loop:8.2f} s (extrapolated from {len(pick)} points)")
+    print(f"one pass, 1 process:     {one['seconds']:8.2f} s  ({t_loop / one['seconds']:.0f}x, "
+          f"{one['throughput']:.0f} points/s)")
+    if a.workers > 1:
+        many = regime.sweep(score, close, g, workers=a.workers, chunk=max(len(g) // a.workers, 1))
+        pd.testing.assert_frame_equal(one["leaderboard"], many["leaderboard"])
+        print(f"one pass, {a.workers} processes:  {many['seconds']:8.2f} s  ({os.cpu_count()} CPUs here)")
+    print(one["leaderboard"].head(5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
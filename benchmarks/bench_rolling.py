@@ -0,0 +1,48 @@
+"""Last rolling z for every WEIGHT_MAP factor: pandas full recompute vs persisted state.
+
+    python benchmarks/bench_rolling.py --years 20
+"""
+import os, sys, time, argparse, tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core.rolling import RollingStore
+from models.namm50 import signal
+import synthetic
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=float, default=20)
+    a = ap.parse_args()
+    factors = {k: v["series"] for k, v in synthetic.walk_factors(signal.WEIGHT_MAP, int(252 * a.years) + 1).items()}
+    yesterday = {k: v[:-1] for k, v in factors.items()}
+
+    t0 = time.perf_counter()
+    full = {k: signal.compute_z(signal.extract_values(v)) for k, v in factors.items()}
+    t_full = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "rolling.json")
+        st = RollingStore(path)
+        t0 = time.perf_counter()
+        for k, v in yesterday.items():
+            signal.incremental_z(st, k, v)
+        st.save()
+        t_cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        st = RollingStore(path)
+        inc = {k: signal.incremental_z(st, k, v) for k, v in factors.items()}
+        st.save()
+        t_warm = time.perf_counter() - t0
+
+    err = max(abs(full[k] - inc[k]) for k in factors)
+    print(f"{len(factors)} factors x {len(next(iter(factors.values())))} rows, max |dz| = {err:.2e}")
+    print(f"pandas full recompute : {t_full * 1e3:8.1f} ms")
+    print(f"state build (cold)    : {t_cold * 1e3:8.1f} ms")
+    print(f"daily update (warm)   : {t_warm * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Setup time and memory of a worker pool over the same price / factor frames:
+pickled into every worker vs attached from core.shared_panel.
+
+    python benchmarks/bench_shared_panel.py --workers 16 --years 25 --tickers 500
+
+Each worker gets the factor frame and the (days x tickers) close panel, sums every
+value once (so all pages are really touched) and reports its peak RSS, private and
+proportional memory (/proc/self/smaps_rollup), summed over the workers: RSS counts the
+shared block once per worker, PSS splits it between them. "pickle" sends the frames as pool initargs under the
+chosen start method (spawn, as on macOS / Windows and like 3.14's forkserver default,
+pickles them into each worker); "shared" sends only the panel spec.
+"""
+import os, sys, time, argparse
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from core import perf
+from core.shared_panel import SharedPanel, init_worker, worker_panel
+import synthetic
+
+_data = {}
+_barrier = []
+
+
+def _proc_kb(path, keys) -> float:
+    with open(path) as f:
+        return sum(int(l.split()[1]) for l in f if l.startswith(keys))
+
+
+def _mem() -> dict:
+    # VmHWM, not ru_maxrss: the latter carries the parent's peak over fork + exec
+    out = {"rss_peak": perf.peak_rss_mb(), "private": None, "pss": None}
+    try:
+        out["rss_peak"] = _proc_kb("/proc/self/status", ("VmHWM",)) / 1024.0
+        out["private"] = _proc_kb("/proc/self/smaps_rollup", ("Private_Clean", "Private_Dirty")) / 1024.0
+        out["pss"] = _proc_kb("/proc/self/smaps_rollup", ("Pss:",)) / 1024.0
+    except OSError:
+        pass
+    return out
+
+
+def _init_pickled(barrier, factors, close):
+    _barrier[:] = [barrier]
+    _data.update(factors=factors, close=close)
+
+
+def _init_shared(barrier, spec):
+    _barrier[:] = [barrier]
+    init_worker(spec)
+
+
+def _touch(_):
+    if "factors" in _data:
+        fac, close = _data["factors"], _data["close"]
+    else:
+        fac, close = worker_panel().get("factors"), worker_panel().get("close")
+    total = float(np.nansum(fac.to_numpy()) + np.nansum(close.to_numpy()))
+    _barrier[0].wait(timeout=600)  # every worker holds one task, so all of them get started
+    return os.getpid(), total, _mem()
+
+
+def run(mode, fac, close, workers, ctx):
+    """Seconds until every worker holds the data and has touched it, and their memory."""
+    barrier = ctx.Barrier(workers)
+    t0 = time.perf_counter()
+    if mode == "shared":
+        with SharedPanel.create({"factors": fac, "close": close}) as panel, \
+                ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_shared,
+                                    initargs=(barrier, panel.spec)) as ex:
+            got = list(ex.map(_touch, range(workers)))
+            dt = time.perf_counter() - t0
+    else:
+        with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_pickled,
+                                 initargs=(barrier, fac, close)) as ex:
+            got = list(ex.map(_touch, range(workers)))
+            dt = time.perf_counter() - t0
+    seen = {pid: m for pid, _, m in got}
+    return {"seconds": dt, "workers": len(seen),
+            "rss_peak": sum(m["rss_peak"] or 0 for m in seen.values()),
+            "private": sum(m["private"] or 0 for m in seen.values()),
+            "pss": sum(m["pss"] or 0 for m in seen.values()),
+            "total": got[0][1]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--years", type=float, default=25)
+    ap.add_argument("--tickers", type=int, default=500)
+    ap.add_argument("--factors", type=int, default=50)
+    ap.add_argument("--start-method", default="spawn", choices=mp.get_all_start_methods())
+    a = ap.parse_args()
+    days = int(252 * a.years)
+    fac, _ = synthetic.market(days, a.factors)
+    close = synthetic.price_panel(a.tickers, days, listed=1.0)
+    mb = (fac.to_numpy().nbytes + close.to_numpy().nbytes) / 1e6
+    print(f"{len(close)} days x ({a.tickers} closes + {a.factors} factors) = {mb:.1f} MB float64, "
+          f"{a.workers} workers, start method {a.start_method}")
+    ctx = mp.get_context(a.start_method)
+    res = {m: run(m, fac, close, a.workers, ctx) for m in ("pickle", "shared")}
+    assert abs(res["pickle"]["total"] - res["shared"]["total"]) <= 1e-6 * abs(res["pickle"]["total"])
+    for m, r in res.items():
+        print(f"{m:7s} setup {r['seconds']:7.2f} s   workers {r['workers']:3d}   "
+              f"peak RSS {r['rss_peak']:8.1f} MB   private {r['private']:8.1f} MB   PSS {r['pss']:8.1f} MB")
+    print(f"shared memory saves {res['pickle']['private'] - res['shared']['private']:.1f} MB private, "
+          f"{res['pickle']['seconds'] - res['shared']['seconds']:.2f} s setup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""NAMM-50 score timeline: the live formula replayed day by day vs one vectorized pass,
+and the daily incremental extension.
+
+    python benchmarks/bench_signal_history.py --years 20 --replay 250
+"""
+import os, sys, json, time, argparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from models.namm50 import signal
+import synthetic
+
+END = "2024-12-31"
+
+
+def replay(factors, weights, days):
+    """The live formula (compute_z of every factor's rows up to each day), per day."""
+    for d in days:
+        cut = d.strftime("%Y-%m-%d")
+        score = 0.0
+        for fid, wkey in signal.WEIGHT_MAP.items():
+            z = signal.compute_z(signal.extract_values([r for r in factors[fid]["series"] if r[0] <= cut]))
+            if z is not None and np.isfinite(z):
+                score += weights.get(wkey, 0.0) * float(z)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=float, default=20)
+    ap.add_argument("--replay", type=int, default=250, help="sessions to replay with the live formula")
+    a = ap.parse_args()
+    # every WEIGHT_MAP factor: weekly NAAIM, monthly UNRATE / CPI, daily for the rest
+    factors = synthetic.walk_factors(signal.WEIGHT_MAP, start=pd.Timestamp(END) - pd.DateOffset(years=int(a.years)),
+                                     end=END, freq={"naaim_exposure": "W-WED", "unrate": "MS", "cpiaucsl": "MS"})
+    weights = {k: 1.0 / len(signal.WEIGHT_MAP) for k in signal.WEIGHT_MAP.values()}
+    rows = sum(len(f["series"]) for f in factors.values())
+
+    t0 = time.perf_counter()
+    full = signal.history(factors, weights, end=END)
+    t_full = time.perf_counter() - t0
+    n = len(full["dates"])
+
+    days = pd.DatetimeIndex(full["dates"][-a.replay:])
+    t0 = time.perf_counter()
+    replay(factors, weights, days)
+    t_replay = (time.perf_counter() - t0) / len(days) * n
+
+    last = full["dates"][-1]
+    prev = json.loads(json.dumps(signal.history({k: {"series": v["series"][:-1]} for k, v in factors.items()},
+                                                weights, end=full["dates"][-2])))
+    t0 = time.perf_counter()
+    ext = signal.history(factors, weights, prev, end=last)
+    t_inc = time.perf_counter() - t0
+    assert ext["update"]["mode"] == "incremental" and ext["dates"] == full["dates"]
+
+    print(f"{len(factors)} factors, {rows} rows -> {n} sessions")
+    print(f"live formula replayed per day: {t_replay:8.2f} s (extrapolated from {len(days)} sessions)")
+    print(f"one vectorized pass:           {t_full:8.3f} s  ({t_replay / t_full:.0f}x)")
+    print(f"daily incremental extension:   {t_inc * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Timing suite for the hot functions on synthetic data at 1x, 10x and 100x today's sizes.
+
+    python benchmarks/bench_suite.py run                         # -> benchmarks/results/<stamp>.json
+    python benchmarks/bench_suite.py run --scales 1,10 --only compute_breadth,zscore --out base.json
+    python benchmarks/bench_suite.py compare base.json new.json --threshold 0.25
+
+`run` generates the inputs once per case and scale (see benchmarks/synthetic.py), then
+times each call repeatedly and keeps the best and median seconds. `compare` lines two
+result files up by case and scale and exits with status 1 when any case got slower by
+more than --threshold (relative) and --floor seconds (absolute, to ignore timer noise).
+"""
+import os, sys, time, argparse, platform, tempfile, statistics
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import synthetic
+from core.utils import write_json, read_json, ts_now_iso
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+SCALES = (1, 10, 100)
+MIN_TIME = 0.3     # keep repeating a case until this much time has been spent ...
+MAX_REPEAT = 7     # ... or it has run this many times
+THRESHOLD = 0.25
+FLOOR = 0.002
+
+
+def _n(key, scale):
+    return max(int(synthetic.BASE[key] * scale), 2)
+
+
+# Each case: scale -> (callable, size description). Setup happens here, outside the timing.
+
+def case_compute_signal(scale, tmp):
+    from pipelines.train_models import compute_signal, DEFAULT_WEIGHTS
+    df = synthetic.factor_frame(scale)
+    return lambda: compute_signal(df, DEFAULT_WEIGHTS), {"rows": len(df)}
+
+
+def case_compute_breadth(scale, tmp):
+    from core.breadth import compute_breadth
+    close = synthetic.price_panel(_n("breadth_tickers", scale))
+    return lambda: compute_breadth(close), {"days": close.shape[0], "tickers": close.shape[1]}
+
+
+def case_compute_z(scale, tmp):
+    from models.namm50.signal import compute_z
+    s = synthetic.factor_frame(scale)["naaim"]
+    return lambda: compute_z(s), {"rows": len(s)}
+
+
+def case_zscore(scale, tmp):
+    from core.utils import zscore
+    a = synthetic.factor_frame(scale)["vix"].to_numpy()
+    return lambda: zscore(a), {"rows": len(a)}
+
+
+def _factor_files(scale, tmp):
+    from core.factor_io import write_npz
+    payload = synthetic.factors_payload(scale)
+    js, npz = os.path.join(tmp, f"factors_{scale}.json"), os.path.join(tmp, f"factors_{scale}.npz")
+    write_json(js, payload, indent=None, fast=True)
+    write_npz(npz, payload["factors"], as_of=payload["as_of"])
+    rows = sum(len(f["series"]) for f in payload["factors"].values())
+    return payload, js, npz, rows
+
+
+def case_load_factors(scale, tmp):
+    from pipelines import train_models
+    _, js, _, rows = _factor_files(scale, tmp)
+
+    def call():
+        # JSON route: point the module at the synthetic payload and at no binary copy
+        old = train_models.FACTORS_JSON, train_models.FACTORS_NPZ
+        train_models.FACTORS_JSON, train_models.FACTORS_NPZ = js, js + ".missing.npz"
+        try:
+            return train_models.load_factors()
+        finally:
+            train_models.FACTORS_JSON, train_models.FACTORS_NPZ = old
+    return call, {"rows": rows, "bytes": os.path.getsize(js)}
+
+
+def case_load_factors_npz(scale, tmp):
+    from pipelines.train_models import load_factors_npz
+    _, _, npz, _ = _factor_files(scale, tmp)
+    # the binary copy holds one row per day, so the hourly 100x series collapse here
+    days = len(load_factors_npz(npz))
+    return lambda: load_factors_npz(npz), {"days": days, "bytes": os.path.getsize(npz)}
+
+
+def case_write_json(scale, tmp):
+    payload = synthetic.factors_payload(scale)
+    path = os.path.join(tmp, "write.json")
+    rows = sum(len(f["series"]) for f in payload["factors"].values())
+    return lambda: write_json(path, payload, indent=None), {"rows": rows}
+
+
+def case_write_json_fast(scale, tmp):
+    payload = synthetic.factors_payload(scale)
+    path = os.path.join(tmp, "write_fast.json")
+    rows = sum(len(f["series"]) for f in payload["factors"].values())
+    return lambda: write_json(path, payload, indent=None, fast=True), {"rows": rows}
+
+
+def case_naaim_parse(scale, tmp):
+    from fetchers.naaim import parse
+    text = synthetic.naaim_csv(_n("naaim_weeks", scale))
+    return lambda: parse(text), {"rows": _n("naaim_weeks", scale), "bytes": len(text)}
+
+
+CASES = {
+    "compute_signal": case_compute_signal,
+    "compute_breadth": case_compute_breadth,
+    "compute_z": case_compute_z,
+    "zscore": case_zscore,
+    "load_factors": case_load_factors,
+    "load_factors_npz": case_load_factors_npz,
+    "write_json": case_write_json,
+    "write_json_fast": case_write_json_fast,
+    "naaim_parse": case_naaim_parse,
+}
+
+
+def time_call(fn, min_time: float = MIN_TIME, max_repeat: int = MAX_REPEAT) -> list:
+    times = []
+    while len(times) < max_repeat and (not times or sum(times) < min_time):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def key(case: str, scale) -> str:
+    return f"{case}@{scale:g}x"
+
+
+def run(cases, scales, min_time: float = MIN_TIME, max_repeat: int = MAX_REPEAT) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in cases:
+            for scale in scales:
+                fn, size = CASES[name](scale, tmp)
+                times = time_call(fn, min_time, max_repeat)
+                results[key(name, scale)] = {"case": name, "scale": scale, "size": size,
+                                             "best": min(times), "median": statistics.median(times),
+                                             "repeat": len(times)}
+                print(f"{key(name, scale):26s} best {min(times) * 1e3:10.2f} ms  "
+                      f"median {statistics.median(times) * 1e3:10.2f} ms  x{len(times)}  {size}")
+    return {"as_of": ts_now_iso(), "python": platform.python_version(), "numpy": np.__version__,
+            "pandas": pd.__version__, "machine": platform.machine(), "cpus": os.cpu_count(),
+            "results": results}
+
+
+def compare(base: dict, new: dict, threshold: float = THRESHOLD, floor: float = FLOOR) -> list:
+    """[(key, base best, new best, ratio, flagged)] for every case present in both runs."""
+    rows = []
+    b, n = base.get("results", {}), new.get("results", {})
+    for k in sorted(set(b) & set(n), key=lambda k: (b[k]["case"], b[k]["scale"])):
+        old, cur = b[k]["best"], n[k]["best"]
+        ratio = cur / old if old > 0 else float("inf")
+        rows.append((k, old, cur, ratio, ratio > 1.0 + threshold and cur - old > floor))
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="time every case and write a results JSON")
+    r.add_argument("--scales", default=",".join(str(s) for s in SCALES))
+    r.add_argument("--only", default="", help="comma-separated case names (default: all)")
+    r.add_argument("--min-time", type=float, default=MIN_TIME)
+    r.add_argument("--max-repeat", type=int, default=MAX_REPEAT)
+    r.add_argument("--out", default="")
+    c = sub.add_parser("compare", help="flag cases that got slower between two result files")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=THRESHOLD, help="relative slowdown to flag")
+    c.add_argument("--floor", type=float, default=FLOOR, help="ignore differences below this many seconds")
+    a = ap.parse_args(argv)
+
+    if a.cmd == "run":
+        cases = [s.strip() for s in a.only.split(",") if s.strip()] or list(CASES)
+        unknown = set(cases) - set(CASES)
+        if unknown:
+            ap.error(f"unknown cases: {sorted(unknown)}; have {list(CASES)}")
+        scales = [float(s) for s in a.scales.split(",") if s.strip()]
+        res = run(cases, scales, a.min_time, a.max_repeat)
+        out = a.out or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+        write_json(out, res)
+        print(f"wrote {out}")
+        return 0
+
+    base, new = read_json(a.base), read_json(a.new)
+    if base is None or new is None:
+        ap.error(f"cannot read {a.base if base is None else a.new}")
+    rows = compare(base, new, a.threshold, a.floor)
+    for k, old, cur, ratio, slow in rows:
+        print(f"{k:26s} {old * 1e3:10.2f} ms -> {cur * 1e3:10.2f} ms  {ratio:6.2f}x{'  SLOWER' if slow else ''}")
+    flagged = [k for k, *_, slow in rows if slow]
+    print(f"{len(rows)} cases compared, {len(flagged)} slower than {1 + a.threshold:.2f}x")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
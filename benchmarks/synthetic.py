@@ -0,0 +1,206 @@
+"""Synthetic market data shaped like the pipeline's real inputs, at any size.
+
+Sizes are in rows/tickers; `BASE` is roughly what the pipeline handles today and the
+benchmark suite multiplies it. Past what a daily calendar can hold inside pandas'
+timestamp range (a few hundred years) the clock turns hourly; the code under test only
+cares about row counts and ordering, not about the spacing of the dates.
+"""
+import io
+import csv
+import numpy as np
+import pandas as pd
+
+END = "2025-08-07"
+BASE = {
+    "naaim_weeks": 1000,      # weekly since mid-2006
+    "fred_days": 5700,        # data/raw/fred_namm50.csv: daily since 2010
+    "breadth_tickers": 101,   # NDX constituents
+    "breadth_days": 504,      # NDX_PERIOD=2y
+}
+
+
+def calendar(n: int, freq: str = "D", end: str = END) -> pd.DatetimeIndex:
+    """n timestamps ending at `end`; hourly when `freq` would run out of timestamp range."""
+    try:
+        idx = pd.date_range(end=end, periods=n, freq=freq)
+        if len(idx) == n:
+            return idx
+    except (OverflowError, pd.errors.OutOfBoundsDatetime, pd.errors.OutOfBoundsTimedelta):
+        pass
+    return pd.date_range(end=end, periods=n, freq="h")
+
+
+def _labels(idx: pd.DatetimeIndex) -> list:
+    daily = (idx.normalize() == idx).all() and idx.is_unique
+    return list(idx.strftime("%Y-%m-%d" if daily else "%Y-%m-%dT%H:%M"))
+
+
+def price_panel(tickers: int = BASE["breadth_tickers"], days: int = BASE["breadth_days"],
+                seed: int = 0, listed: float = 0.9, delisted: float = 0.0) -> pd.DataFrame:
+    """(dates x tickers) closes from correlated GBM; about 1 - `listed` of the tickers
+    list late (NaN before their first day) like index additions, and `delisted` of them
+    stop trading somewhere in the second half."""
+    rng = np.random.default_rng(seed)
+    idx = calendar(days, "B")
+    market = rng.normal(3e-4, 0.011, (days, 1))
+    ret = market * rng.uniform(0.6, 1.6, tickers) + rng.normal(0.0, 0.015, (days, tickers))
+    close = 50.0 * np.exp(np.cumsum(ret, axis=0)) * rng.uniform(0.2, 20.0, tickers)
+    late = rng.random(tickers) > listed
+    start = rng.integers(1, max(days - 1, 2), tickers)
+    for j in np.flatnonzero(late):
+        close[:start[j], j] = np.nan
+    for j in rng.choice(tickers, int(tickers * delisted), replace=False):
+        close[rng.integers(days // 2, days):, j] = np.nan
+    cols = [f"T{j:05d}" for j in range(tickers)]
+    return pd.DataFrame(close, index=idx, columns=cols)
+
+
+def fred_frame(days: int = BASE["fred_days"], seed: int = 1, missing: float = 0.01) -> pd.DataFrame:
+    """DGS10 / DFF on a calendar-day index: DGS10 is blank on weekends and a sprinkling of
+    holidays, and about `missing` of the rows are absent altogether."""
+    rng = np.random.default_rng(seed)
+    idx = calendar(days, "D")
+    dgs10 = np.clip(3.0 + np.cumsum(rng.normal(0.0, 0.04, days)), 0.3, None)
+    dff = np.clip(np.round(2.0 + np.cumsum(rng.normal(0.0, 0.02, days)), 2), 0.05, None)
+    df = pd.DataFrame({"DGS10": np.round(dgs10, 2), "DFF": dff}, index=idx)
+    weekend = (idx.dayofweek >= 5) | (rng.random(days) < 0.02)
+    df.loc[weekend, "DGS10"] = np.nan
+    return df[rng.random(days) >= missing]
+
+
+def naaim_frame(weeks: int = BASE["naaim_weeks"], seed: int = 2) -> pd.DataFrame:
+    """Weekly NAAIM exposure survey: mean in roughly [-50, 150] plus the dispersion columns."""
+    rng = np.random.default_rng(seed)
+    idx = calendar(weeks, "W-WED")
+    mean = np.clip(65.0 + np.cumsum(rng.normal(0.0, 6.0, weeks)) * 0.3, -50.0, 150.0)
+    return pd.DataFrame({
+        "Value": np.round(mean, 2),
+        "Bearish": np.round(mean - rng.uniform(60, 150, weeks), 2),
+        "Bullish": np.round(mean + rng.uniform(30, 100, weeks), 2),
+        "StdDev": np.round(rng.uniform(20, 70, weeks), 2),
+    }, index=idx)
+
+
+def naaim_csv(weeks: int = BASE["naaim_weeks"], seed: int = 2) -> str:
+    """naaim_frame as the CSV text the NAAIM site serves (Date first)."""
+    df = naaim_frame(weeks, seed)
+    buf = io.StringIO()
+    wr = csv.writer(buf)
+    wr.writerow(["Date", *df.columns])
+    for d, row in zip(_labels(df.index), df.itertuples(index=False)):
+        wr.writerow([d, *row])
+    return buf.getvalue()
+
+
+def _rows(idx, *cols) -> list:
+    out = []
+    for d, *vals in zip(_labels(idx), *cols):
+        out.append([d, *[None if v != v else float(v) for v in vals]])
+    return out
+
+
+def factors_payload(scale: float = 1, seed: int = 3) -> dict:
+    """docs/factors_namm50.json-shaped payload with every series `scale` times today's length."""
+    rng = np.random.default_rng(seed)
+    nw, nd, nb = (max(int(BASE[k] * scale), 2) for k in ("naaim_weeks", "fred_days", "breadth_days"))
+    naaim = naaim_frame(nw, seed)
+    fred = fred_frame(nd, seed)
+    bidx = calendar(nb, "B")
+    pct = np.clip(55.0 + np.cumsum(rng.normal(0.0, 3.0, nb)) * 0.2, 0.0, 100.0)
+    factors = {
+        "naaim_exposure": {"series": _rows(naaim.index, naaim["Value"])},
+        "fred_macro": {"series": _rows(fred.index, fred["DGS10"], fred["DFF"])},
+        "ndx_breadth": {"series": _rows(bidx, np.round(pct, 2))},
+        "china_proxy": {"series": _rows(fred.index, np.round(30.0 + np.cumsum(rng.normal(0, 0.3, len(fred))), 2))},
+        "vix": {"series": _rows(fred.index, np.round(np.clip(18.0 + np.cumsum(rng.normal(0, 0.5, len(fred))), 9, 80), 2))},
+    }
+    for col in ("pct_above_20dma", "pct_above_200dma", "pct_new_high", "pct_new_low"):
+        factors[f"ndx_{col}"] = {"series": _rows(bidx, np.round(np.clip(pct + rng.normal(0, 8, nb), 0, 100), 2))}
+    return {"as_of": END + "T00:00:00Z", "factors": factors}
+
+
+def factor_frame(scale: float = 1, seed: int = 4) -> pd.DataFrame:
+    """The daily frame pipelines/train_models.load_factors returns (naaim, ndx, dgs10, dff,
+    china, vix), forward-filled onto one calendar, `scale` times today's length."""
+    rng = np.random.default_rng(seed)
+    n = max(int(BASE["fred_days"] * scale), 2)
+    fred = fred_frame(n, seed).ffill()
+    idx = fred.index
+    walk = lambda lo, hi, step, c: np.clip(c + np.cumsum(rng.normal(0, step, len(idx))), lo, hi)
+    return pd.DataFrame({
+        "naaim": np.round(walk(-50, 150, 4.0, 60.0), 2),
+        "ndx": np.round(walk(0, 100, 2.0, 55.0), 2),
+        "dgs10": fred["DGS10"].bfill(),
+        "dff": fred["DFF"],
+        "china": walk(5, 80, 0.3, 30.0),
+        "vix": walk(9, 80, 0.5, 18.0),
+    }, index=idx)
+
+
+def ohlc_panel(tickers: int = BASE["breadth_tickers"], days: int = BASE["breadth_days"],
+               seed: int = 0, listed: float = 0.9) -> dict:
+    """price_panel plus high / low a random half-spread around each close."""
+    close = price_panel(tickers, days, seed, listed)
+    hl = np.abs(np.random.default_rng(seed + 1).normal(0.0, 0.01, close.shape))
+    return {"close": close, "high": close * (1 + hl), "low": close * (1 - hl)}
+
+
+def _bdays(days: int, start=None, end: str = END) -> pd.DatetimeIndex:
+    return pd.bdate_range(start, periods=days) if start is not None else calendar(days, "B", end)
+
+
+def close_series(days: int, seed: int = 0, drift: float = 0.0, vol: float = 0.01, start=None,
+                 end: str = END) -> pd.Series:
+    """One GBM close from 100 on business days from `start`, or ending at `end`."""
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(drift, vol, days))), index=_bdays(days, start, end))
+
+
+def market(days: int, k: int = 3, seed: int = 0, drift: float = 0.0, vol: float = 0.01, level: float = 0.0,
+           names=None, start=None, end: str = END):
+    """(factors, close) for backtests: close_series, then k Gaussian random-walk factor
+    columns (f0, f1, ... or `names`) around `level` on the same days, from one seed."""
+    rng = np.random.default_rng(seed)
+    idx = _bdays(days, start, end)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(drift, vol, days))), index=idx)
+    fac = pd.DataFrame(level + np.cumsum(rng.normal(0, 1, (days, k)), axis=0), index=idx,
+                       columns=list(names) if names is not None else [f"f{i}" for i in range(k)])
+    return fac, close
+
+
+def score_walk(days: int, seed: int = 0, scale: float = 0.2, missing: float = 0.0, drift: float = 0.0,
+               vol: float = 0.01):
+    """(score, close) arrays: a model-score random walk with about `missing` of it NaN,
+    and a GBM close over the same days."""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.normal(0, 0.25, days)) * scale
+    if missing:
+        x[rng.random(days) < missing] = np.nan
+    return x, 100 * np.exp(np.cumsum(rng.normal(drift, vol, days)))
+
+
+def returns_matrix(strategies: int, days: int, seed: int = 0, mean: float = 4e-4, vol: float = 0.01) -> np.ndarray:
+    """(strategies x days) i.i.d. normal daily returns."""
+    return np.random.default_rng(seed).normal(mean, vol, (strategies, days))
+
+
+def walks(names, days: int = None, start=None, end: str = END, freq="B", seed: int = 0,
+          level: float = 0.0, missing: float = 0.0) -> dict:
+    """{name: Series} Gaussian random walks around `level`. `freq` is one frequency or
+    {name: frequency} ("B" for the rest); dates run from `start` to `end`, or are the
+    last `days` of them, and about `missing` of the rows are dropped."""
+    rng = np.random.default_rng(seed)
+    out = {}
+    for name in names:
+        f = freq.get(name, "B") if isinstance(freq, dict) else freq
+        idx = pd.date_range(start, end, freq=f) if start is not None else calendar(days, f, end)
+        s = pd.Series(level + np.cumsum(rng.normal(0, 1, len(idx))), index=idx)
+        out[name] = s[rng.random(len(idx)) >= missing] if missing else s
+    return out
+
+
+def walk_factors(names, days: int = None, start=None, end: str = END, freq="B", seed: int = 0,
+                 level: float = 0.0, decimals: int = 4) -> dict:
+    """walks as factors_namm50.json entries: {name: {"series": [[date, value], ...]}}."""
+    return {k: {"series": _rows(s.index, np.round(s.to_numpy(), decimals))}
+            for k, s in walks(names, days, start, end, freq, seed, level).items()}
@@ -3,6 +3,10 @@ from .utils import (
     ensure_dir,
     ts_now_iso,
     write_json,
+    read_json,
+    dumps_fast,
+    series_rows,
+    rows_series,
     to_json_ready,
     zscore,
 )
@@ -10,6 +14,10 @@ __all__ = [
     "ensure_dir",
     "ts_now_iso",
     "write_json",
+    "read_json",
+    "dumps_fast",
+    "series_rows",
+    "rows_series",
     "to_json_ready",
     "zscore",
 ]
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Alpha Vantage client with a token bucket shared by every caller.
+
+The bucket is keyed by API key and kept in a small JSON state file guarded by an
+exclusive file lock, so separate processes (prices, training, backtests) running on
+the same machine draw from one quota instead of each sleeping a fixed interval.
+"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+from core.http import get_session
+from core import perf
+
+try:
+    import fcntl  # POSIX only; on other platforms the bucket is per-process
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+AV_URL = os.environ.get("ALPHAVANTAGE_URL", "https://www.alphavantage.co/query")
+# Free keys: 5 requests/minute. Premium keys can raise this via AV_RPM.
+DEFAULT_RPM = float(os.environ.get("AV_RPM", "5"))
+STATE_DIR = os.environ.get("AV_STATE_DIR", tempfile.gettempdir())
+
+
+class AVThrottled(RuntimeError):
+    """Alpha Vantage kept answering with a Note/Information throttle message."""
+
+
+class AVQuotaExceeded(AVThrottled):
+    """Daily quota is gone; waiting within this run will not help."""
+
+
+# throttle texts as Alpha Vantage sends them: the per-minute / per-second (burst) notes
+# also quote the daily figure and link the premium page, so they are recognized first
+BURST_WORDS = ("per minute", "per second", "burst", "spreading out")
+DAILY_WORDS = ("requests per day", "daily rate limit")
+
+
+def classify_note(msg: str) -> str:
+    """"throttle" (wait and retry), "quota" (daily limit reached) or "error"."""
+    low = msg.lower()
+    if any(w in low for w in BURST_WORDS):
+        return "throttle"
+    if "premium endpoint" in low:
+        return "error"
+    if any(w in low for w in DAILY_WORDS):
+        return "quota"
+    return "throttle"
+
+
+class TokenBucket:
+    """Token bucket persisted in `<state_dir>/am_av_<key-hash>.json`.
+
+    `rpm` tokens refill per minute up to `capacity`. A throttle note drains the
+    bucket and halves the refill rate; each success recovers a tenth of `rpm`.
+    """
+
+    def __init__(self, api_key: str, rpm: float = None, capacity: float = None,
+                 state_dir: str = None, min_rpm: float = 1.0):
+        self.rpm = float(rpm or DEFAULT_RPM)
+        self.capacity = float(capacity or self.rpm)
+        self.min_rpm = min(min_rpm, self.rpm)
+        tag = hashlib.sha1((api_key or "anon").encode("utf-8")).hexdigest()[:12]
+        d = state_dir or STATE_DIR
+        os.makedirs(d, exist_ok=True)
+        self.path = os.path.join(d, f"am_av_{tag}.json")
+        self.lock_path = self.path + ".lock"
+        self.waited = 0.0
+        self.throttles = 0
+
+    def _locked(self, fn):
+        with open(self.lock_path, "a+") as lk:
+            if fcntl is not None:
+                fcntl.flock(lk, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        st = json.load(f)
+                except Exception:
+                    st = {"tokens": self.capacity, "rate": self.rpm, "ts": time.time()}
+                now = time.time()
+                rate = min(float(st.get("rate", self.rpm)), self.rpm)
+                tokens = min(self.capacity, float(st.get("tokens", 0.0)) + (now - float(st.get("ts", now))) * rate / 60.0)
+                st = {"tokens": tokens, "rate": rate, "ts": now}
+                out = fn(st)
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(st, f)
+                os.replace(tmp, self.path)
+                return out
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lk, fcntl.LOCK_UN)
+
+    def acquire(self) -> float:
+        """Take one token, sleeping only while the bucket is empty. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            def take(st):
+                if st["tokens"] >= 1.0:
+                    st["tokens"] -= 1.0
+                    return 0.0
+                return (1.0 - st["tokens"]) * 60.0 / st["rate"]
+            wait = self._locked(take)
+            if wait <= 0:
+                self.waited += waited
+                return waited
+            perf.sleep(wait)
+            waited += wait
+
+    def throttled(self) -> None:
+        """Server pushed back: empty the bucket and slow down."""
+        self.throttles += 1
+
+        def drain(st):
+            st["tokens"] = min(st["tokens"], 0.0)
+            st["rate"] = max(self.min_rpm, st["rate"] / 2.0)
+        self._locked(drain)
+
+    def succeeded(self) -> None:
+        def recover(st):
+            st["rate"] = min(self.rpm, st["rate"] + self.rpm / 10.0)
+        self._locked(recover)
+
+
+_buckets = {}
+
+
+def get_bucket(api_key: str) -> TokenBucket:
+    if api_key not in _buckets:
+        _buckets[api_key] = TokenBucket(api_key)
+    return _buckets[api_key]
+
+
+def av_get(params: dict, api_key: str, url: str = None, timeout: int = 30,
+           max_retries: int = 4, bucket: TokenBucket = None, session=None) -> dict:
+    """GET an Alpha Vantage endpoint through the shared bucket.
+
+    Throttle notes ("Note" / "Information", see classify_note) are retried after the
+    bucket refills; a daily-quota message raises AVQuotaExceeded at once and a
+    premium-endpoint message RuntimeError.
+    """
+    bucket = bucket or get_bucket(api_key)
+    params = {**params, "apikey": api_key}
+    http = session or get_session()
+    msg = None
+    for _ in range(max_retries):
+        bucket.acquire()
+        r = http.get(url or AV_URL, params=params, timeout=timeout)
+        r.raise_for_status()
+        data = r.json()
+        if "Error Message" in data:
+            raise RuntimeError(data["Error Message"])
+        msg = data.get("Note") or data.get("Information")
+        if not msg:
+            bucket.succeeded()
+            return data
+        kind = classify_note(msg)
+        if kind == "error":
+            raise RuntimeError(msg)
+        if kind == "quota":
+            raise AVQuotaExceeded(msg)
+        print(f"[alphavantage] throttled: {msg[:120]}")
+        perf.count("retries")
+        bucket.throttled()
+    raise AVThrottled(msg or "throttled")
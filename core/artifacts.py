@@ -0,0 +1,134 @@
+"""Atomic docs/ writer that skips no-op rewrites, tracked in a manifest.
+
+Every published file gets a manifest entry {"sha1", "bytes", "as_of", "updated"} where
+sha1 is a semantic hash of the payload: canonical JSON (sorted keys, compact) with
+volatile keys (`as_of`, run timings) removed at any depth. `write_artifact` compares
+that hash with the manifest (or, without an entry, with the file already on disk) and
+leaves the file and its mtime untouched when only the timestamp would change, so git
+sees nothing to commit and Pages has nothing to redeploy.
+
+Files are written to a temp file and renamed into place, so readers never see a
+partial file. Each process records what it changed; `report()` prints a summary and,
+under GitHub Actions, appends `changed=true` to $GITHUB_OUTPUT when anything changed,
+which the publish workflows use to skip the commit step.
+
+The manifest lives under data/state (gitignored), not in docs/: every workflow updates
+it, so a committed copy would conflict between their publish steps. Without an entry
+the file on disk is hashed instead, so a missing manifest only costs a re-read.
+"""
+import os
+import json
+import hashlib
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows: the manifest update is then best-effort
+    fcntl = None
+
+from core.utils import ensure_dir, ts_now_iso, dumps_fast, read_json
+
+MANIFEST = os.environ.get("ARTIFACT_MANIFEST", "data/state/manifest.json")
+VOLATILE = ("as_of", "seconds", "configs_per_sec")
+
+CHANGED = []
+UNCHANGED = []
+
+
+def _strip(obj):
+    if isinstance(obj, dict):
+        return {k: _strip(v) for k, v in obj.items() if k not in VOLATILE}
+    if isinstance(obj, list):
+        return [_strip(v) for v in obj]
+    return obj
+
+
+def content_hash(data) -> str:
+    """sha1 of the payload as it will read back, ignoring VOLATILE keys."""
+    plain = json.loads(dumps_fast(data))
+    raw = json.dumps(_strip(plain), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str):
+    """content_hash of a JSON file on disk, or None if it is missing or unreadable."""
+    data = read_json(path)
+    return None if data is None else content_hash(data)
+
+
+def _atomic_write(path: str, raw: bytes) -> None:
+    d = os.path.dirname(path)
+    if d:
+        ensure_dir(d)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+
+def load_manifest(path: str = MANIFEST) -> dict:
+    m = read_json(path, {})
+    return m if isinstance(m, dict) and isinstance(m.get("files"), dict) else {"files": {}}
+
+
+def _update_manifest(key: str, entry: dict, path: str) -> None:
+    """Re-read, set one entry and rename into place under an exclusive lock, so stages
+    running in parallel do not drop each other's entries."""
+    ensure_dir(os.path.dirname(path))
+    # lock outside docs/ so the publish steps never pick it up
+    lock_path = os.path.join(tempfile.gettempdir(), "manifest-" + hashlib.sha1(
+        os.path.abspath(path).encode()).hexdigest()[:12] + ".lock")
+    with open(lock_path, "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        m = load_manifest(path)
+        m["files"][key] = entry
+        m["as_of"] = entry["updated"]
+        m["files"] = dict(sorted(m["files"].items()))
+        _atomic_write(path, dumps_fast(m, indent=2))
+
+
+def write_artifact(path: str, data, indent=2, manifest: str = None) -> bool:
+    """Write `data` as JSON unless its semantic content is unchanged; True if written.
+    `manifest` defaults to MANIFEST; pass "" to write without tracking."""
+    manifest = MANIFEST if manifest is None else manifest
+    key = path.replace(os.sep, "/")
+    h = content_hash(data)
+    prev = load_manifest(manifest)["files"].get(key) if manifest else None
+    if os.path.exists(path):
+        # trust the manifest only while the file is still the one it describes
+        if prev and prev.get("bytes") == os.path.getsize(path):
+            same = prev.get("sha1") == h
+        else:
+            same = file_hash(path) == h
+        if same:
+            if manifest and (not prev or prev.get("sha1") != h):
+                # adopt a file written before the manifest existed
+                cur = read_json(path, {})
+                _update_manifest(key, {"sha1": h, "bytes": os.path.getsize(path),
+                                       "as_of": cur.get("as_of") if isinstance(cur, dict) else None,
+                                       "updated": ts_now_iso()}, manifest)
+            UNCHANGED.append(key)
+            print(f"[artifacts] {key} unchanged")
+            return False
+    raw = dumps_fast(data, indent=indent)
+    _atomic_write(path, raw)
+    CHANGED.append(key)
+    if manifest:
+        as_of = data.get("as_of") if isinstance(data, dict) else None
+        _update_manifest(key, {"sha1": h, "bytes": len(raw), "as_of": as_of, "updated": ts_now_iso()}, manifest)
+    print(f"[artifacts] {key} written")
+    return True
+
+
+def changed() -> bool:
+    return bool(CHANGED)
+
+
+def report() -> str:
+    """Summary line; also flags the GitHub Actions step output when anything changed."""
+    out = os.environ.get("GITHUB_OUTPUT")
+    if out and CHANGED:
+        with open(out, "a", encoding="utf-8") as f:
+            f.write("changed=true\n")
+    return f"[artifacts] changed={len(CHANGED)} unchanged={len(UNCHANGED)}"
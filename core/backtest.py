@@ -0,0 +1,210 @@
+"""Walk-forward backtest engine for linear factor models.
+
+Factors are normalized with statistics that only use data up to each day (expanding
+or rolling window, optionally refit every `refit` days and held in between), then a
+whole grid of weight vectors is evaluated at once: scores are `W @ Z.T`, positions are
+`tanh(score)` applied to the next day's return, and every metric is reduced along the
+time axis of a (n_configs x n_days) matrix. Configs are processed in chunks so memory
+stays bounded for large grids. Trading costs (see core/costs.py) are charged on the
+position path, so net and gross metrics come out of the same batched pass.
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from core.costs import apply_bands, turnover, charge
+
+ANN = 252
+
+
+def normalize(X: np.ndarray, mode: str = "expanding", window: int = ANN, min_periods: int = 60,
+              refit: int = 1, fill: float = 0.0) -> np.ndarray:
+    """Point-in-time z-scores of a (T, K) array; NaN or not-yet-warm entries become `fill`.
+    Mode "none" takes X as already z-scored and only fills its NaNs."""
+    X = np.asarray(X, dtype=float)
+    if mode == "none":
+        return np.where(np.isfinite(X), X, fill)
+    T, K = X.shape
+    valid = np.isfinite(X)
+    # shift each column by its first valid value: same z, far less cancellation in q/n - mean^2
+    first = np.where(valid.any(axis=0), X[valid.argmax(axis=0), np.arange(K)], 0.0)
+    x0 = np.where(valid, X - first, 0.0)
+    cs = np.zeros((T + 1, K))
+    cq = np.zeros((T + 1, K))
+    cn = np.zeros((T + 1, K))
+    np.cumsum(x0, axis=0, out=cs[1:])
+    np.cumsum(x0 * x0, axis=0, out=cq[1:])
+    np.cumsum(valid, axis=0, out=cn[1:])
+    if mode == "rolling":
+        lo = np.maximum(np.arange(1, T + 1) - window, 0)
+        s, q, n = cs[1:] - cs[lo], cq[1:] - cq[lo], cn[1:] - cn[lo]
+    elif mode == "expanding":
+        s, q, n = cs[1:], cq[1:], cn[1:]
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        var = np.maximum(q / n - mean * mean, 0.0)
+    sd = np.sqrt(var)
+    ok = n >= min_periods
+    if refit > 1:
+        anchor = (np.arange(T) // refit) * refit
+        mean, sd, ok = mean[anchor], sd[anchor], ok[anchor]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        Z = (x0 - mean) / sd
+    return np.where(ok & valid & (sd > 0) & np.isfinite(Z), Z, fill)
+
+
+def evaluate(Z: np.ndarray, ret: np.ndarray, W: np.ndarray, chunk: int = 256,
+             keep_returns: bool = False, position_fn=np.tanh, cost_bps: float = 0.0,
+             band: float = 0.0, min_trade: float = 0.0) -> dict:
+    """Score every row of W (C, K) against z-scores Z (T, K) and next-day returns ret (T,).
+
+    The position decided at the close of day t earns ret[t+1], less `cost_bps` per unit
+    of turnover. Returns per-config metric arrays (net of costs, with gross_* and the
+    annual turnover alongside) and, with `keep_returns`, the (C, T) net return matrix plus
+    the daily turnover path ("turnover_path") the costs were charged on.
+    """
+    Z = np.asarray(Z, dtype=float)
+    ret = np.nan_to_num(np.asarray(ret, dtype=float))
+    W = np.atleast_2d(np.asarray(W, dtype=float))
+    C, T = W.shape[0], Z.shape[0]
+    out = {k: np.empty(C) for k in ("ann_return", "ann_vol", "sharpe", "max_dd", "hit_rate", "final_equity", "exposure",
+                                    "gross_ann_return", "gross_sharpe", "turnover", "cost_drag")}
+    keep = np.empty((C, T)) if keep_returns else None
+    scratch = np.empty((C, T)) if keep_returns else np.empty((min(chunk, C), T))
+    for a in range(0, C, chunk):
+        b = min(a + chunk, C)
+        pos = apply_bands(position_fn(W[a:b] @ Z.T), band, min_trade)
+        out["exposure"][a:b] = np.abs(pos).mean(axis=1)
+        R = keep[a:b] if keep is not None else np.empty_like(pos)
+        R[:, 0] = 0.0
+        np.multiply(pos[:, :-1], ret[1:], out=R[:, 1:])
+        mu = R.mean(axis=1)
+        sd = np.sqrt(np.maximum(np.einsum("ij,ij->i", R, R) / T - mu * mu, 0.0))
+        turn = turnover(pos, out=scratch[a:b] if keep is not None else scratch[:b - a])
+        # all days but the last trade into a position that earns a return
+        out["turnover"][a:b] = turn[:, :-1].sum(axis=1) / T * ANN
+        out["gross_ann_return"][a:b] = mu * ANN
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["gross_sharpe"][a:b] = np.where(sd > 0, mu / sd * np.sqrt(ANN), np.nan)
+        if cost_bps:
+            charge(R, turn, cost_bps)
+            mu = R.mean(axis=1)
+            sd = np.sqrt(np.maximum(np.einsum("ij,ij->i", R, R) / T - mu * mu, 0.0))
+        out["cost_drag"][a:b] = out["gross_ann_return"][a:b] - mu * ANN
+        out["ann_return"][a:b] = mu * ANN
+        out["ann_vol"][a:b] = sd * np.sqrt(ANN)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["sharpe"][a:b] = np.where(sd > 0, mu / sd * np.sqrt(ANN), np.nan)
+            out["hit_rate"][a:b] = np.count_nonzero(R > 0, axis=1) / np.count_nonzero(R, axis=1)
+        # equity and drawdown reuse the position buffer
+        eq = np.add(R, 1.0, out=pos)
+        np.cumprod(eq, axis=1, out=eq)
+        out["final_equity"][a:b] = eq[:, -1]
+        out["max_dd"][a:b] = (eq / np.maximum.accumulate(eq, axis=1)).min(axis=1) - 1.0
+    if keep is not None:
+        out["returns"] = keep
+        out["turnover_path"] = scratch
+    return out
+
+
+def weights_matrix(weights, columns) -> np.ndarray:
+    """Accept an array (C, K), one dict, or a list of dicts keyed by column name."""
+    if isinstance(weights, dict):
+        weights = [weights]
+    if len(weights) and isinstance(weights[0], dict):
+        return np.array([[float(w.get(c, 0.0)) for c in columns] for w in weights])
+    return np.atleast_2d(np.asarray(weights, dtype=float))
+
+
+def walk_forward(factors: pd.DataFrame, prices, weights, mode: str = "expanding", window: int = ANN,
+                 min_periods: int = 60, refit: int = 1, target: str = None, chunk: int = 256,
+                 keep_returns: bool = False, cost_bps: float = 0.0, band: float = 0.0,
+                 min_trade: float = 0.0) -> dict:
+    """Walk-forward evaluation of many weight sets on one target price series.
+
+    `factors` holds raw (already sign-adjusted) factor columns, or z-scores with
+    mode="none"; they are forward-filled onto the price calendar before normalization.
+    `prices` is a close Series or a panel with `target` selecting the column. Returns
+    {"metrics": DataFrame (one row per config), "index", "throughput", "seconds",
+    ["returns", "turnover_path"]}.
+    """
+    px = prices[target] if isinstance(prices, pd.DataFrame) else prices
+    px = pd.Series(px).astype(float).dropna().sort_index()
+    F = factors.sort_index().reindex(px.index.union(factors.index)).ffill().reindex(px.index)
+    cols = list(F.columns)
+    W = weights_matrix(weights, cols)
+    t0 = time.perf_counter()
+    Z = normalize(F.to_numpy(dtype=float), mode=mode, window=window, min_periods=min_periods, refit=refit)
+    ret = px.pct_change().to_numpy()
+    res = evaluate(Z, ret, W, chunk=chunk, keep_returns=keep_returns, cost_bps=cost_bps, band=band,
+                   min_trade=min_trade)
+    dt = time.perf_counter() - t0
+    metrics = pd.DataFrame({k: v for k, v in res.items() if k not in ("returns", "turnover_path")})
+    for j, c in enumerate(cols):
+        metrics.insert(j, c, W[:, j])
+    out = {"metrics": metrics, "index": px.index, "seconds": dt,
+           "throughput": W.shape[0] / dt if dt > 0 else float("inf")}
+    if keep_returns:
+        out["returns"] = res["returns"]
+        out["turnover_path"] = res["turnover_path"]
+    return out
+
+
+def weight_grid(k: int, levels: int = 5) -> np.ndarray:
+    """Signed weight vectors on an evenly spaced [-1, 1] grid, scaled to sum(|w|) = 1.
+
+    Positive multiples of one direction collapse to a single row after scaling.
+    """
+    axis = np.linspace(-1.0, 1.0, levels)
+    W = np.stack(np.meshgrid(*([axis] * k), indexing="ij"), axis=-1).reshape(-1, k)
+    l1 = np.abs(W).sum(axis=1)
+    W = W[l1 > 0] / l1[l1 > 0, None]
+    return np.unique(np.round(W, 12), axis=0)
+
+
+def random_weights(n: int, k: int, seed: int = 0) -> np.ndarray:
+    """n signed weight vectors with sum(|w|) = 1 (Dirichlet magnitudes, random signs)."""
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(k), n) * rng.choice([-1.0, 1.0], (n, k))
+
+
+def _shard(args):
+    factors, prices, W, kw = args
+    return walk_forward(factors, prices, W, **kw)["metrics"]
+
+
+def _panel_shard(args):
+    from core.shared_panel import worker_panel
+    W, kw = args
+    panel = worker_panel()
+    return walk_forward(panel.get("factors"), panel.get("prices"), W, **kw)["metrics"]
+
+
+def search(factors: pd.DataFrame, prices, W, workers: int = 1, shard_size: int = 20000,
+           rank_by: str = "sharpe", **kw) -> dict:
+    """walk_forward over a large weight set, optionally sharded across a process pool.
+
+    Returns {"leaderboard": metrics sorted best-first by `rank_by` (NaN last), "seconds",
+    "throughput"}; extra keyword arguments are passed to walk_forward.
+    """
+    W = weights_matrix(W, list(factors.columns))
+    t0 = time.perf_counter()
+    shards = [W[a:a + shard_size] for a in range(0, len(W), shard_size)]
+    if workers > 1 and len(shards) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from core.shared_panel import SharedPanel, init_worker
+        # factors and prices are published once in shared memory; tasks carry only weights
+        with SharedPanel.create({"factors": factors, "prices": prices}) as panel, \
+                ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=init_worker,
+                                    initargs=(panel.spec,)) as ex:
+            parts = list(ex.map(_panel_shard, [(w, kw) for w in shards]))
+    else:
+        parts = [_shard((factors, prices, w, kw)) for w in shards]
+    dt = time.perf_counter() - t0
+    board = pd.concat(parts, ignore_index=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        board["calmar"] = board["ann_return"] / board["max_dd"].abs()
+    board = board.sort_values(rank_by, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+    return {"leaderboard": board, "seconds": dt, "throughput": len(W) / dt if dt > 0 else float("inf")}
@@ -0,0 +1,116 @@
+"""Vectorized market-breadth engine over a dense (dates x tickers) close matrix.
+
+All indicators come out of one pass of cumulative sums / running extrema over the
+2-D array, so the full Nasdaq-100 (or a 500-name universe) costs the same number of
+NumPy calls as a single ticker. NaN marks "not listed / no quote": a ticker enters
+an indicator's denominator only once it has a full window of valid closes.
+"""
+import numpy as np
+import pandas as pd
+
+SMA_WINDOWS = (20, 50, 200)
+HIGH_LOW_WINDOW = 252
+
+
+def _prefix_sums(x: np.ndarray, valid: np.ndarray):
+    """Zero-padded cumulative sums of valid values and of valid-row counts."""
+    T, N = x.shape
+    cs = np.zeros((T + 1, N))
+    np.cumsum(np.where(valid, x, 0.0), axis=0, out=cs[1:])
+    cc = np.zeros((T + 1, N), dtype=np.int32)
+    np.cumsum(valid, axis=0, out=cc[1:])
+    return cs, cc
+
+
+def _window(cs: np.ndarray, cc: np.ndarray, w: int):
+    """Rolling sum and valid count over window `w` from `_prefix_sums` output."""
+    s = cs[1:].copy()
+    c = cc[1:].copy()
+    if w < len(s):
+        s[w:] -= cs[1:-w]
+        c[w:] -= cc[1:-w]
+    return s, c
+
+
+def _rolling_extreme(x: np.ndarray, w: int, op) -> np.ndarray:
+    """Rolling max/min (van Herk / Gil-Werman): O(T*N) regardless of `w`."""
+    T, N = x.shape
+    if T == 0:
+        return x.copy()
+    w = min(w, T)
+    nb = -(-T // w)
+    fill = -np.inf if op is np.maximum else np.inf
+    pad = np.full((nb * w, N), fill)
+    pad[:T] = x
+    blocks = pad.reshape(nb, w, N)
+    pre = op.accumulate(blocks, axis=1).reshape(nb * w, N)
+    suf = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(nb * w, N)
+    out = np.full((T, N), fill)
+    # window [i-w+1, i] = suffix from its start block + prefix of the block holding i
+    out[w - 1:] = op(suf[:T - w + 1], pre[w - 1:T])
+    out[:w - 1] = pre[:w - 1]
+    return out
+
+
+def _pct(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(den > 0, num * 100.0 / np.maximum(den, 1), np.nan)
+
+
+def breadth_arrays(close: np.ndarray, sma_windows=SMA_WINDOWS, hl_window: int = HIGH_LOW_WINDOW,
+                   member: np.ndarray = None) -> dict:
+    """Breadth indicators for a (T, N) float array; returns {name: (T,) array}.
+
+    `member` is an optional (T, N) point-in-time membership mask: windows still use a
+    ticker's full price history, but it is only counted on days it was in the index.
+    """
+    close = np.asarray(close, dtype=float)
+    if close.ndim != 2:
+        raise ValueError("close must be 2-D (dates x tickers)")
+    valid = np.isfinite(close)
+    counted = valid if member is None else valid & np.asarray(member, dtype=bool)
+    cs, cc = _prefix_sums(close, valid)
+    out = {}
+    for w in sma_windows:
+        s, c = _window(cs, cc, w)
+        ok = counted & (c >= w)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            above = ok & (close >= s / np.maximum(c, 1))
+        out[f"pct_above_{w}dma"] = _pct(above.sum(axis=1), ok.sum(axis=1))
+
+    _, c = _window(cs, cc, hl_window)
+    ok = counted & (c >= hl_window)
+    hi = _rolling_extreme(np.where(valid, close, -np.inf), hl_window, np.maximum)
+    lo = _rolling_extreme(np.where(valid, close, np.inf), hl_window, np.minimum)
+    n_hl = ok.sum(axis=1)
+    out["pct_new_high"] = _pct((ok & (close >= hi)).sum(axis=1), n_hl)
+    out["pct_new_low"] = _pct((ok & (close <= lo)).sum(axis=1), n_hl)
+
+    prev = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    both = counted & np.isfinite(prev)
+    adv = (both & (close > prev)).sum(axis=1)
+    dec = (both & (close < prev)).sum(axis=1)
+    out["advancers"] = adv.astype(float)
+    out["decliners"] = dec.astype(float)
+    out["ad_line"] = np.cumsum(adv - dec).astype(float)
+    out["n_active"] = counted.sum(axis=1).astype(float)
+    return out
+
+
+def compute_breadth(close: pd.DataFrame, sma_windows=SMA_WINDOWS, hl_window: int = HIGH_LOW_WINDOW,
+                    membership=None) -> pd.DataFrame:
+    """DataFrame front-end: (dates x tickers) closes -> one factor column per indicator.
+
+    `membership` may be a boolean mask aligned with `close` or anything with a
+    `mask(dates, tickers)` method (see core.constituents.MembershipIndex).
+    """
+    if close is None or close.empty:
+        return pd.DataFrame()
+    close = close.sort_index()
+    member = membership
+    if member is not None and hasattr(member, "mask"):
+        member = member.mask(close.index, list(close.columns))
+    arrs = breadth_arrays(close.to_numpy(dtype=float), sma_windows, hl_window, member=member)
+    out = pd.DataFrame(arrs, index=close.index)
+    out.index.name = "date"
+    return out
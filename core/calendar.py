@@ -0,0 +1,184 @@
+"""NYSE trading calendar and a point-in-time as-of join for mixed-frequency factors.
+
+Factor sources arrive on their own clocks: weekly NAAIM surveys, daily FRED series
+(with weekend rows for some), monthly UNRATE / CPI, trading-day prices. Dating a value
+by its observation date and forward-filling it onto prices uses it before it was
+published. Here every source has a publication lag `(days, sessions)`: a value dated d
+becomes usable at the close of the first session on or after d + `days` calendar
+days, plus `sessions` more sessions.
+
+`asof_join` maps every observation of every source to that availability session with
+one searchsorted, keeps the latest observation per (source, session), and
+forward-fills the whole (sessions x sources) matrix at once, so the cost does not
+depend on how many rows each source has beyond that single sort.
+"""
+import datetime as _dt
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FIRST_YEAR, LAST_YEAR = 1990, 2040
+
+# (calendar days, then trading sessions) from the observation date to the first close
+# at which the value is known
+DEFAULT_LAG = (0, 1)
+LAGS = {
+    "naaim_exposure": (1, 0),    # survey closes Wednesday, published Thursday
+    "fred_macro": (0, 1),        # DGS10 / DFF (H.15): next business day
+    "dgs10": (0, 1),
+    "dff": (0, 1),
+    "dfii10": (0, 1),
+    "curve_10y2y": (0, 1),
+    "curve_10y3m": (0, 1),
+    "baml_hy_oas": (0, 1),
+    "vix_cls": (0, 0),           # index close
+    "unrate": (35, 0),           # dated the 1st; Employment Situation ~first Friday of next month
+    "cpiaucsl": (45, 0),         # dated the 1st; CPI release mid next month
+    "china_proxy": (0, 0),       # FXI close
+}
+# factors computed from closes are known at that close
+SAME_CLOSE_PREFIXES = ("ndx_", "mom_", "rsi_", "atr_")
+
+SPECIAL_CLOSURES = (
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",  # September 11
+    "2004-06-11",                                            # Reagan funeral
+    "2007-01-02",                                            # Ford funeral
+    "2012-10-29", "2012-10-30",                              # Hurricane Sandy
+    "2018-12-05",                                            # G.H.W. Bush funeral
+    "2025-01-09",                                            # Carter funeral
+)
+
+
+def lag_for(source: str) -> tuple:
+    if source in LAGS:
+        return LAGS[source]
+    if source.startswith(SAME_CLOSE_PREFIXES):
+        return (0, 0)
+    return DEFAULT_LAG
+
+
+def _easter(y: int) -> _dt.date:
+    # anonymous Gregorian algorithm
+    a, b, c = y % 19, y // 100, y % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    return _dt.date(y, month, (h + l - 7 * m + 114) % 31 + 1)
+
+
+def _nth_weekday(y: int, month: int, weekday: int, n: int) -> _dt.date:
+    """n-th `weekday` (Mon=0) of the month; n=-1 for the last one."""
+    if n > 0:
+        first = _dt.date(y, month, 1)
+        return first + _dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = _dt.date(y + (month == 12), month % 12 + 1, 1) - _dt.timedelta(days=1)
+    return last - _dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: _dt.date) -> _dt.date:
+    # Saturday holidays close the Friday before, Sunday holidays the Monday after
+    return d - _dt.timedelta(days=1) if d.weekday() == 5 else d + _dt.timedelta(days=1) if d.weekday() == 6 else d
+
+
+def holidays(first: int = FIRST_YEAR, last: int = LAST_YEAR) -> np.ndarray:
+    """Sorted datetime64[D] NYSE full-day closures for the given years."""
+    out = [np.datetime64(d) for d in SPECIAL_CLOSURES]
+    for y in range(first, last + 1):
+        ny = _dt.date(y, 1, 1)
+        if ny.weekday() != 5:  # no Friday closure when New Year's Day is a Saturday
+            out.append(_observed(ny))
+        if y >= 1998:
+            out.append(_nth_weekday(y, 1, 0, 3))              # Martin Luther King Jr. Day
+        out.append(_nth_weekday(y, 2, 0, 3))                  # Washington's Birthday
+        out.append(_easter(y) - _dt.timedelta(days=2))        # Good Friday
+        out.append(_nth_weekday(y, 5, 0, -1))                 # Memorial Day
+        if y >= 2022:
+            out.append(_observed(_dt.date(y, 6, 19)))         # Juneteenth
+        out.append(_observed(_dt.date(y, 7, 4)))              # Independence Day
+        out.append(_nth_weekday(y, 9, 0, 1))                  # Labor Day
+        out.append(_nth_weekday(y, 11, 3, 4))                 # Thanksgiving
+        out.append(_observed(_dt.date(y, 12, 25)))            # Christmas
+    return np.unique(np.array(out, dtype="datetime64[D]"))
+
+
+@lru_cache(maxsize=1)
+def _all_sessions() -> np.ndarray:
+    days = np.arange(np.datetime64(f"{FIRST_YEAR}-01-01"), np.datetime64(f"{LAST_YEAR + 1}-01-01"))
+    days = days[np.is_busday(days)]
+    return days[~np.isin(days, holidays())]
+
+
+def sessions(start, end) -> pd.DatetimeIndex:
+    """NYSE trading days in [start, end], from a table built once per process."""
+    days = _all_sessions()
+    lo = np.searchsorted(days, np.datetime64(pd.Timestamp(start).date()), side="left")
+    hi = np.searchsorted(days, np.datetime64(pd.Timestamp(end).date()), side="right")
+    return pd.DatetimeIndex(days[lo:hi].astype("datetime64[ns]"), name="date")
+
+
+def _days(idx) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(idx).values.astype("datetime64[D]").astype(np.int64))
+
+
+def asof_join(series: dict, index=None, lags: dict = None, max_age: int = None) -> pd.DataFrame:
+    """Dense (sessions x sources) frame of the latest value of each source known at each close.
+
+    `series` maps a name to a date-indexed Series (any frequency, NaNs are ignored).
+    `index` is the session calendar (default: NYSE sessions spanning the data); `lags`
+    overrides `lag_for(name)` per name. With `max_age`, values older than that many
+    sessions since they became known turn NaN.
+    """
+    names = list(series)
+    clean = {k: pd.Series(series[k]).dropna() for k in names}
+    lags = {k: (lags or {}).get(k, lag_for(k)) for k in names}
+    trim = index is None
+    if trim:
+        starts = [s.index.min() for s in clean.values() if len(s)]
+        ends = [s.index.max() for s in clean.values() if len(s)]
+        if not starts:
+            return pd.DataFrame(columns=names, index=pd.DatetimeIndex([], name="date"))
+        slack = max(d + 2 * n for d, n in lags.values()) + 10
+        index = sessions(min(starts), max(ends) + pd.Timedelta(days=slack))
+    index = pd.DatetimeIndex(index)
+    T, K = len(index), len(names)
+    counts = np.array([len(clean[k]) for k in names], dtype=np.int64)
+    obs = np.concatenate([_days(clean[k].index) for k in names] + [np.zeros(0, np.int64)])
+    val = np.concatenate([clean[k].to_numpy(dtype=float) for k in names] + [np.zeros(0)])
+    src = np.repeat(np.arange(K, dtype=np.int64), counts)
+    lag_days = np.repeat(np.array([lags[k][0] for k in names], dtype=np.int64), counts)
+    lag_sessions = np.repeat(np.array([lags[k][1] for k in names], dtype=np.int64), counts)
+    pos = np.searchsorted(_days(index), obs + lag_days, side="left") + lag_sessions
+    keep = pos < T
+    src, pos, obs, val = src[keep], pos[keep], obs[keep], val[keep]
+    if trim and len(pos):
+        # the default calendar ends at the session the newest value becomes known
+        T = int(pos.max()) + 1
+        index = index[:T]
+    # latest observation per (source, session): sort by key then observation date, take the last
+    key = src * (T + 1) + pos
+    order = np.lexsort((obs, key))
+    key, val, src, pos = key[order], val[order], src[order], pos[order]
+    last = np.r_[key[1:] != key[:-1], True] if len(key) else np.zeros(0, bool)
+    X = np.full((T, K), np.nan)
+    X[pos[last], src[last]] = val[last]
+    # forward-fill every column at once through the index of the last filled row
+    seen = np.where(np.isfinite(X), np.arange(T)[:, None], -1)
+    np.maximum.accumulate(seen, axis=0, out=seen)
+    out = X[np.maximum(seen, 0), np.arange(K)]
+    out[seen < 0] = np.nan
+    if max_age is not None:
+        out[np.arange(T)[:, None] - seen > max_age] = np.nan
+    return pd.DataFrame(out, index=index.rename("date"), columns=names)
+
+
+def align(frame: pd.DataFrame, index=None, sources: dict = None, max_age: int = None) -> pd.DataFrame:
+    """asof_join of the columns of a sparse mixed-frequency frame; `sources` maps a column
+    to the source id whose lag applies (default: the column name)."""
+    sources = sources or {}
+    lags = {c: lag_for(sources.get(c, c)) for c in frame.columns}
+    return asof_join({c: frame[c] for c in frame.columns}, index=index, lags=lags, max_age=max_age)
@@ -0,0 +1,247 @@
+"""Point-in-time index membership store.
+
+Membership is kept as date-ranged intervals per ticker (`ticker,start,end`, end empty
+while still a member) under data/constituents/, together with a small meta file that
+records the version, the source page's ETag/Last-Modified and the day it was checked.
+The Wikipedia page is fetched at most once a day, with a conditional GET, and only
+re-parsed when its content hash changes.
+
+Breadth code asks for a boolean (dates x tickers) mask so historical readings use the
+universe that was actually in the index on each day.
+"""
+import io
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from core.utils import ensure_dir
+from core.http import get_session
+from core import perf
+
+STORE_DIR = "data/constituents"
+SOURCES = {"ndx": "https://en.wikipedia.org/wiki/Nasdaq-100"}
+HEADERS = {"User-Agent": "Mozilla/5.0 AMBot"}
+# Intervals whose start predates the change log are assumed to run from index inception.
+INCEPTION = pd.Timestamp("1985-01-31")
+
+
+def _norm_ticker(t) -> str:
+    return str(t).strip().upper().replace(".", "-")
+
+
+class MembershipIndex:
+    """Vectorized lookups over membership intervals (member on [start, end))."""
+
+    def __init__(self, intervals: pd.DataFrame):
+        df = intervals.copy()
+        df["start"] = pd.to_datetime(df["start"]).fillna(INCEPTION)
+        df["end"] = pd.to_datetime(df["end"])
+        self.intervals = df.sort_values(["ticker", "start"]).reset_index(drop=True)
+        self._start = self.intervals["start"].values.astype("datetime64[D]")
+        # open intervals run to the end of time
+        self._end = self.intervals["end"].fillna(pd.Timestamp.max.normalize()).values.astype("datetime64[D]")
+        self._ticker = self.intervals["ticker"].to_numpy()
+
+    @property
+    def tickers(self) -> list:
+        return sorted(set(self._ticker))
+
+    def current(self) -> list:
+        return sorted(set(self._ticker[self.intervals["end"].isna().to_numpy()]))
+
+    def members_on(self, date) -> list:
+        d = np.datetime64(pd.Timestamp(date).date(), "D")
+        return sorted(set(self._ticker[(self._start <= d) & (d < self._end)]))
+
+    def tickers_between(self, start, end) -> list:
+        """Every ticker that was a member at some point in [start, end]."""
+        s = np.datetime64(pd.Timestamp(start).date(), "D")
+        e = np.datetime64(pd.Timestamp(end).date(), "D")
+        return sorted(set(self._ticker[(self._start <= e) & (self._end > s)]))
+
+    def mask(self, dates, tickers) -> np.ndarray:
+        """Boolean (len(dates), len(tickers)) membership matrix.
+
+        Each interval becomes a +1/-1 pair in a difference array at the rows found by
+        searchsorted; one cumsum down the date axis then yields the mask.
+        """
+        d = pd.DatetimeIndex(dates)
+        if d.tz is not None:
+            d = d.tz_localize(None)
+        d = d.values.astype("datetime64[D]")
+        col = {t: j for j, t in enumerate(tickers)}
+        j = np.array([col.get(t, -1) for t in self._ticker], dtype=np.int64)
+        keep = j >= 0
+        order = np.argsort(d, kind="stable")
+        ds = d[order]
+        r0 = np.searchsorted(ds, self._start[keep], side="left")
+        r1 = np.searchsorted(ds, self._end[keep], side="left")
+        diff = np.zeros((len(d) + 1, len(col)), dtype=np.int32)
+        np.add.at(diff, (r0, j[keep]), 1)
+        np.add.at(diff, (r1, j[keep]), -1)
+        m_sorted = np.cumsum(diff[:-1], axis=0) > 0
+        out = np.empty_like(m_sorted)
+        out[order] = m_sorted
+        return out
+
+
+def _flat_cols(df: pd.DataFrame) -> list:
+    if isinstance(df.columns, pd.MultiIndex):
+        return [" ".join(str(x) for x in c).lower() for c in df.columns]
+    return [str(c).lower() for c in df.columns]
+
+
+def parse_html(html: str):
+    """-> (current tickers, changes DataFrame[date, added, removed] or None)."""
+    with perf.step("read_html"):
+        tables = pd.read_html(io.StringIO(html))
+    current, changes = None, None
+    for df in tables:
+        cols = _flat_cols(df)
+        if current is None and not any("added" in c or "removed" in c for c in cols):
+            hit = [i for i, c in enumerate(cols) if "ticker" in c or "symbol" in c]
+            if hit:
+                vals = df.iloc[:, hit[0]].dropna().astype(str)
+                current = sorted({_norm_ticker(t) for t in vals if t.strip()})
+                continue
+        if changes is None and any("date" in c for c in cols) and any("added" in c for c in cols):
+            def pick(word):
+                cand = [i for i, c in enumerate(cols) if word in c and ("ticker" in c or "symbol" in c)]
+                cand = cand or [i for i, c in enumerate(cols) if word in c]
+                return df.iloc[:, cand[0]] if cand else pd.Series(np.nan, index=df.index)
+            date_col = df.iloc[:, [i for i, c in enumerate(cols) if "date" in c][0]]
+            ch = pd.DataFrame({
+                "date": pd.to_datetime(date_col, errors="coerce"),
+                "added": pick("added"),
+                "removed": pick("removed"),
+            }).dropna(subset=["date"])
+            if len(ch):
+                changes = ch
+    if not current:
+        raise RuntimeError("constituent table not found")
+    return current, changes
+
+
+def reconstruct(current, changes=None, as_of=None) -> pd.DataFrame:
+    """Rebuild intervals by walking the change log backwards from today's list."""
+    as_of = pd.Timestamp(as_of or pd.Timestamp.utcnow().date())
+    recs = [{"ticker": t, "start": pd.NaT, "end": pd.NaT} for t in current]
+    pending = {t: i for i, t in enumerate(current)}
+    if changes is not None and len(changes):
+        for _, row in changes.sort_values("date", ascending=False).iterrows():
+            d = pd.Timestamp(row["date"]).normalize()
+            if d > as_of:
+                continue
+            if pd.notna(row["added"]) and str(row["added"]).strip():
+                t = _norm_ticker(row["added"])
+                if t in pending:
+                    recs[pending.pop(t)]["start"] = d
+            if pd.notna(row["removed"]) and str(row["removed"]).strip():
+                t = _norm_ticker(row["removed"])
+                if t not in pending:
+                    recs.append({"ticker": t, "start": pd.NaT, "end": d})
+                    pending[t] = len(recs) - 1
+    out = pd.DataFrame(recs, columns=["ticker", "start", "end"])
+    out["start"] = out["start"].fillna(INCEPTION)
+    return out
+
+
+def apply_snapshot(intervals: pd.DataFrame, current, as_of) -> tuple:
+    """Open/close intervals so that the open set equals `current` from `as_of` on."""
+    as_of = pd.Timestamp(as_of).normalize()
+    df = intervals.copy()
+    is_open = df["end"].isna()
+    open_set = set(df.loc[is_open, "ticker"])
+    cur = set(current)
+    gone = is_open & df["ticker"].isin(open_set - cur)
+    df.loc[gone, "end"] = as_of
+    new = sorted(cur - open_set)
+    if new:
+        df = pd.concat([df, pd.DataFrame({"ticker": new, "start": as_of, "end": pd.NaT})], ignore_index=True)
+    return df, bool(new) or bool(gone.any())
+
+
+class ConstituentStore:
+    def __init__(self, index: str = "ndx", root: str = STORE_DIR):
+        self.index = index
+        self.root = root
+        self.csv = os.path.join(root, f"{index}_membership.csv")
+        self.meta_path = os.path.join(root, f"{index}_meta.json")
+
+    def load_meta(self) -> dict:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {"version": 0}
+
+    def load(self):
+        if not os.path.exists(self.csv):
+            return None
+        df = pd.read_csv(self.csv, dtype={"ticker": str})
+        if df.empty:
+            return None
+        df["start"] = pd.to_datetime(df["start"])
+        df["end"] = pd.to_datetime(df["end"])
+        return df
+
+    def save(self, intervals: pd.DataFrame, meta: dict) -> None:
+        ensure_dir(self.root)
+        df = intervals.sort_values(["ticker", "start"])
+        tmp = self.csv + ".tmp"
+        df.to_csv(tmp, index=False, date_format="%Y-%m-%d")
+        os.replace(tmp, self.csv)
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    def refresh(self, force: bool = False, today=None, session=None) -> MembershipIndex:
+        """Daily-cached, conditional refresh from the source page; never raises if a copy exists."""
+        today = pd.Timestamp(today or pd.Timestamp.utcnow().date()).strftime("%Y-%m-%d")
+        meta = self.load_meta()
+        stored = self.load()
+        if stored is not None and meta.get("checked") == today and not force:
+            return MembershipIndex(stored)
+        headers = dict(HEADERS)
+        if stored is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        http = session or get_session()
+        try:
+            r = http.get(SOURCES[self.index], headers=headers, timeout=30)
+            if r.status_code == 304 and stored is not None:
+                meta["checked"] = today
+                self.save(stored, meta)
+                return MembershipIndex(stored)
+            r.raise_for_status()
+            html = r.text
+        except Exception as e:
+            if stored is not None:
+                print(f"[constituents] refresh failed, using v{meta.get('version')}: {e}")
+                return MembershipIndex(stored)
+            raise
+        sha = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        meta.update({"checked": today, "etag": r.headers.get("ETag"),
+                     "last_modified": r.headers.get("Last-Modified")})
+        if stored is not None and sha == meta.get("sha1"):
+            self.save(stored, meta)
+            return MembershipIndex(stored)
+        current, changes = parse_html(html)
+        if stored is None:
+            intervals, changed = reconstruct(current, changes, as_of=today), True
+        else:
+            intervals, changed = apply_snapshot(stored, current, today)
+        meta["sha1"] = sha
+        if changed:
+            meta["version"] = int(meta.get("version", 0)) + 1
+            meta["updated"] = today
+            print(f"[constituents] {self.index} membership v{meta['version']}: {len(current)} current members")
+        self.save(intervals, meta)
+        return MembershipIndex(intervals)
+
+
+def membership(index: str = "ndx", force: bool = False, session=None) -> MembershipIndex:
+    return ConstituentStore(index).refresh(force=force, session=session)
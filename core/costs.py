@@ -0,0 +1,71 @@
+"""Trading costs for continuous position paths.
+
+Positions are a (C, T) array of target exposures (one row per config, like
+`core.backtest.evaluate`). Trading from pos[t-1] to pos[t] at the close of day t costs
+|pos[t] - pos[t-1]| * bps / 1e4 of equity, where bps = commission/impact + half the
+symbol's quoted spread. The cost is taken out of the return earned on day t+1, the
+same day the new position starts earning.
+
+Rebalance bands and a minimum trade size make the held position sticky: when the target
+is more than `band` away from what is held, the position is traded to the near edge of
+the band around the target (otherwise it is left alone), and trades smaller than
+`min_trade` are skipped. That rule depends on the previously held position, so it
+steps through time, but each step is one vector operation over all configs.
+"""
+import os
+import numpy as np
+
+BPS = float(os.environ.get("COST_BPS", "1.0"))              # commission + impact per unit turnover
+BAND = float(os.environ.get("COST_BAND", "0"))              # no-trade band around the held position
+MIN_TRADE = float(os.environ.get("COST_MIN_TRADE", "0"))    # skip trades smaller than this
+DEFAULT_SPREAD_BPS = 5.0
+# typical quoted spread in bps of price (one tick over a recent price)
+SPREAD_BPS = {
+    "SPY": 0.2,
+    "QQQ": 0.3,
+    "TQQQ": 1.2,
+    "SOXL": 3.5,
+    "FEZ": 3.0,
+    "CURE": 10.0,
+}
+
+
+def trade_bps(symbol: str = None, bps: float = None) -> float:
+    """Cost of one unit of turnover in `symbol`: commission/impact plus half its spread."""
+    bps = BPS if bps is None else bps
+    if symbol is None:
+        return bps
+    return bps + SPREAD_BPS.get(symbol.upper(), DEFAULT_SPREAD_BPS) / 2.0
+
+
+def apply_bands(pos: np.ndarray, band: float = BAND, min_trade: float = MIN_TRADE) -> np.ndarray:
+    """Held positions after rebalance bands / minimum trade size; `pos` itself is not modified."""
+    pos = np.atleast_2d(pos)
+    if band <= 0 and min_trade <= 0:
+        return pos
+    held = np.empty_like(pos)
+    cur = np.zeros(pos.shape[0])
+    for t in range(pos.shape[1]):
+        diff = pos[:, t] - cur
+        trade = np.where(np.abs(diff) > band, diff - np.sign(diff) * band, 0.0)
+        trade[np.abs(trade) < min_trade] = 0.0
+        cur = cur + trade
+        held[:, t] = cur
+    return held
+
+
+def turnover(pos: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """|pos[t] - pos[t-1]| per config and day, starting from flat."""
+    pos = np.atleast_2d(pos)
+    out = np.empty_like(pos) if out is None else out
+    out[:, 0] = np.abs(pos[:, 0])
+    np.subtract(pos[:, 1:], pos[:, :-1], out=out[:, 1:])
+    np.abs(out[:, 1:], out=out[:, 1:])
+    return out
+
+
+def charge(R: np.ndarray, turn: np.ndarray, bps: float) -> np.ndarray:
+    """Subtract the cost of trading at close t from R[:, t+1], in place."""
+    if bps:
+        R[:, 1:] -= turn[:, :-1] * (bps / 1e4)
+    return R
@@ -0,0 +1,100 @@
+"""Columnar binary copy of the factor payload (docs/factors_namm50.npz).
+
+The JSON payload stores every factor as `[date, value, ...]` rows. The binary copy is
+an uncompressed NumPy `.npz` with one shared calendar:
+
+    days    int32   (N,)    days since 1970-01-01, sorted, union of all factor dates
+    values  float32 (N, F)  NaN where a factor has no observation that day
+    names   str     (F,)    column names: `<factor_id>` for the first value of a row,
+                            `<factor_id>:<i>` for the i-th extra value (e.g. fred_macro:1)
+    as_of   str     ()      payload timestamp
+
+Because members are stored, not deflated, `load_frame` memory-maps `values` straight
+out of the archive and wraps it in a DataFrame without copying.
+"""
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+
+NPZ_PATH = "docs/factors_namm50.npz"
+EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _columns(factors: dict) -> dict:
+    """{column name: (dates, values)} from the JSON `factors` mapping."""
+    cols = {}
+    for fid, spec in factors.items():
+        rows = [r for r in ((spec or {}).get("series") or []) if r and len(r) > 1]
+        if not rows:
+            continue
+        width = max(len(r) for r in rows) - 1
+        dates = np.array([r[0] for r in rows], dtype="datetime64[D]")
+        for i in range(width):
+            name = fid if i == 0 else f"{fid}:{i}"
+            vals = np.array([r[i + 1] if len(r) > i + 1 and r[i + 1] is not None else np.nan for r in rows],
+                            dtype=np.float64)
+            cols[name] = (dates, vals)
+    return cols
+
+
+def to_arrays(factors: dict):
+    """(days int32, values float32 (N, F), names) for the JSON `factors` mapping."""
+    cols = _columns(factors)
+    names = list(cols)
+    if not names:
+        return np.zeros(0, np.int32), np.zeros((0, 0), np.float32), names
+    cal = np.unique(np.concatenate([d for d, _ in cols.values()]))
+    values = np.full((len(cal), len(names)), np.nan, dtype=np.float32)
+    for j, name in enumerate(names):
+        d, v = cols[name]
+        # keep the last row for a repeated date, like the JSON readers do
+        values[np.searchsorted(cal, d), j] = v
+    return (cal - EPOCH).astype(np.int32), values, names
+
+
+def write_npz(path: str, factors: dict, as_of: str = "") -> str:
+    days, values, names = to_arrays(factors)
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, days=days, values=values, names=np.array(names, dtype=str), as_of=np.array(as_of))
+    os.replace(tmp, path)
+    return path
+
+
+def _mmap_member(path: str, name: str) -> np.ndarray:
+    """Memory-map one stored .npy member of an .npz without reading it."""
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(name + ".npy")
+        if info.compress_type != zipfile.ZIP_STORED:
+            return np.load(path)[name]
+    with open(path, "rb") as f:
+        f.seek(info.header_offset + 26)
+        fn_len, extra_len = np.frombuffer(f.read(4), dtype="<u2")
+        f.seek(info.header_offset + 30 + int(fn_len) + int(extra_len))
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran, dtype = read_header(f)
+        offset = f.tell()
+    if not shape or 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran else "C")
+
+
+def load_frame(path: str = NPZ_PATH, mmap: bool = True) -> pd.DataFrame:
+    """Factor payload as a float32 DataFrame indexed by date (one column per name)."""
+    with np.load(path) as z:
+        days = z["days"]
+        names = list(z["names"])
+        values = None if mmap else z["values"]
+    if values is None:
+        values = _mmap_member(path, "values")
+    index = pd.DatetimeIndex((days.astype("datetime64[D]")).astype("datetime64[ns]"), name="date")
+    return pd.DataFrame(values, index=index, columns=names, copy=False)
+
+
+def load_as_of(path: str = NPZ_PATH) -> str:
+    with np.load(path) as z:
+        return str(z["as_of"])
@@ -0,0 +1,153 @@
+"""FRED observations client: shared pooled session, per-series disk cache, tail-only requests.
+
+Each series is cached as data/cache/fred/<ID>.csv (date,value) next to <ID>.json with
+the request window it covers, the response's realtime_start and the last observation
+date. A refresh asks only for `observation_start` = last observation minus
+OVERLAP_DAYS (so recent revisions are picked up) and splices that tail onto the cache.
+Series are fetched concurrently on a thread pool sharing the core.http keep-alive session.
+"""
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from core.utils import ensure_dir
+from core.http import get_session
+
+FRED_URL = "https://api.stlouisfed.org/fred/series/observations"
+CACHE_DIR = "data/cache/fred"
+OVERLAP_DAYS = 31
+MAX_WORKERS = 6
+
+
+def parse_observations(js: dict) -> pd.Series:
+    obs = js.get("observations", [])
+    if not obs:
+        return pd.Series(dtype=float)
+    df = pd.DataFrame(obs)
+    s = pd.Series(pd.to_numeric(df["value"], errors="coerce").values,
+                  index=pd.to_datetime(df["date"], errors="coerce"))
+    s = s[s.index.notna()]
+    return s[~s.index.duplicated(keep="last")].sort_index()
+
+
+class FredClient:
+    def __init__(self, api_key: str, cache_dir: str = CACHE_DIR, max_workers: int = MAX_WORKERS,
+                 session=None, overlap_days: int = OVERLAP_DAYS):
+        self.api_key = api_key
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.session = session or get_session()
+        self.overlap_days = overlap_days
+        self.stats = {"requests": 0, "cold": 0, "tail": 0, "fresh": 0, "rows": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _paths(self, series_id):
+        return (os.path.join(self.cache_dir, f"{series_id}.csv"),
+                os.path.join(self.cache_dir, f"{series_id}.json"))
+
+    def load_cached(self, series_id):
+        csv_p, meta_p = self._paths(series_id)
+        try:
+            with open(meta_p, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            df = pd.read_csv(csv_p, index_col=0, parse_dates=True)
+            return df["value"].astype(float), meta
+        except Exception:
+            return None, None
+
+    def _save(self, series_id, s: pd.Series, meta: dict):
+        ensure_dir(self.cache_dir)
+        csv_p, meta_p = self._paths(series_id)
+        out = s.rename("value").to_frame()
+        out.index.name = "date"
+        out.to_csv(csv_p + ".tmp", date_format="%Y-%m-%d")
+        os.replace(csv_p + ".tmp", csv_p)
+        with open(meta_p, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    def _request(self, series_id, observation_start=None) -> dict:
+        params = {"series_id": series_id, "api_key": self.api_key, "file_type": "json"}
+        if observation_start:
+            params["observation_start"] = observation_start
+        r = self.session.get(FRED_URL, params=params, timeout=60)
+        r.raise_for_status()
+        self._count("requests")
+        return r.json()
+
+    def fetch(self, series_id: str, start: str = None, today: str = None) -> pd.Series:
+        """Observations from `start` (None = full history) as a float Series (NaN for '.')."""
+        today = today or pd.Timestamp.utcnow().strftime("%Y-%m-%d")
+        cached, meta = self.load_cached(series_id)
+        covers = cached is not None and (meta.get("start") is None or (start is not None and start >= meta["start"]))
+        if covers and meta.get("checked") == today:
+            self._count("fresh")
+            s = cached
+        elif covers and len(cached):
+            tail_start = (cached.index[-1] - pd.Timedelta(days=self.overlap_days)).strftime("%Y-%m-%d")
+            js = self._request(series_id, tail_start)
+            tail = parse_observations(js)
+            # an empty tail (no new or revised observations) must not cut the overlap off the cache
+            s = cached
+            if len(tail):
+                s = pd.concat([cached[cached.index < tail.index.min()], tail])
+                s = s[~s.index.duplicated(keep="last")].sort_index()
+            self._count("tail")
+            self._count("rows", len(tail))
+            self._save(series_id, s, self._meta(meta["start"], js, s, today))
+        else:
+            js = self._request(series_id, start)
+            s = parse_observations(js)
+            self._count("cold")
+            self._count("rows", len(s))
+            self._save(series_id, s, self._meta(start, js, s, today))
+        if start is not None:
+            s = s[s.index >= pd.Timestamp(start)]
+        return s.rename(series_id)
+
+    @staticmethod
+    def _meta(start, js, s, today):
+        return {
+            "start": start,
+            "realtime_start": js.get("realtime_start"),
+            "last_observation": s.index[-1].strftime("%Y-%m-%d") if len(s) else None,
+            "checked": today,
+        }
+
+    def fetch_many(self, series_ids, start: str = None) -> dict:
+        """{series_id: Series}; failures are reported and left out."""
+        series_ids = list(dict.fromkeys(series_ids))
+
+        def one(sid):
+            try:
+                return sid, self.fetch(sid, start=start)
+            except Exception as e:
+                print(f"FRED fetch failed for {sid}: {e}")
+                return sid, None
+        if not series_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(series_ids))) as ex:
+            res = dict(ex.map(one, series_ids))
+        return {k: v for k, v in res.items() if v is not None}
+
+    def report(self) -> str:
+        st = self.stats
+        return (f"[fred] requests={st['requests']} cold={st['cold']} tail={st['tail']} "
+                f"fresh={st['fresh']} rows_downloaded={st['rows']}")
+
+
+def build_frame(series: dict, columns=None) -> pd.DataFrame:
+    """Outer-join series on one pre-built date index (no repeated pd.concat)."""
+    columns = list(columns or series.keys())
+    idxs = [series[c].index.values for c in columns if c in series and len(series[c])]
+    index = pd.DatetimeIndex(np.unique(np.concatenate(idxs))) if idxs else pd.DatetimeIndex([])
+    data = {c: (series[c].reindex(index).values if c in series else np.full(len(index), np.nan)) for c in columns}
+    out = pd.DataFrame(data, index=index, columns=columns)
+    out.index.name = "date"
+    return out
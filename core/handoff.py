@@ -0,0 +1,70 @@
+"""In-process hand-off of stage outputs for the single-process pipeline runner.
+
+Run as scripts, stages read their inputs from disk and write their outputs right away.
+Under `python -m pipelines` the runner calls `hold()` first: from then on `put()` keeps
+each output as the object the stage built (rows, DataFrames, payload dicts) together
+with the function that would have written it, readers get that object back through
+`get()` / `read_json()` without a disk round-trip, and `flush()` writes everything, in
+the order it was produced, after the last stage.
+"""
+from core.utils import read_json as _read_json
+
+_held = None  # path -> (obj, writer) while holding
+
+
+def hold() -> None:
+    global _held
+    _held = {}
+
+
+def holding() -> bool:
+    return _held is not None
+
+
+def put(path: str, obj, writer):
+    """writer(path, obj) now, or at flush() while holding."""
+    if _held is None:
+        return writer(path, obj)
+    _held.pop(path, None)  # a rewrite moves to the end, after what it may depend on
+    _held[path] = (obj, writer)
+    return None
+
+
+def get(path: str, default=None):
+    """The held output for `path`, or `default` when it is not held."""
+    if _held is not None and path in _held:
+        return _held[path][0]
+    return default
+
+
+def read_json(path: str, default=None):
+    """The held payload for `path`, else core.utils.read_json."""
+    if _held is not None and path in _held:
+        return _held[path][0]
+    return _read_json(path, default)
+
+
+def write_artifact(path: str, data, indent=2):
+    """core.artifacts.write_artifact, deferred while holding (then returns None)."""
+    from core.artifacts import write_artifact as _write
+    return put(path, data, lambda p, d: _write(p, d, indent=indent))
+
+
+def paths() -> list:
+    return list(_held or ())
+
+
+def discard(keys) -> None:
+    """Drop held outputs without writing them (e.g. those of a stage that failed)."""
+    if _held is not None:
+        for p in keys:
+            _held.pop(p, None)
+
+
+def flush() -> list:
+    """Write every held output and stop holding; returns the paths written."""
+    global _held
+    held, _held = _held or {}, None
+    for path, (obj, writer) in held.items():
+        writer(path, obj)
+    return list(held)
@@ -0,0 +1,193 @@
+"""Shared HTTP layer: one pooled Session, on-disk response cache, conditional GETs.
+
+Responses are cached under data/cache/http as <key>.body + <key>.json, keyed by the
+sha1 of method + URL + sorted params. A cached response younger than `ttl` seconds is
+served without touching the network; an older one is revalidated with If-None-Match /
+If-Modified-Since when the host sent an ETag / Last-Modified, and a 304 serves the
+cached body. The cache is trimmed least-recently-used first to `max_bytes`.
+
+Callers that send their own conditional headers get a plain pooled request.
+`get_session().report()` prints the per-run hit rate and bytes saved.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", "data/cache/http")
+MAX_BYTES = int(float(os.environ.get("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+ENABLED = os.environ.get("HTTP_CACHE", "1") not in ("0", "false", "False")
+POOL = 16
+USER_AGENT = "Mozilla/5.0 (compatible; namm50-bot/1.0)"
+KEEP_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+CONDITIONAL = ("If-None-Match", "If-Modified-Since")
+
+
+def cache_key(method: str, url: str, params=None) -> str:
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return hashlib.sha1(json.dumps([method.upper(), url, items]).encode("utf-8")).hexdigest()
+
+
+def _response(url: str, status: int, body: bytes, headers: dict) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    r.headers = CaseInsensitiveDict(headers)
+    r.url = url
+    r.reason = "OK" if status == 200 else ""
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    return r
+
+
+class CachedSession:
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_BYTES, enabled: bool = ENABLED,
+                 pool: int = POOL, session=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+        self.stats = {"requests": 0, "hits": 0, "revalidated": 0, "misses": 0, "bytes_downloaded": 0,
+                      "bytes_saved": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _paths(self, key):
+        return os.path.join(self.cache_dir, key + ".body"), os.path.join(self.cache_dir, key + ".json")
+
+    def _load(self, key):
+        body_p, meta_p = self._paths(key)
+        try:
+            with open(meta_p, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_p, "rb") as f:
+                body = f.read()
+            os.utime(body_p)  # LRU: last use = body mtime
+            return body, meta
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, key, url, r, body):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_p, meta_p = self._paths(key)
+        meta = {"url": url.split("?")[0], "status": r.status_code, "fetched": time.time(), "size": len(body),
+                "headers": {h: r.headers[h] for h in KEEP_HEADERS if h in r.headers}}
+        for p, data, mode in ((body_p, body, "wb"), (meta_p, json.dumps(meta), "w")):
+            tmp = f"{p}.{threading.get_ident()}.tmp"
+            with open(tmp, mode) as f:
+                f.write(data)
+            os.replace(tmp, p)
+        self.evict()
+
+    def _touch(self, key, meta):
+        meta["fetched"] = time.time()
+        _, meta_p = self._paths(key)
+        try:
+            with open(meta_p, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        try:
+            bodies = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".body")]
+        except OSError:
+            return
+        entries = sorted((e.stat().st_mtime, e.stat().st_size, e.path) for e in bodies)
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            for p in (path, path[:-5] + ".json"):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+
+    def get(self, url: str, params=None, headers=None, timeout: int = 30, ttl: float = 0,
+            **kwargs) -> requests.Response:
+        """GET through the cache. `ttl` seconds: serve a cached copy this young without asking;
+        older copies are revalidated when the host supports validators."""
+        headers = dict(headers or {})
+        self._count("requests")
+        if not self.enabled or any(h in headers for h in CONDITIONAL):
+            r = self.session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+            self._count("misses")
+            self._count("bytes_downloaded", len(r.content))
+            return r
+        key = cache_key("GET", url, params)
+        body, meta = self._load(key)
+        if body is not None:
+            cached = meta.get("headers", {})
+            if time.time() - meta.get("fetched", 0) < ttl:
+                self._count("hits")
+                self._count("bytes_saved", len(body))
+                return _response(url, meta.get("status", 200), body, cached)
+            if "ETag" in cached:
+                headers["If-None-Match"] = cached["ETag"]
+            if "Last-Modified" in cached:
+                headers["If-Modified-Since"] = cached["Last-Modified"]
+        r = self.session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        if r.status_code == 304 and body is not None:
+            self._count("revalidated")
+            self._count("bytes_saved", len(body))
+            self._touch(key, meta)
+            return _response(url, meta.get("status", 200), body, meta.get("headers", {}))
+        self._count("misses")
+        self._count("bytes_downloaded", len(r.content))
+        if r.status_code == 200 and (ttl > 0 or any(h in r.headers for h in ("ETag", "Last-Modified"))):
+            self._store(key, url, r, r.content)
+        return r
+
+    def hit_rate(self) -> float:
+        st = self.stats
+        return (st["hits"] + st["revalidated"]) / st["requests"] if st["requests"] else 0.0
+
+    def report(self) -> str:
+        st = self.stats
+        return (f"[http] requests={st['requests']} hits={st['hits']} revalidated={st['revalidated']} "
+                f"misses={st['misses']} hit_rate={self.hit_rate():.0%} "
+                f"downloaded={st['bytes_downloaded'] / 1024:.0f}KB saved={st['bytes_saved'] / 1024:.0f}KB")
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> CachedSession:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = CachedSession()
+        return _session
+
+
+def get_text_with_fallbacks(urls, timeout: int = 30, ttl: float = 0) -> str:
+    """Body of the first URL that answers 200 with content; raises the last error otherwise."""
+    last = None
+    for url in urls:
+        try:
+            r = get_session().get(url, timeout=timeout, ttl=ttl)
+            r.raise_for_status()
+            if r.text.strip():
+                return r.text
+            last = RuntimeError(f"empty body from {url}")
+        except Exception as e:
+            last = e
+            print(f"fetch failed {url}: {e}")
+    raise last or RuntimeError("no urls")
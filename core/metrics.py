@@ -0,0 +1,146 @@
+"""Rolling and full-period metrics for many strategy return series at once.
+
+Returns are a (C, T) array, one row per strategy, like `core.backtest.evaluate`
+produces. Every rolling statistic comes from prefix sums along the time axis, so each
+window costs a few array subtractions regardless of its length:
+
+    vol_<n>      annualized stdev of the trailing n returns
+    sharpe_<n>   annualized mean / stdev of the trailing n returns
+    sortino_<n>  annualized mean / downside deviation (root mean square of the losses)
+
+plus, from the compounded equity, the drawdown from the running peak and the number of
+days spent under water. Windows that are not full yet are NaN. NaN returns count as 0.
+"""
+import numpy as np
+import pandas as pd
+
+from core.utils import series_rows
+
+ANN = 252
+WINDOWS = (63, 252)
+
+
+def _prefix(x: np.ndarray) -> np.ndarray:
+    """(C, T+1) cumulative sums along time with a leading zero column."""
+    cs = np.empty((x.shape[0], x.shape[1] + 1))
+    cs[:, 0] = 0.0
+    np.cumsum(x, axis=1, out=cs[:, 1:])
+    return cs
+
+
+def _window(cs: np.ndarray, n: int) -> np.ndarray:
+    """Trailing n-sum of the series whose prefix sums are cs (partial sums before day n-1)."""
+    out = np.empty((cs.shape[0], cs.shape[1] - 1))
+    head = min(n - 1, out.shape[1])
+    out[:, :head] = cs[:, 1:head + 1]
+    if n <= out.shape[1]:
+        np.subtract(cs[:, n:], cs[:, :-n], out=out[:, n - 1:])
+    return out
+
+
+def _as_2d(R) -> np.ndarray:
+    R = np.asarray(R, dtype=float)
+    if np.isnan(R).any():
+        R = np.where(np.isnan(R), 0.0, R)
+    return R[None, :] if R.ndim == 1 else R
+
+
+def drawdown(R) -> tuple:
+    """(drawdown, days under water) of the compounded equity, both (C, T)."""
+    R = _as_2d(R)
+    dd = np.add(R, 1.0)
+    np.cumprod(dd, axis=1, out=dd)
+    peak = np.maximum.accumulate(dd, axis=1)
+    np.divide(dd, peak, out=dd)
+    dd -= 1.0
+    t = np.arange(R.shape[1], dtype=np.int32)
+    # index of the latest new high; the day count since it is the time under water
+    last_high = np.where(dd >= 0.0, t, np.int32(0))
+    np.maximum.accumulate(last_high, axis=1, out=last_high)
+    return dd, np.subtract(t, last_high, out=last_high)
+
+
+def rolling(R, windows=WINDOWS, ann: int = ANN, min_periods: int = None) -> dict:
+    """{"vol_<n>", "sharpe_<n>", "sortino_<n>" for each n, "drawdown", "underwater"}, each (C, T).
+
+    With `min_periods`, windows that hold at least that many returns are computed over
+    what is available instead of being NaN until full.
+    """
+    R = _as_2d(R)
+    T = R.shape[1]
+    cs = _prefix(R)
+    sq = np.square(R)
+    cq = _prefix(sq)
+    np.square(np.minimum(R, 0.0, out=sq), out=sq)
+    cd = _prefix(sq)
+    out = {}
+    root = np.sqrt(ann)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for n in windows:
+            cnt = np.minimum(np.arange(1, T + 1), n).astype(float)
+            mu = _window(cs, n)
+            mu /= cnt
+            var = _window(cq, n)
+            var /= cnt
+            var -= np.multiply(mu, mu, out=sq)
+            sd = np.sqrt(np.maximum(var, 0.0, out=var), out=var)
+            down = _window(cd, n)
+            down /= cnt
+            np.sqrt(down, out=down)
+            sharpe = np.multiply(mu, root, out=mu)
+            sortino = np.divide(sharpe, down, out=down)
+            np.divide(sharpe, sd, out=sharpe)
+            sharpe[sd <= 1e-12] = np.nan
+            sortino[np.isinf(sortino)] = np.nan
+            sd *= root
+            warm = min(n if min_periods is None else min(min_periods, n), T + 1) - 1
+            for a in (sd, sharpe, sortino):
+                a[:, :warm] = np.nan
+            out[f"vol_{n}"], out[f"sharpe_{n}"], out[f"sortino_{n}"] = sd, sharpe, sortino
+    out["drawdown"], out["underwater"] = drawdown(R)
+    return out
+
+
+def summary(R, ann: int = ANN) -> dict:
+    """Full-period metrics per strategy, each a (C,) array."""
+    R = _as_2d(R)
+    T = R.shape[1]
+    mu = R.mean(axis=1)
+    sd = np.sqrt(np.maximum(np.einsum("ij,ij->i", R, R) / T - mu * mu, 0.0))
+    down = np.sqrt((np.minimum(R, 0.0) ** 2).mean(axis=1))
+    dd, uw = drawdown(R)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "ann_return": mu * ann,
+            "ann_vol": sd * np.sqrt(ann),
+            "sharpe": np.where(sd > 1e-12, mu / sd * np.sqrt(ann), np.nan),
+            "sortino": np.where(down > 1e-12, mu / down * np.sqrt(ann), np.nan),
+            "max_dd": dd.min(axis=1),
+            "max_underwater": uw.max(axis=1),
+            "final_equity": np.prod(1.0 + R, axis=1),
+        }
+
+
+def _clean(v, decimals):
+    v = float(v)
+    return round(v, decimals) if np.isfinite(v) else None
+
+
+def scalars(R, decimals: int = 6, ann: int = ANN) -> dict:
+    """summary() of one return series as plain floats (None for NaN)."""
+    return {k: (int(v[0]) if k == "max_underwater" else _clean(v[0], decimals)) for k, v in summary(R, ann).items()}
+
+
+def payload(index, ret, windows=WINDOWS, decimals: int = 4) -> dict:
+    """Compact columnar block for one return series: one shared date list and one array
+    per rolling metric (NaN -> null), ready for docs/backtests.json."""
+    index = pd.DatetimeIndex(index)
+    roll = rolling(ret, windows)
+    out = {"dates": [d for d, _ in series_rows(pd.Series(0.0, index=index))], "windows": list(windows)}
+    for k, v in roll.items():
+        row = v[0]
+        if k == "underwater":
+            out[k] = row.astype(int).tolist()
+        else:
+            out[k] = [r for _, r in series_rows(pd.Series(np.round(row, decimals), index=index))]
+    return out
@@ -0,0 +1,200 @@
+"""Per-stage cost accounting -> data/perf/perf.json.
+
+    if __name__ == "__main__":
+        perf.run("compose", main)          # whole script as one stage
+
+    with perf.step("read_html"):           # sub-step; a no-op outside a stage
+        ...
+    perf.sleep(2.0)                        # time.sleep, counted as sleep time
+    perf.count("retries")
+
+A stage records wall and CPU seconds, peak RSS, HTTP requests and bytes downloaded
+(from the shared core.http session, if the stage used it), retries and seconds slept;
+each named step inside it records the same, summed over repeated calls. When the stage
+exits its record is appended to data/perf/perf.json (kept out of the published docs/
+tree, which every workflow commits), which keeps the last HISTORY runs per stage. With
+PERF_PROFILE=1 the stage also runs under cProfile and the stats are dumped to
+data/perf/<stage>.pstats (`python -m pstats data/perf/compose.pstats`).
+
+Stages are opened from the scripts' __main__ blocks only, so tests and other callers of
+main() record nothing.
+"""
+import os
+import sys
+import time
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from core.utils import ensure_dir, ts_now_iso, dumps_fast, read_json
+
+PERF_JSON = os.environ.get("PERF_JSON", "data/perf/perf.json")
+PROFILE_DIR = os.environ.get("PERF_PROFILE_DIR", "data/perf")
+PROFILE = os.environ.get("PERF_PROFILE", "").lower() in ("1", "true", "yes")
+HISTORY = 30
+
+_stack = []  # open stage/step frames, outermost first
+_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(kb / (1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0), 1)
+
+
+def _http():
+    # never import core.http just to read its counters
+    mod = sys.modules.get("core.http")
+    sess = getattr(mod, "_session", None)
+    if sess is None:
+        return 0, 0
+    return sess.stats.get("requests", 0), sess.stats.get("bytes_downloaded", 0)
+
+
+def _open(name: str) -> dict:
+    req, nbytes = _http()
+    return {"name": name, "t0": time.perf_counter(), "c0": time.process_time(),
+            "req0": req, "bytes0": nbytes, "retries": 0, "sleep": 0.0, "steps": {}}
+
+
+def _close(fr: dict) -> dict:
+    req, nbytes = _http()
+    return {"wall": time.perf_counter() - fr["t0"], "cpu": time.process_time() - fr["c0"],
+            "http_requests": req - fr["req0"], "http_bytes": nbytes - fr["bytes0"],
+            "retries": fr["retries"], "sleep": fr["sleep"]}
+
+
+def active() -> bool:
+    return bool(_stack)
+
+
+def count(key: str = "retries", n=1) -> None:
+    """Add n to a counter of every open stage/step (safe from worker threads)."""
+    with _lock:
+        for fr in _stack:
+            fr[key] = fr.get(key, 0) + n
+
+
+def sleep(seconds: float) -> None:
+    """time.sleep that is booked as sleep time on the open stage."""
+    if seconds <= 0:
+        return
+    time.sleep(seconds)
+    count("sleep", seconds)
+
+
+@contextmanager
+def step(name: str):
+    """Time a sub-step of the current stage; repeated calls are summed. Also a decorator."""
+    if not _stack:
+        yield
+        return
+    fr = _open(name)
+    with _lock:
+        # nested steps are keyed by their path below the stage
+        fr["path"] = "/".join([f["name"] for f in _stack[1:]] + [name])
+        _stack.append(fr)
+    try:
+        yield
+    finally:
+        rec = _close(fr)
+        with _lock:
+            _stack.remove(fr)
+            if _stack:
+                agg = _stack[0]["steps"].setdefault(fr["path"], dict.fromkeys(("calls", *rec), 0))
+                agg["calls"] += 1
+                for k, v in rec.items():
+                    agg[k] += v
+                agg["peak_rss_mb"] = peak_rss_mb()
+
+
+def _round(rec: dict) -> dict:
+    return {k: (round(v, 4) if isinstance(v, float) else v) for k, v in rec.items()}
+
+
+@contextmanager
+def stage(name: str, path: str = None, profile: bool = None):
+    """Record one run of a pipeline stage; nested stages behave like steps."""
+    if _stack:
+        with step(name):
+            yield
+        return
+    profile = PROFILE if profile is None else profile
+    prof = None
+    if profile:
+        import cProfile
+        prof = cProfile.Profile()
+    fr = _open(name)
+    _stack.append(fr)
+    ok = False
+    if prof is not None:
+        prof.enable()
+    try:
+        yield
+        ok = True
+    finally:
+        if prof is not None:
+            prof.disable()
+        with _lock:
+            _stack.clear()
+        rec = {"as_of": ts_now_iso(), "ok": ok, **_round(_close(fr)), "peak_rss_mb": peak_rss_mb(),
+               "steps": {k: _round(v) for k, v in fr["steps"].items()}}
+        if prof is not None:
+            ensure_dir(PROFILE_DIR)
+            rec["profile"] = os.path.join(PROFILE_DIR, f"{name}.pstats").replace(os.sep, "/")
+            prof.dump_stats(rec["profile"])
+        try:
+            save(name, rec, path)
+        except OSError as e:
+            print(f"[warn] perf: could not write {path or PERF_JSON}: {e}")
+        print(f"[perf] {name}: {rec['wall']:.2f}s wall, {rec['cpu']:.2f}s cpu, "
+              f"rss {rec['peak_rss_mb']} MB, http {rec['http_requests']} req / {rec['http_bytes']} B, "
+              f"retries {rec['retries']}, slept {rec['sleep']:.1f}s")
+
+
+def run(name: str, fn, *args, **kwargs):
+    """fn(*args, **kwargs) as stage `name`; returns its result."""
+    with stage(name):
+        return fn(*args, **kwargs)
+
+
+def load(path: str = None) -> dict:
+    p = read_json(path or PERF_JSON, {})
+    return p if isinstance(p, dict) and isinstance(p.get("stages"), dict) else {"stages": {}}
+
+
+def save(name: str, rec: dict, path: str = None) -> None:
+    """Append one stage record, keeping the last HISTORY per stage, under a file lock so
+    stages running side by side do not drop each other's runs."""
+    path = path or PERF_JSON
+    d = os.path.dirname(path)
+    if d:
+        ensure_dir(d)
+    lock_path = os.path.join(tempfile.gettempdir(), "perf-" + hashlib.sha1(
+        os.path.abspath(path).encode()).hexdigest()[:12] + ".lock")
+    with open(lock_path, "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        data = load(path)
+        runs = data["stages"].get(name)
+        runs = runs if isinstance(runs, list) else []
+        data["stages"][name] = (runs + [rec])[-HISTORY:]
+        data["stages"] = dict(sorted(data["stages"].items()))
+        data["as_of"] = rec["as_of"]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_fast(data, indent=2))
+        os.replace(tmp, path)
@@ -0,0 +1,199 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from core.utils import ensure_dir, read_json, write_json
+
+STORE_DIR = "data/prices"
+# Alpha Vantage "compact" returns the latest 100 sessions; leave some slack.
+COMPACT_ROWS = 90
+
+_DTYPE = np.dtype([("day", "<i4"), ("close", "<f8")])
+
+
+def _normalize(s: pd.Series) -> pd.Series:
+    """Tz-naive, midnight-normalized, sorted, de-duplicated float series."""
+    s = pd.Series(s, dtype=float).dropna()
+    idx = pd.DatetimeIndex(s.index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    s.index = idx.normalize()
+    s = s[~s.index.duplicated(keep="last")].sort_index()
+    return s.rename("close")
+
+
+def last_session(now=None) -> pd.Timestamp:
+    """Most recent business day whose close is safely published (yesterday or earlier)."""
+    now = pd.Timestamp.utcnow() if now is None else pd.Timestamp(now)
+    if now.tz is not None:
+        now = now.tz_localize(None)
+    return (now.normalize() - pd.offsets.BDay(1)).normalize()
+
+
+def av_outputsize(since, default: str = "full", now=None) -> str:
+    """Pick the cheapest Alpha Vantage outputsize that still covers `since`."""
+    if since is None:
+        return default
+    start = pd.Timestamp(since).to_datetime64().astype("datetime64[D]")
+    end = last_session(now).to_datetime64().astype("datetime64[D]")
+    gap = int(np.busday_count(start, end)) + 1
+    return "compact" if gap <= COMPACT_ROWS else "full"
+
+
+class PriceStore:
+    """Per-symbol daily close history kept as memory-mapped .npy files.
+
+    Each file holds a structured array of (int32 days since epoch, float64 close); a
+    `<SYMBOL>.json` next to it records whether the history came from a full fetch or
+    only a short ("compact") one. `sync` serves the cached history and only asks the
+    network for the missing tail, or for everything when the caller needs the full
+    history and only a short one is stored.
+    """
+
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+        self.stats = {"requests": 0, "cold": 0, "warm": 0, "fresh": 0, "backfill": 0,
+                      "rows_appended": 0, "seconds": 0.0}
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.npy")
+
+    def meta_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.json")
+
+    def is_full(self, symbol: str) -> bool:
+        """The stored history came from a full fetch (unknown for files without metadata)."""
+        return bool((read_json(self.meta_path(symbol), {}) or {}).get("full"))
+
+    def _mark(self, symbol: str, full: bool) -> None:
+        s = self.load(symbol)
+        start = None if s is None or s.empty else s.index[0].strftime("%Y-%m-%d")
+        write_json(self.meta_path(symbol), {"full": bool(full), "start": start}, indent=None)
+
+    def _read(self, symbol: str):
+        p = self.path(symbol)
+        if not os.path.exists(p):
+            return None
+        try:
+            arr = np.load(p, mmap_mode="r")
+        except Exception as e:
+            print(f"[price_store] unreadable {p}: {e}")
+            return None
+        return arr if arr.dtype == _DTYPE and len(arr) else None
+
+    def last_date(self, symbol: str):
+        arr = self._read(symbol)
+        if arr is None:
+            return None
+        return pd.Timestamp(np.datetime64(int(arr["day"][-1]), "D"))
+
+    def load(self, symbol: str):
+        arr = self._read(symbol)
+        if arr is None:
+            return None
+        idx = pd.DatetimeIndex(arr["day"].astype("datetime64[D]").astype("datetime64[ns]"))
+        return pd.Series(np.array(arr["close"]), index=idx, name="close")
+
+    def save(self, symbol: str, s: pd.Series) -> None:
+        s = _normalize(s)
+        arr = np.empty(len(s), dtype=_DTYPE)
+        arr["day"] = s.index.values.astype("datetime64[D]").astype(np.int64)
+        arr["close"] = s.values
+        ensure_dir(self.root)
+        p = self.path(symbol)
+        tmp = p + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, p)
+
+    def append(self, symbol: str, tail: pd.Series, rtol: float = 1e-4) -> bool:
+        """Merge `tail` into the stored history.
+
+        Returns False (and leaves the file untouched) when the overlapping days disagree,
+        which happens when a split/dividend re-adjusts the whole history; the caller
+        should then refetch the full series.
+        """
+        tail = _normalize(tail)
+        old = self.load(symbol)
+        if old is None:
+            self.save(symbol, tail)
+            self.stats["rows_appended"] += len(tail)
+            return True
+        common = old.index.intersection(tail.index)
+        if len(common) and not np.allclose(old[common].values, tail[common].values, rtol=rtol):
+            return False
+        new = tail[tail.index > old.index[-1]]
+        if len(new):
+            self.save(symbol, pd.concat([old, new]))
+            self.stats["rows_appended"] += len(new)
+        return True
+
+    def sync(self, symbol: str, fetch_tail, now=None, full: bool = True) -> pd.Series:
+        """Return the full history for `symbol`, fetching only what is missing.
+
+        `fetch_tail(since)` must return a close series; `since` is None on a cold start
+        (and for a backfill), otherwise the first date that is still needed. `full` says
+        whether `fetch_tail(None)` returns the whole history; a caller with `full` set
+        refetches a history that an earlier short fetch left behind.
+        """
+        t0 = time.perf_counter()
+        last = self.last_date(symbol)
+        if last is not None and full and not self.is_full(symbol):
+            self.stats["requests"] += 1
+            self.stats["backfill"] += 1
+            mode = "backfill"
+            try:
+                self.save(symbol, fetch_tail(None))
+                self._mark(symbol, True)
+            except Exception as e:
+                print(f"[price_store] {symbol}: backfill failed, serving cached rows: {e}")
+                mode = "stale"
+        elif last is not None and last >= last_session(now):
+            self.stats["fresh"] += 1
+            mode = "fresh"
+        elif last is None:
+            self.stats["requests"] += 1
+            self.stats["cold"] += 1
+            self.save(symbol, fetch_tail(None))
+            self._mark(symbol, full)
+            mode = "cold"
+        else:
+            self.stats["requests"] += 1
+            self.stats["warm"] += 1
+            mode = "warm"
+            # Overlap by a few sessions so adjustments to recent history can be detected.
+            since = (last - pd.offsets.BDay(5)).normalize()
+            try:
+                if not self.append(symbol, fetch_tail(since)):
+                    print(f"[price_store] {symbol}: history re-adjusted, refetching in full")
+                    self.stats["requests"] += 1
+                    self.save(symbol, fetch_tail(None))
+                    self._mark(symbol, full)
+            except Exception as e:
+                # A stale history is still better than none; keep what we have.
+                print(f"[price_store] {symbol}: tail fetch failed, serving cached rows: {e}")
+                mode = "stale"
+        out = self.load(symbol)
+        dt = time.perf_counter() - t0
+        self.stats["seconds"] += dt
+        rows = 0 if out is None else len(out)
+        print(f"[price_store] {symbol}: {mode}, rows={rows}, {dt:.2f}s")
+        if out is None:
+            raise RuntimeError(f"no price history for {symbol}")
+        return out
+
+    def report(self) -> str:
+        st = self.stats
+        return (f"[price_store] requests={st['requests']} cold={st['cold']} warm={st['warm']} "
+                f"fresh={st['fresh']} backfill={st['backfill']} rows_appended={st['rows_appended']} wall={st['seconds']:.2f}s")
+
+
+_default_store = None
+
+
+def get_store() -> PriceStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore(os.environ.get("AM_PRICE_STORE", STORE_DIR))
+    return _default_store
@@ -0,0 +1,186 @@
+"""Risk-On / Neutral / Risk-Off regimes from a score, and a threshold sweep over them.
+
+Regimes are int8 codes (ON = 1, NEUTRAL = 0, OFF = -1). A grid point is
+(on, off, band, hold): the score enters Risk-On at >= on and Risk-Off at <= off (off wins
+when both hold, as in signals.namm50.regime_from); with a hysteresis `band` a regime is
+kept until the score leaves it by more than the band (below on - band, above off + band);
+with `hold` > 1 a new regime is kept at least that many days. A NaN score keeps the
+current regime.
+
+`classify` runs the whole grid through one pass over the score array, stepping every grid
+point's state at once (points without band or hold are plain comparisons and skip the
+pass). `sweep` scores each point against forward returns: per-regime days, hit rate
+(Risk-On: forward return > 0, Risk-Off: < 0), mean forward return, and switches /
+turnover per year with the code as the position; chunks of the grid can run in a
+process pool that attaches the score and returns from core.shared_panel.
+"""
+import time
+import numpy as np
+import pandas as pd
+
+ON, NEUTRAL, OFF = 1, 0, -1
+LABELS = {ON: "Risk-On", NEUTRAL: "Neutral", OFF: "Risk-Off"}
+ON_AT, OFF_AT = 0.5, -0.5
+ANN = 252
+PARAMS = ["on", "off", "band", "hold"]
+
+
+def stance(score: float, on: float = ON_AT, off: float = OFF_AT) -> str:
+    """Label of a single score (no hysteresis)."""
+    return LABELS[OFF if score <= off else ON if score >= on else NEUTRAL]
+
+
+def labels(codes) -> np.ndarray:
+    """Object array of labels for int8 codes."""
+    names = np.array([LABELS[OFF], LABELS[NEUTRAL], LABELS[ON]], dtype=object)
+    return names[np.asarray(codes, dtype=np.int64) + 1]
+
+
+def grid(on=(0.25, 0.5, 0.75, 1.0), off=(-0.25, -0.5, -0.75, -1.0), band=(0.0,), hold=(1,)) -> pd.DataFrame:
+    """Every (on, off, band, hold) combination with off < on."""
+    g = np.array(np.meshgrid(on, off, band, hold, indexing="ij"), dtype=float).reshape(4, -1).T
+    g = g[g[:, 1] < g[:, 0]]
+    out = pd.DataFrame(g, columns=PARAMS)
+    out["hold"] = out["hold"].astype(int)
+    return out
+
+
+def _static(x: np.ndarray, on: np.ndarray, off: np.ndarray) -> np.ndarray:
+    """(T, G) codes without band or hold: NaN rows keep the previous code."""
+    c = (x[:, None] >= on).astype(np.int8)
+    c[x[:, None] <= off] = OFF
+    nan = np.isnan(x)
+    if nan.any():
+        # carry the last non-NaN row forward (NEUTRAL before the first one)
+        seen = np.where(~nan, np.arange(len(x)), -1)
+        np.maximum.accumulate(seen, out=seen)
+        c = np.where((seen >= 0)[:, None], c[np.maximum(seen, 0)], np.int8(NEUTRAL)).astype(np.int8)
+    return c
+
+
+def _stateful(x: np.ndarray, on, off, band, hold) -> np.ndarray:
+    T, G = len(x), len(on)
+    # everything that does not depend on the state is compared for all days up front;
+    # the loop only carries the state
+    target = _static(x, on, off)
+    keep_on = x[:, None] >= on - band
+    keep_off = x[:, None] <= off + band
+    out = np.empty((T, G), dtype=np.int8)
+    state = np.zeros(G, dtype=np.int8)
+    held = np.full(G, T + int(hold.max()), dtype=np.int64)  # days in the current regime
+    nan = np.isnan(x)
+    for t in range(T):
+        if nan[t]:
+            held += 1
+            out[t] = state
+            continue
+        stick = ((state == ON) & keep_on[t]) | ((state == OFF) & keep_off[t])
+        move = ~stick & (target[t] != state) & (held >= hold)
+        held += 1
+        held[move] = 1
+        state[move] = target[t][move]
+        out[t] = state
+    return out
+
+
+def classify(score, on=ON_AT, off=OFF_AT, band=0.0, hold=1) -> np.ndarray:
+    """int8 codes: (T,) for scalar parameters, (T, G) when they are arrays of G grid points."""
+    x = np.asarray(score, dtype=float)
+    scalar = all(np.ndim(p) == 0 for p in (on, off, band, hold))
+    on, off, band, hold = (np.ravel(p).astype(float) for p in np.broadcast_arrays(on, off, band, hold))
+    static = (band <= 0) & (hold <= 1)
+    out = np.empty((len(x), on.size), dtype=np.int8)
+    if static.any():
+        out[:, static] = _static(x, on[static], off[static])
+    if not static.all():
+        dyn = ~static
+        out[:, dyn] = _stateful(x, on[dyn], off[dyn], np.maximum(band[dyn], 0.0), hold[dyn])
+    return out[:, 0] if scalar else out
+
+
+def forward_returns(close, horizon: int = 1) -> np.ndarray:
+    """close[t + horizon] / close[t] - 1, NaN for the last `horizon` rows."""
+    c = np.asarray(close, dtype=float)
+    fwd = np.full(len(c), np.nan)
+    if len(c) > horizon:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fwd[:-horizon] = c[horizon:] / c[:-horizon] - 1.0
+    return fwd
+
+
+def evaluate(codes: np.ndarray, fwd: np.ndarray, horizon: int = 1) -> dict:
+    """Per-regime stats of (T, G) codes against forward returns (T,); arrays of length G."""
+    valid = np.isfinite(fwd)
+    f = np.where(valid, fwd, 0.0)
+    n = max(int(valid.sum()), 1)
+    years = max(len(f), 1) / ANN
+    # with c in {-1, 0, 1}: [c == 1] = (|c| + c) / 2 and [c == -1] = (|c| - c) / 2, so two
+    # matrix products give return sums, day counts and hits for every regime and point
+    rows = np.vstack([f, valid, valid & (f > 0), valid & (f < 0)]).astype(float)
+    c = codes.astype(float)
+    s1, s2 = rows @ c, rows @ np.abs(c)
+    on, off = (s2 + s1) / 2, (s2 - s1) / 2
+    out = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["on_days"], out["on_hit"], out["on_ret"] = on[1], on[2] / on[1], on[0] / on[1]
+        nd = valid.sum() - s2[1]
+        out["neutral_days"], out["neutral_ret"] = nd, (f.sum() - s2[0]) / nd
+        out["off_days"], out["off_hit"], out["off_ret"] = off[1], off[3] / off[1], off[0] / off[1]
+        out["spread"] = out["on_ret"] - out["off_ret"]
+        # the code as a long / flat / short position
+        out["ret"] = s1[0] / n * ANN / horizon
+    for k in ("on_days", "neutral_days", "off_days"):
+        out[k] = np.rint(out[k]).astype(np.int64)
+    step = np.abs(np.diff(codes.astype(np.int16), axis=0))
+    out["switches"] = (step > 0).sum(axis=0) / years
+    out["turnover"] = step.sum(axis=0) / years
+    return out
+
+
+def _chunk(x, fwd, P, horizon, block: int = 1024):
+    # one pass classifies the whole chunk; the float products go a block of columns at a time
+    codes = classify(x, P[:, 0], P[:, 1], P[:, 2], P[:, 3])
+    parts = [evaluate(codes[:, a:a + block], fwd, horizon) for a in range(0, codes.shape[1], block)]
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def _panel_chunk(args):
+    from core.shared_panel import worker_panel
+    P, horizon = args
+    panel = worker_panel()
+    return _chunk(panel.array("score"), panel.array("fwd"), P, horizon)
+
+
+def sweep(score, close, points: pd.DataFrame = None, horizon: int = 1, workers: int = 1,
+          chunk: int = 8192, rank_by: str = "spread") -> dict:
+    """Evaluate every grid point (see `grid`) on `score` against `close`'s forward returns.
+
+    Series are aligned on their common dates; arrays must have equal length. Returns
+    {"leaderboard": params + stats sorted best-first by `rank_by` (NaN last), "seconds",
+    "throughput"}. With `workers` > 1, grid chunks run in a process pool.
+    """
+    if isinstance(score, pd.Series) and isinstance(close, pd.Series):
+        both = pd.concat([score.rename("score"), close.rename("close")], axis=1, join="inner").sort_index()
+        score, close = both["score"], both["close"]
+    x = np.asarray(score, dtype=float)
+    fwd = forward_returns(close, horizon)
+    if len(x) != len(fwd):
+        raise ValueError(f"score and close differ in length: {len(x)} vs {len(fwd)}")
+    points = grid() if points is None else points
+    P = points[PARAMS].to_numpy(dtype=float)
+    t0 = time.perf_counter()
+    chunks = [P[a:a + chunk] for a in range(0, len(P), chunk)]
+    if workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from core.shared_panel import SharedPanel, init_worker
+        with SharedPanel.create({"score": x, "fwd": fwd}) as panel, \
+                ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=init_worker,
+                                    initargs=(panel.spec,)) as ex:
+            parts = list(ex.map(_panel_chunk, [(c, horizon) for c in chunks]))
+    else:
+        parts = [_chunk(x, fwd, c, horizon) for c in chunks]
+    dt = time.perf_counter() - t0
+    stats = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]} if parts else {}
+    board = pd.concat([points[PARAMS].reset_index(drop=True), pd.DataFrame(stats)], axis=1)
+    board = board.sort_values(rank_by, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+    return {"leaderboard": board, "seconds": dt, "throughput": len(P) / dt if dt > 0 else float("inf")}
@@ -0,0 +1,194 @@
+"""Incremental rolling mean / variance / z-score with persisted state.
+
+A RollingWindow keeps the last `window` observations in a ring buffer plus a running
+mean and sum of squared deviations (Welford, with the sliding-window remove step), so
+folding in a new observation is O(1). RollingStore persists one window per key along
+with the date of the last folded row and a hash of the rows inside the window, which
+lets a daily job touch only new rows (plus one O(window) pass to check that none of
+the windowed rows was revised or back-filled).
+Until `window` observations are available the window is expanding, matching
+`models.namm50.signal.compute_z`.
+"""
+import os
+import json
+import math
+import hashlib
+
+from core.utils import ensure_dir
+
+STATE_PATH = "data/state/rolling.json"
+
+
+class RollingWindow:
+    def __init__(self, window: int, min_periods: int = None, buf=None, head: int = 0,
+                 mean: float = 0.0, m2: float = 0.0, since_resync: int = 0):
+        self.window = int(window)
+        self.min_periods = int(min_periods or window)
+        self.buf = list(buf or [])
+        self.head = int(head)  # index of the oldest value once the buffer is full
+        self.mean = float(mean)
+        self.m2 = float(m2)
+        self.since_resync = int(since_resync)
+
+    @property
+    def n(self) -> int:
+        return len(self.buf)
+
+    def last(self):
+        if not self.buf:
+            return None
+        return self.buf[self.head - 1] if len(self.buf) == self.window else self.buf[-1]
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        if len(self.buf) < self.window:
+            self.buf.append(x)
+            d = x - self.mean
+            self.mean += d / len(self.buf)
+            self.m2 += d * (x - self.mean)
+        else:
+            old = self.buf[self.head]
+            self.buf[self.head] = x
+            self.head = (self.head + 1) % self.window
+            m0 = self.mean
+            self.mean += (x - old) / self.window
+            self.m2 += (x - old) * (x - self.mean + old - m0)
+        self.since_resync += 1
+        if self.since_resync >= self.window:
+            self.resync()
+
+    def resync(self) -> None:
+        """Recompute mean/m2 exactly from the buffer to stop float drift (O(window))."""
+        n = len(self.buf)
+        self.mean = sum(self.buf) / n if n else 0.0
+        self.m2 = sum((v - self.mean) ** 2 for v in self.buf)
+        self.since_resync = 0
+
+    def var(self, ddof: int = 0) -> float:
+        if self.n - ddof <= 0:
+            return float("nan")
+        return max(self.m2, 0.0) / (self.n - ddof)
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self.var(ddof))
+
+    def z(self, x: float = None) -> float:
+        """z of `x` (default: the latest value) against the current window, ddof=0."""
+        if self.n < self.min_periods:
+            return float("nan")
+        x = self.last() if x is None else x
+        sd = self.std()
+        if not sd > 0:
+            return float("nan")
+        return (x - self.mean) / sd
+
+    def extend(self, values) -> list:
+        """Push every value; returns the z-score after each push."""
+        out = []
+        for v in values:
+            self.push(v)
+            out.append(self.z())
+        return out
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "min_periods": self.min_periods, "buf": self.buf,
+                "head": self.head, "mean": self.mean, "m2": self.m2, "since_resync": self.since_resync}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingWindow":
+        return cls(**d)
+
+
+def _num(v):
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(v) else v
+
+
+def _window_hash(rows, end: int, window: int) -> str:
+    """sha1 of the last `window` valued (date, value) rows up to and including rows[end]."""
+    h = hashlib.sha1()
+    i, seen = end, 0
+    while i >= 0 and seen < window:
+        v = _num(rows[i][1])
+        if v is not None:
+            h.update(f"{rows[i][0]}={v!r};".encode())
+            seen += 1
+        i -= 1
+    return h.hexdigest()
+
+
+class RollingStore:
+    """Named RollingWindows persisted as one JSON file; keyed rows are folded once."""
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        except Exception:
+            self.state = {}
+        self.dirty = False
+
+    def update(self, key: str, rows, window: int, min_periods: int = None) -> dict:
+        """Fold `(date, value)` rows newer than the stored tail into window `key`.
+
+        `rows` may be any indexable sequence (a lazy view avoids touching old rows).
+        Returns {date: z} for the rows that were folded. The window is rebuilt from
+        scratch when its parameters change or any row inside the stored window no
+        longer matches (history revised or back-filled).
+        """
+        if not hasattr(rows, "__getitem__"):
+            rows = list(rows)
+        st = self.state.get(key)
+        params = {"window": int(window), "min_periods": int(min_periods or window)}
+        start = 0
+        if st and st.get("params") == params and st.get("last_date") is not None:
+            # rows are date-ordered: walk back from the end, so the cost is O(new rows)
+            last_date, last_val = st["last_date"], st["last_value"]
+            i = len(rows) - 1
+            while i >= 0 and str(rows[i][0]) > last_date:
+                i -= 1
+            if (i >= 0 and str(rows[i][0]) == last_date and _num(rows[i][1]) == last_val
+                    and _window_hash(rows, i, params["window"]) == st.get("window_hash")):
+                start = i + 1
+            else:
+                st = None
+        else:
+            st = None
+        win = RollingWindow.from_dict(st["window"]) if st else RollingWindow(**params)
+        new = [(str(d), _num(v)) for d, v in rows[start:]]
+        new = [(d, v) for d, v in new if v is not None]
+        zs = win.extend(v for _, v in new)
+        if new or st is None:
+            self.state[key] = {
+                "params": params,
+                "last_date": new[-1][0] if new else (st or {}).get("last_date"),
+                "last_value": new[-1][1] if new else (st or {}).get("last_value"),
+                "window_hash": _window_hash(rows, len(rows) - 1, params["window"]),
+                "window": win.to_dict(),
+            }
+            self.dirty = True
+        return {d: z for (d, _), z in zip(new, zs)}
+
+    def window(self, key: str):
+        st = self.state.get(key)
+        return RollingWindow.from_dict(st["window"]) if st else None
+
+    def last_z(self, key: str) -> float:
+        w = self.window(key)
+        return float("nan") if w is None else w.z()
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        d = os.path.dirname(self.path)
+        if d:
+            ensure_dir(d)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
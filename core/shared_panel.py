@@ -0,0 +1,219 @@
+"""Price / factor frames published once in shared memory for process-pool workers.
+
+A parameter sweep in a process pool otherwise pickles the same frames into every worker
+(or every task), and each worker holds its own unpickled copy. `SharedPanel.create`
+copies named frames, series or arrays into one `multiprocessing.shared_memory` block:
+values as C-ordered float64 (rows x columns), each with its own int64 / datetime64 index.
+`panel.spec` is a small picklable dict (block name, offsets, shapes, column labels);
+workers pass it to `SharedPanel.attach` and get read-only numpy views and DataFrames
+over the same pages, with no copy.
+
+Lifecycle: the creating process owns the block and removes it on `unlink()` or when the
+`with` block exits, whatever happens in the workers. A worker that dies only drops its
+mapping. Attaching does not register the block with the worker's resource tracker (which
+would unlink it when the worker exits); the owner's tracker still removes it if the
+owner is killed, and `reap()` clears blocks left by owners that are gone altogether.
+Blocks are named `<PREFIX><owner pid>_<token>`.
+"""
+import os
+import sys
+import secrets
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+PREFIX = "namm50_panel_"
+SHM_DIR = "/dev/shm"
+ALIGN = 64  # byte alignment of every array in the block
+
+
+def _as_frame(obj) -> tuple:
+    """(values float64 2-D C-ordered, index values or None, columns, kind)."""
+    if isinstance(obj, pd.Series):
+        return obj.to_numpy(dtype=np.float64)[:, None], obj.index, [obj.name], "series"
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_numpy(dtype=np.float64), obj.index, list(obj.columns), "frame"
+    a = np.asarray(obj, dtype=np.float64)
+    if a.ndim == 1:
+        return a[:, None], None, [None], "array1"
+    if a.ndim != 2:
+        raise ValueError(f"shared panel arrays must be 1-D or 2-D, got shape {a.shape}")
+    return a, None, list(range(a.shape[1])), "array"
+
+
+def _index_values(idx) -> np.ndarray:
+    if isinstance(idx, pd.DatetimeIndex):
+        if idx.tz is not None:
+            raise ValueError("shared panel indexes must be tz-naive")
+        return idx.values.astype("datetime64[ns]")
+    vals = np.asarray(idx)
+    if vals.dtype.kind not in "iu":
+        raise ValueError(f"shared panel indexes must be datetime or integer, got {vals.dtype}")
+    return vals.astype(np.int64)
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # before 3.13 attaching always registers with the resource tracker, which unlinks the
+    # block when this process exits even though it does not own it
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *a, **k: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reap(shm_dir: str = SHM_DIR) -> list:
+    """Unlink panel blocks whose owner process no longer exists; returns their names."""
+    if not os.path.isdir(shm_dir):
+        return []
+    gone = []
+    for fn in os.listdir(shm_dir):
+        if not fn.startswith(PREFIX):
+            continue
+        pid = fn[len(PREFIX):].split("_", 1)[0]
+        if pid.isdigit() and not _alive(int(pid)):
+            try:
+                os.unlink(os.path.join(shm_dir, fn))
+                gone.append(fn)
+            except OSError:
+                pass
+    return gone
+
+
+class SharedPanel:
+    def __init__(self, shm: shared_memory.SharedMemory, spec: dict, owner: bool):
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        self._views = {}
+
+    @classmethod
+    def create(cls, items: dict) -> "SharedPanel":
+        """Copy {name: DataFrame | Series | 1-D/2-D array} into a new block owned by this process."""
+        reap()
+        aligned = lambda n: -(-n // ALIGN) * ALIGN
+        layout, parts, size = {}, [], 0
+        for name, obj in items.items():
+            values, idx, cols, kind = _as_frame(obj)
+            entry = {"kind": kind, "shape": values.shape, "columns": cols, "offset": size}
+            parts.append((size, values))
+            size += aligned(values.nbytes)
+            if idx is not None:
+                iv = _index_values(idx)
+                entry.update(index_offset=size, index_dtype=iv.dtype.str, index_name=idx.name)
+                parts.append((size, iv))
+                size += aligned(iv.nbytes)
+            layout[name] = entry
+        shm = shared_memory.SharedMemory(name=f"{PREFIX}{os.getpid()}_{secrets.token_hex(4)}",
+                                         create=True, size=max(size, 1))
+        try:
+            for off, a in parts:
+                np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf, offset=off)[...] = a
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, {"name": shm.name, "size": size, "items": layout}, owner=True)
+
+    @classmethod
+    def attach(cls, spec: dict) -> "SharedPanel":
+        return cls(_attach_block(spec["name"]), spec, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.spec["name"]
+
+    def names(self) -> list:
+        return list(self.spec["items"])
+
+    def nbytes(self) -> int:
+        return int(self.spec["size"])
+
+    def _view(self, shape, dtype, offset) -> np.ndarray:
+        a = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.shm.buf, offset=offset)
+        a.flags.writeable = False
+        return a
+
+    def array(self, name: str) -> np.ndarray:
+        """Read-only (rows x columns) float64 view; 1-D for series and 1-D arrays."""
+        if name not in self._views:
+            e = self.spec["items"][name]
+            a = self._view(tuple(e["shape"]), np.float64, e["offset"])
+            self._views[name] = a[:, 0] if e["kind"] in ("series", "array1") else a
+        return self._views[name]
+
+    def index(self, name: str):
+        e = self.spec["items"][name]
+        if "index_offset" not in e:
+            return None
+        v = self._view((e["shape"][0],), e["index_dtype"], e["index_offset"])
+        if v.dtype.kind == "M":
+            return pd.DatetimeIndex(v, name=e["index_name"])
+        return pd.Index(v, name=e["index_name"])
+
+    def get(self, name: str):
+        """The item as it was published: DataFrame / Series over the shared pages, or the array."""
+        e = self.spec["items"][name]
+        a = self.array(name)
+        if e["kind"] == "series":
+            return pd.Series(a, index=self.index(name), name=e["columns"][0], copy=False)
+        if e["kind"] == "frame":
+            return pd.DataFrame(a, index=self.index(name), columns=e["columns"], copy=False)
+        return a
+
+    def close(self) -> None:
+        """Drop this process's mapping. Arrays and frames taken from the panel must not be
+        used afterwards; if some are still referenced the mapping goes when they do."""
+        self._views.clear()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self) -> None:
+        """Remove the block (owner only); processes still attached keep their mapping."""
+        if self.owner:
+            self.owner = False
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+        return False
+
+
+_worker_panel = None
+
+
+def init_worker(spec: dict) -> None:
+    """ProcessPoolExecutor initializer: attach once per worker process."""
+    global _worker_panel
+    _worker_panel = SharedPanel.attach(spec)
+
+
+def worker_panel() -> SharedPanel:
+    """The panel this worker attached to in init_worker."""
+    if _worker_panel is None:
+        raise RuntimeError("no shared panel attached in this process (missing init_worker)")
+    return _worker_panel
@@ -0,0 +1,240 @@
+"""Registry-driven technical factors over a (dates x tickers) price panel.
+
+factor_registry.yml entries with `"source": "prices"` name a ticker and a transform:
+
+    mom_<L>m_<S>m   close[t - S months] / close[t - L months] - 1   (21 sessions a month)
+    rsi_<n>         Wilder RSI
+    atrp_<n>        Wilder ATR as % of close (close-to-close range when no high/low)
+    ret_<n>         n-session return
+    vol_<n>         annualized stdev of daily returns over n sessions
+    sma_gap_<n>     close / SMA(n) - 1
+    dd_<n>          close / rolling n-session max - 1
+
+Every distinct ticker is loaded once, and each distinct transform is computed once for
+all tickers that need it, column-vectorized over the panel. The transform functions
+take (T, N) arrays whose close has already been forward-filled (compute() does this
+once per panel).
+"""
+import re
+import json
+import numpy as np
+import pandas as pd
+
+from core.breadth import _rolling_extreme
+from core import perf
+
+REGISTRY = "factor_registry.yml"
+MONTH = 21
+ANN = 252
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column (leading NaNs stay)."""
+    T = x.shape[0]
+    idx = np.where(np.isfinite(x), np.arange(T)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    out = x[idx, np.arange(x.shape[1])]
+    return out
+
+
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if k < x.shape[0]:
+        out[k:] = x[:x.shape[0] - k]
+    return out
+
+
+def _csum(x: np.ndarray, dtype=float) -> np.ndarray:
+    """Column cumsum with a leading zero row: cs[i] = sum of the first i rows."""
+    cs = np.empty((x.shape[0] + 1, x.shape[1]), dtype=dtype)
+    cs[0] = 0
+    np.cumsum(x, axis=0, out=cs[1:])
+    return cs
+
+
+def _rolling_sum(x: np.ndarray, n: int) -> np.ndarray:
+    """Trailing n-row sum per column; NaN unless all n rows are finite."""
+    ok = np.isfinite(x)
+    out = np.full(x.shape, np.nan)
+    if n <= x.shape[0]:
+        cs = _csum(np.where(ok, x, 0.0))
+        cn = _csum(ok, np.int32)
+        np.subtract(cs[n:], cs[:-n], out=out[n - 1:])
+        out[n - 1:][(cn[n:] - cn[:-n]) < n] = np.nan
+    return out
+
+
+def wilder(x: np.ndarray, n: int) -> np.ndarray:
+    """Wilder smoothing per column: mean of the first n finite values, then
+    avg += (x - avg) / n; NaN inputs hold the average."""
+    T, N = x.shape
+    valid = np.isfinite(x)
+    rank = np.cumsum(valid, axis=0, dtype=np.int32)
+    has = rank[-1] >= n if T else np.zeros(N, bool)
+    seed_at = np.where(has, np.argmax(rank >= n, axis=0), T)
+    cols = np.flatnonzero(has)
+    seeded = x.copy()
+    rows = np.arange(T)[:, None]
+    seeded[rows <= seed_at] = np.nan
+    if len(cols):
+        xz = np.where(valid, x, 0.0)
+        # sum of the first n finite values: cumsum up to the seed row
+        seeded[seed_at[cols], cols] = np.cumsum(xz, axis=0)[seed_at[cols], cols] / n
+    out = pd.DataFrame(seeded).ewm(alpha=1.0 / n, adjust=False, ignore_na=True).mean().to_numpy()
+    out[rows < seed_at] = np.nan
+    return out
+
+
+def momentum(close: np.ndarray, long_m: int = 12, skip_m: int = 1) -> np.ndarray:
+    c = close
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _shift(c, skip_m * MONTH) / _shift(c, long_m * MONTH) - 1.0
+
+
+def rsi(close: np.ndarray, n: int = 14) -> np.ndarray:
+    c = close
+    d = c - _shift(c, 1)
+    up = wilder(np.where(np.isfinite(d), np.maximum(d, 0.0), np.nan), n)
+    dn = wilder(np.where(np.isfinite(d), np.maximum(-d, 0.0), np.nan), n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = 100.0 - 100.0 / (1.0 + up / dn)
+    out[(dn == 0) & (up > 0)] = 100.0
+    out[(dn == 0) & (up == 0)] = 50.0
+    return out
+
+
+def atr_pct(close: np.ndarray, n: int = 14, high: np.ndarray = None, low: np.ndarray = None) -> np.ndarray:
+    c = close
+    pc = _shift(c, 1)
+    if high is None or low is None:
+        tr = np.abs(c - pc)
+    else:
+        with np.errstate(invalid="ignore"):
+            tr = np.fmax(high - low, np.fmax(np.abs(high - pc), np.abs(low - pc)))
+        tr[~np.isfinite(pc)] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return wilder(tr, n) / c * 100.0
+
+
+def ret_n(close: np.ndarray, n: int) -> np.ndarray:
+    c = close
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return c / _shift(c, n) - 1.0
+
+
+def vol_n(close: np.ndarray, n: int) -> np.ndarray:
+    c = close
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = c / _shift(c, 1) - 1.0
+    s = _rolling_sum(r, n)
+    q = _rolling_sum(r * r, n)
+    var = np.maximum(q / n - (s / n) ** 2, 0.0) * n / (n - 1)
+    return np.sqrt(var * ANN)
+
+
+def sma_gap(close: np.ndarray, n: int) -> np.ndarray:
+    c = close
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return c / (_rolling_sum(c, n) / n) - 1.0
+
+
+def drawdown_n(close: np.ndarray, n: int) -> np.ndarray:
+    c = close
+    hi = _rolling_extreme(c, n, np.maximum)
+    hi[:n - 1] = np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return c / hi - 1.0
+
+
+# (name pattern, smallest first parameter, transform); vol_n's n / (n - 1) needs n >= 2
+_PATTERNS = [
+    (re.compile(r"^mom_(\d+)m_(\d+)m$"), 1, lambda m, p: momentum(p["close"], int(m[1]), int(m[2]))),
+    (re.compile(r"^rsi_(\d+)$"), 1, lambda m, p: rsi(p["close"], int(m[1]))),
+    (re.compile(r"^atrp_(\d+)$"), 1, lambda m, p: atr_pct(p["close"], int(m[1]), p.get("high"), p.get("low"))),
+    (re.compile(r"^ret_(\d+)$"), 1, lambda m, p: ret_n(p["close"], int(m[1]))),
+    (re.compile(r"^vol_(\d+)$"), 2, lambda m, p: vol_n(p["close"], int(m[1]))),
+    (re.compile(r"^sma_gap_(\d+)$"), 1, lambda m, p: sma_gap(p["close"], int(m[1]))),
+    (re.compile(r"^dd_(\d+)$"), 1, lambda m, p: drawdown_n(p["close"], int(m[1]))),
+]
+
+
+def resolve(name: str):
+    for pat, lo, fn in _PATTERNS:
+        m = pat.match(name)
+        if m:
+            if int(m[1]) < lo:
+                raise ValueError(f"transform {name!r} needs a window of at least {lo}")
+            return lambda panel: fn(m, panel)
+    raise ValueError(f"unknown transform {name!r}")
+
+
+def registry_specs(path: str = REGISTRY) -> dict:
+    """{factor_id: (ticker, transform)} for every prices-sourced registry entry."""
+    with open(path, "r", encoding="utf-8") as f:
+        reg = json.load(f)  # the registry file is JSON despite its extension
+    return {fid: (v["ticker"], v["transform"]) for fid, v in reg.get("factors", {}).items()
+            if v.get("source") == "prices" and v.get("ticker") and v.get("transform")}
+
+
+def compute(panel: dict, specs: dict) -> pd.DataFrame:
+    """Evaluate specs on a panel {"close": DataFrame[, "high", "low"]} -> (dates x factor_id).
+
+    Each transform runs once over the columns of every ticker that uses it.
+    """
+    close = panel["close"]
+    pos = {t: j for j, t in enumerate(close.columns)}
+    arrays = {"close": _ffill(close.to_numpy(dtype=float))}
+    for k in ("high", "low"):
+        if panel.get(k) is not None:
+            arrays[k] = panel[k].reindex(index=close.index, columns=close.columns).to_numpy(dtype=float)
+    by_transform = {}
+    for fid, (ticker, name) in specs.items():
+        if ticker in pos:
+            by_transform.setdefault(name, []).append((fid, ticker))
+    fids = [f for items in by_transform.values() for f, _ in items]
+    out = np.empty((len(close), len(fids)))
+    j = 0
+    for name, items in by_transform.items():
+        tickers = list(dict.fromkeys(t for _, t in items))
+        cols = [pos[t] for t in tickers]
+        full = cols == list(range(len(pos)))
+        res = resolve(name)({k: (a if full else a[:, cols]) for k, a in arrays.items()})
+        at = {t: i for i, t in enumerate(tickers)}
+        out[:, j:j + len(items)] = res[:, [at[t] for _, t in items]]
+        j += len(items)
+    df = pd.DataFrame(out, index=close.index, columns=fids)
+    if fids != [f for f in specs if f in df.columns]:
+        df = df[[f for f in specs if f in df.columns]]
+    df.index.name = "date"
+    return df
+
+
+@perf.step("download")
+def load_ohlc(tickers, period: str = "max", tries: int = 3) -> dict:
+    """One yfinance call for every ticker -> {"close", "high", "low"} (dates x tickers)."""
+    import yfinance as yf
+    tickers = list(dict.fromkeys(tickers))
+    last = None
+    for i in range(tries):
+        try:
+            df = yf.download(tickers, period=period, interval="1d", auto_adjust=True, threads=True,
+                             progress=False, group_by="ticker")
+            have = [t for t in tickers if t in df.columns.get_level_values(0)]
+            if have:
+                return {k: pd.DataFrame({t: df[t][k.title()] for t in have}).sort_index()
+                        for k in ("close", "high", "low")}
+            last = RuntimeError("empty download")
+        except Exception as e:
+            last = e
+        print(f"[warn] yfinance download ({i+1}/{tries}) failed:", last)
+        perf.count("retries")
+        perf.sleep(2 * (i + 1))
+    raise RuntimeError(f"price panel download failed: {last}")
+
+
+def compute_registry(path: str = REGISTRY, loader=load_ohlc) -> pd.DataFrame:
+    specs = registry_specs(path)
+    if not specs:
+        return pd.DataFrame()
+    panel = loader(sorted({t for t, _ in specs.values()}))
+    return compute(panel, specs)
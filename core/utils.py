@@ -1,6 +1,7 @@
 import os
 import json
-from datetime import datetime, timezone
+import math
+from datetime import datetime, timezone, time as dt_time
 
 def ensure_dir(path: str) -> None:
     """Create directory if it doesn't exist (no error if already present)."""
@@ -32,16 +33,134 @@ def _default(o):
         return o.__dict__
     return str(o)
 
-def write_json(path: str, data, indent: int = 2, **kwargs) -> None:
+def _fast_default(o):
+    """Bulk conversion for the fast path: one call per array/Series/DataFrame, not per element."""
+    import numpy as np
+    import pandas as pd
+    if isinstance(o, pd.Series):
+        return series_rows(o)
+    if isinstance(o, pd.DataFrame):
+        out = {"date": _dates(o.index)} if isinstance(o.index, pd.DatetimeIndex) else {"index": o.index.tolist()}
+        for c in o.columns:
+            out[str(c)] = _values(o[c].to_numpy())
+        return out
+    if isinstance(o, np.ndarray):
+        if o.dtype.kind == "M":
+            return np.datetime_as_string(o, unit="D").tolist()
+        return _values(o)
+    if isinstance(o, np.datetime64):
+        return str(np.datetime_as_string(o, unit="D"))
+    if isinstance(o, np.generic):
+        v = o.item()
+        return None if isinstance(v, float) and not math.isfinite(v) else v
+    if isinstance(o, pd.Timestamp):
+        return o.strftime("%Y-%m-%d") if o == o.normalize() else o.isoformat()
+    if isinstance(o, datetime):
+        return o.strftime("%Y-%m-%d") if o.time() == dt_time(0) else o.isoformat()
+    if isinstance(o, pd.Index):
+        return _dates(o) if isinstance(o, pd.DatetimeIndex) else o.tolist()
+    return _default(o)
+
+def _dates(idx):
+    import numpy as np
+    return np.datetime_as_string(idx.values.astype("datetime64[D]"), unit="D").tolist()
+
+def _values(a):
+    """ndarray -> list with NaN/NaT as None (vectorized mask, C-level tolist)."""
+    import numpy as np
+    a = np.asarray(a)
+    if a.dtype.kind == "f":
+        bad = ~np.isfinite(a)
+        if bad.any():
+            a = a.astype(object)
+            a[bad] = None
+    return a.tolist()
+
+def series_rows(s) -> list:
+    """[[YYYY-MM-DD, value], ...] for a date-indexed Series; NaN becomes null."""
+    import pandas as pd
+    dates = _dates(pd.DatetimeIndex(s.index)) if len(s) else []
+    return list(map(list, zip(dates, _values(s.to_numpy()))))
+
+def rows_series(rows, name=None):
+    """Inverse of series_rows: date-indexed float Series from [[date, value, ...], ...]."""
+    import numpy as np
+    import pandas as pd
+    rows = [r for r in rows or [] if r and len(r) > 1]
+    if not rows:
+        return pd.Series(dtype=float, name=name)
+    dates, vals = zip(*((r[0], r[1]) for r in rows))
+    idx = pd.DatetimeIndex(np.array(dates, dtype="datetime64[D]"), name="date")
+    return pd.Series(np.array(vals, dtype=float), index=idx, name=name)
+
+def _finite(o):
+    """Copy of plain containers with non-finite floats as None (what orjson writes)."""
+    if isinstance(o, float):
+        return o if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {k: _finite(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_finite(v) for v in o]
+    return o
+
+def dumps_fast(data, indent=None) -> bytes:
+    """Serialize with NumPy/pandas support; orjson when installed, else the stdlib C encoder
+    (compact output; an indent falls back to the slower pure-Python encoder). Both backends
+    give the same document: arrays and datetimes go through _fast_default (dates come out
+    as YYYY-MM-DD) and NaN / inf are written as null."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        opt = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            opt |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_fast_default, option=opt)
+    kw = {"indent": indent} if indent else {"separators": (",", ":")}
+    try:
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, default=_fast_default, **kw).encode("utf-8")
+    except ValueError:
+        # only payloads that hold a NaN / inf float pay for the copy
+        return json.dumps(_finite(data), ensure_ascii=False, allow_nan=False, default=_fast_default,
+                          **kw).encode("utf-8")
+
+def write_json(path: str, data, indent: int = 2, fast: bool = False, **kwargs) -> None:
     """Write JSON with sensible defaults.
-    Accepts an 'indent' kwarg for backward compatibility.
+    Accepts an 'indent' kwarg for backward compatibility. `fast=True` converts arrays,
+    Series and DataFrames in bulk and writes atomically (pass indent=None for compact output).
     """
     d = os.path.dirname(path)
     if d:
         ensure_dir(d)
+    if fast:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_fast(data, indent=indent))
+        os.replace(tmp, path)
+        return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=indent, default=_default, **kwargs)
 
+def read_json(path: str, default=None):
+    """Parse a JSON file (orjson when installed); `default` is returned if it is missing or invalid."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return default
+    try:
+        import orjson
+        return orjson.loads(raw)
+    except ImportError:
+        pass
+    except ValueError:
+        return default
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return default
+
 def to_json_ready(obj):
     """Best-effort conversion of common scientific types to JSON-serializable."""
     try:
@@ -1,7 +1,30 @@
 import pandas as pd, yfinance as yf
 from core.utils import ensure_dir
+from core.rolling import RollingStore
 
 OUT = "data/raw/china_proxy_fxi.csv"
+Z_WINDOW = 60
+
+
+def prev_z() -> pd.Series:
+    try:
+        prev = pd.read_csv(OUT, index_col=0)
+        return pd.Series(prev["z"].values, index=prev.index.astype(str))
+    except Exception:
+        return pd.Series(dtype=float)
+
+
+def rolling_z(s: pd.Series, prev: pd.Series) -> pd.Series:
+    """60-day z of `s`; only rows after the persisted window state are computed."""
+    state = RollingStore()
+    if prev.empty:
+        state.state.pop("china_proxy_fxi", None)  # no earlier z column to extend
+    dates = s.index.strftime("%Y-%m-%d")
+    new = state.update("china_proxy_fxi", list(zip(dates, s.values)), window=Z_WINDOW)
+    state.save()
+    z = prev.reindex(dates).where(~dates.isin(list(new)))
+    z.update(pd.Series(new))
+    return pd.Series(z.values, index=s.index)
 
 
 def main():
@@ -17,8 +40,7 @@ def main():
         return
     df = df[["Close"]].rename(columns={"Close": "close"})
     s = df["close"].pct_change().rolling(5).mean() * 100.0
-    z = (s - s.rolling(60).mean()) / s.rolling(60).std(ddof=0)
-    df["z"] = z
+    df["z"] = rolling_z(s, prev_z())
     ensure_dir(OUT)
     df.to_csv(OUT, index=True, date_format="%Y-%m-%d")
     print(f"saved {OUT}, rows={len(df)}")
@@ -1,5 +1,8 @@
-import os, requests, pandas as pd, json
+import os, pandas as pd, json
 from core.utils import ensure_dir
+from core.fred import FredClient, build_frame
+from core.http import get_session
+from core import perf
 
 API = os.environ.get("FRED_API_KEY")
 OUT = "data/raw/fred_bundle.csv"
@@ -13,37 +16,23 @@ def get_series():
         return []
 
 
-def fred_series(series_id):
+def fred_series(series_id, client=None):
     if not API:
         return None
-    url = (
-        "https://api.stlouisfed.org/fred/series/observations?series_id="
-        f"{series_id}&api_key={API}&file_type=json"
-    )
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    js = r.json()
-    obs = js.get("observations", [])
-    df = pd.DataFrame(obs)[["date", "value"]]
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.dropna(subset=["date"])
-    df = df.rename(columns={"value": series_id}).set_index("date").sort_index()
-    return df
+    client = client or FredClient(API)
+    return client.fetch(series_id).to_frame(series_id)
 
 
 def main():
     series = get_series()
-    frames = []
-    for s in series:
-        try:
-            df = fred_series(s)
-            if df is not None:
-                frames.append(df)
-        except Exception as e:
-            print(f"FRED fetch failed for {s}: {e}")
+    frames = {}
+    client = FredClient(API) if API else None
+    if client is not None and series:
+        frames = client.fetch_many(series)
+        print(client.report())
+        print(get_session().report())
     if frames:
-        out = pd.concat(frames, axis=1).sort_index()
+        out = build_frame(frames, [s for s in series if s in frames])
     else:
         out = pd.DataFrame(columns=["date"] + series)
     ensure_dir(OUT)
@@ -52,4 +41,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    perf.run("fred_bundle", main)
@@ -1,8 +1,13 @@
 
-import csv, io, requests
+import os, csv, io
 from core.utils import ensure_dir, ts_now_iso
+from core.http import get_session, get_text_with_fallbacks as _get_text
+from core import perf, handoff
 
-OUT = "data/raw/naaim_exposure.csv"
+OUT_CSV = "data/raw/naaim_exposure.csv"
+OUT = OUT_CSV
+# weekly series; within this window the cached copy is used, after it the server is asked (ETag)
+TTL = 6 * 3600
 URLS = [
     "https://www.naaim.org/wp-content/uploads/naaim_exposure_index.csv",
     "https://naaim.org/wp-content/uploads/naaim_exposure_index.csv",
@@ -10,10 +15,20 @@ URLS = [
 ]
 
 def fetch(url: str) -> str:
-    r = requests.get(url, timeout=30)
+    r = get_session().get(url, timeout=30, ttl=TTL)
     r.raise_for_status()
     return r.text
 
+def get_text_with_fallbacks(urls, timeout=30):
+    return _get_text(urls, timeout=timeout, ttl=TTL)
+
+def load_prev_csv(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return rows or None
+
 def parse(text: str):
     df = []
     reader = csv.DictReader(io.StringIO(text))
@@ -28,30 +43,33 @@ def parse(text: str):
             df.append({"date": d, "value": v})
     return df
 
-def write_csv(rows):
-    ensure_dir("data/raw")
-    with open(OUT, "w", encoding="utf-8", newline="") as f:
+def write_csv(rows, path=None):
+    path = path or OUT_CSV
+    ensure_dir(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8", newline="") as f:
         wr = csv.DictWriter(f, fieldnames=["date","value"])
         wr.writeheader()
         for r in rows:
             wr.writerow(r)
 
 def main():
-    last_err = None
-    for url in URLS:
-        try:
-            txt = fetch(url)
-            rows = parse(txt)
-            if rows:
-                write_csv(rows)
-                print(f"saved {OUT}, rows={len(rows)}")
-                return
-        except Exception as e:
-            last_err = e
-            print(f"fetch failed {url}: {e}")
+    try:
+        rows = parse(get_text_with_fallbacks(URLS, timeout=30))
+    except Exception as e:
+        print(f"NAAIM fetch failed: {e}")
+        rows = []
+    print(get_session().report())
+    if rows:
+        handoff.put(OUT_CSV, rows, lambda p, r: write_csv(r, p))
+        print(f"saved {OUT_CSV}, rows={len(rows)}")
+        return
+    prev = load_prev_csv(OUT_CSV)
+    if prev:
+        print(f"[fallback] kept previous {OUT_CSV}, rows={len(prev)}")
+        return
     # fallback: write empty with header
-    write_csv([])
+    handoff.put(OUT_CSV, [], lambda p, r: write_csv(r, p))
     print("NAAIM fallback: wrote empty csv.")
 
 if __name__ == "__main__":
-    main()
+    perf.run("fetch_naaim", main)
@@ -1,73 +1,89 @@
-import os, sys, time, pandas as pd, numpy as np, requests
+import os, sys, pandas as pd, numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from tools.utils import safe_write_csv, write_placeholder_csv, load_prev_csv
+from core.breadth import compute_breadth
+from core.constituents import membership
+from core.http import get_session
+from core import perf, handoff
 
 OUT_CSV = "data/raw/ndx_breadth.csv"
-WIKI_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
 
-def get_ndx_constituents():
+FALLBACK = ["AAPL","MSFT","NVDA","AMZN","META","GOOGL","GOOG","AVGO","TSLA","ADBE",
+            "PEP","COST","NFLX","AMD","CSCO","TXN","INTC","QCOM","AMGN","HON"]
+
+def get_membership():
+    """Point-in-time NDX membership (cached; the wiki page is checked at most daily)."""
     try:
-        r = requests.get(WIKI_URL, timeout=30, headers={
-            "User-Agent": "Mozilla/5.0 AMBot"
-        })
-        r.raise_for_status()
-        tables = pd.read_html(r.text)
-        # 找包含 Ticker 列的表
-        for df in tables:
-            cols = [str(c).lower() for c in df.columns]
-            if any("ticker" in c for c in cols):
-                # 找到第一列含 ticker 的列名
-                for c in df.columns:
-                    if "ticker" in str(c).lower():
-                        tickers = list(df[c].dropna().astype(str))
-                        tickers = [t.strip().upper().replace(".","-") for t in tickers if t.strip()]
-                        return sorted(set(tickers))
+        return membership("ndx")
     except Exception as e:
-        print("[warn] wiki ndx scrape failed:", e)
+        print("[warn] constituent store unavailable:", e)
+    return None
+
+def get_ndx_constituents():
+    idx = get_membership()
+    if idx is not None and idx.current():
+        return idx.current()
     # 兜底小集合
-    return ["AAPL","MSFT","NVDA","AMZN","META","GOOGL","GOOG","AVGO","TSLA","ADBE",
-            "PEP","COST","NFLX","AMD","CSCO","TXN","INTC","QCOM","AMGN","HON"]
+    return list(FALLBACK)
 
-def breadth_topn(tickers, topn=25):
+@perf.step("download")
+def download_closes(tickers, period="2y", tries=3):
+    """One yfinance call for the whole universe -> dense (dates x tickers) close matrix."""
     import yfinance as yf
-    tickers = list(tickers)[:max(5, topn)]
-    tries = [topn, 15, 10, 8, 5]
-    last_ok = None
-    for n in tries:
-        sub = tickers[:n]
+    tickers = list(tickers)
+    last = None
+    for i in range(tries):
         try:
-            df = yf.download(sub, period="1y", interval="1d", auto_adjust=True, threads=False, progress=False, group_by="ticker")
-            # 构造收盘价矩阵
-            close = pd.DataFrame({t: df[t]["Close"] if (t in df and "Close" in df[t]) else pd.Series(dtype=float) for t in sub})
+            df = yf.download(tickers, period=period, interval="1d", auto_adjust=True, threads=True, progress=False, group_by="ticker")
+            close = pd.DataFrame({t: df[t]["Close"] for t in tickers if t in df.columns.get_level_values(0)})
             close = close.dropna(how="all").sort_index()
-            if close.empty:
-                raise RuntimeError("empty close matrix")
-            sma50 = close.rolling(50).mean()
-            br = (close >= sma50).sum(axis=1) / close.shape[1] * 100.0
-            s = br.rename("pct_above_50dma").reset_index()
-            s.columns = ["date","value"]
-            return s
+            if not close.empty:
+                return close
+            last = RuntimeError("empty close matrix")
         except Exception as e:
-            print(f"[warn] yfinance breadth {n} failed:", e)
-            last_ok = None
-            time.sleep(2)
-    return last_ok
+            last = e
+        print(f"[warn] yfinance universe download ({i+1}/{tries}) failed:", last)
+        perf.count("retries")
+        perf.sleep(2 * (i + 1))
+    return pd.DataFrame()
+
+def breadth_full(tickers, period="2y", members=None):
+    """All breadth factor columns for the full constituent list; `value` stays % above 50DMA.
+
+    With `members` (a MembershipIndex) each day only counts that day's index members.
+    """
+    close = download_closes(tickers, period=period)
+    if close.empty:
+        return None
+    br = compute_breadth(close, membership=members).dropna(subset=["pct_above_50dma"])
+    out = br.reset_index()
+    out.insert(1, "value", out["pct_above_50dma"])
+    return out
 
 def main():
-    tickers = get_ndx_constituents()
-    topn = int(os.environ.get("NDX_TOPN","25"))
-    s = breadth_topn(tickers, topn=topn)
+    period = os.environ.get("NDX_PERIOD", "2y")
+    members = get_membership()
+    print(get_session().report())
+    if members is not None:
+        # everyone who was in the index at any point of the window, not just today's list
+        now = pd.Timestamp.utcnow().tz_localize(None)
+        years = int(period[:-1]) if period.endswith("y") and period[:-1].isdigit() else 10
+        tickers = members.tickers_between(now - pd.DateOffset(years=years), now)
+    else:
+        tickers = list(FALLBACK)
+    s = breadth_full(tickers, period=period, members=members)
     if s is not None and len(s) > 0:
-        safe_write_csv(s, OUT_CSV)
+        handoff.put(OUT_CSV, s, lambda p, df: safe_write_csv(df, p))
         print(f"saved {OUT_CSV}, rows={len(s)}")
         return
     prev = load_prev_csv(OUT_CSV)
     if prev is not None and len(prev) > 0:
-        safe_write_csv(prev, OUT_CSV)
+        handoff.put(OUT_CSV, prev, lambda p, df: safe_write_csv(df, p))
         print(f"[fallback] kept previous {OUT_CSV}, rows={len(prev)}")
         return
-    write_placeholder_csv(OUT_CSV, ["date","value"])
+    handoff.put(OUT_CSV, pd.DataFrame(columns=["date", "value"]),
+                lambda p, df: write_placeholder_csv(p, list(df.columns)))
     print(f"[placeholder] wrote empty {OUT_CSV}")
 
 if __name__ == "__main__":
-    main()
+    perf.run("fetch_ndx_breadth", main)
@@ -1,20 +1,16 @@
-import time, pandas as pd, numpy as np
+import pandas as pd, numpy as np
 import yfinance as yf
 from core.utils import ensure_dir
+from core.breadth import compute_breadth
+from core.constituents import membership
+from core import perf
 
 OUT = "data/raw/ndx_breadth_50dma.csv"
-WIKI = "https://en.wikipedia.org/wiki/Nasdaq-100"
 
 
 def constituents():
     try:
-        tables = pd.read_html(WIKI)
-        for t in tables:
-            cols = [c.lower() for c in t.columns]
-            if any("ticker" in c or "symbol" in c for c in cols):
-                col = t.columns[["ticker" in c.lower() or "symbol" in c.lower() for c in cols].index(True)]
-                tickers = t[col].astype(str).str.replace(r"\..*", "", regex=True).tolist()
-                return tickers
+        return [t.split("-")[0] for t in membership("ndx").current()]
     except Exception as e:
         print(f"wiki fetch failed: {e}")
     return []
@@ -27,7 +23,8 @@ def download_batch(batch):
             return df
         except Exception as e:
             print(f"batch {batch} failed: {e}")
-            time.sleep(1.2)
+            perf.count("retries")
+            perf.sleep(1.2)
     return pd.DataFrame()
 
 
@@ -47,15 +44,14 @@ def compute():
             df = df[["Close"]]
             df.columns = [batch[0]]
         closes.append(df)
-        time.sleep(1.2)
+        perf.sleep(1.2)
     if not closes:
         return pd.DataFrame(columns=["date", "pct_above"])
     px = pd.concat(closes, axis=1).sort_index()
-    sma50 = px.rolling(50).mean()
-    pct = (px >= sma50).sum(axis=1) / px.shape[1] * 100.0
-    out = pct.to_frame("pct_above")
-    out.index.name = "date"
-    return out
+    px = px.loc[:, ~px.columns.duplicated()]
+    br = compute_breadth(px)
+    out = br.rename(columns={"pct_above_50dma": "pct_above"})
+    return out[["pct_above"] + [c for c in out.columns if c != "pct_above"]]
 
 
 def main():
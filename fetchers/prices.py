@@ -2,32 +2,34 @@
 """
 Fetch spot prices via Alpha Vantage GLOBAL_QUOTE (free; ~15min delayed).
 Falls back to TIME_SERIES_DAILY (EOD) if GLOBAL_QUOTE fails.
+Symbols are fetched on a bounded thread pool (PRICES_CONCURRENCY, default 4);
+pacing against the key's quota is left to the shared Alpha Vantage token bucket.
 Output: docs/prices.json
 """
-import os, json, time, requests, datetime as dt
+import os, json, datetime as dt
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from core.alphavantage import AV_URL, av_get as _av_get
+from core.http import get_session
+from core.utils import read_json
+from core.artifacts import write_artifact, report
+from core import perf
 
 API_KEY = os.environ.get("ALPHAVANTAGE_API_KEY", "")
-if not API_KEY:
-    raise SystemExit("ALPHAVANTAGE_API_KEY is not set in Actions secrets.")
 
 OUT = Path("docs/prices.json")
-OUT.parent.mkdir(parents=True, exist_ok=True)
+CONCURRENCY = int(os.environ.get("PRICES_CONCURRENCY", "4"))
 
 # Add/adjust your symbols here
 SYMBOLS = ["SPY", "QQQ", "TQQQ", "SOXL", "FEZ", "CURE"]
 
-BASE = "https://www.alphavantage.co/query"
+BASE = AV_URL
 
 def av_get(params: dict):
-    params = {**params, "apikey": API_KEY}
-    r = requests.get(BASE, params=params, timeout=30)
-    r.raise_for_status()
-    data = r.json()
-    # Alpha Vantage sometimes returns note/rate limit info with 200
-    if any(k in data for k in ("Note", "Information")):
-        raise RuntimeError(data.get("Note") or data.get("Information"))
-    return data
+    # Shared token bucket: waits only when the per-key quota is actually used up,
+    # and raises on persistent Note/Information throttling like before.
+    return _av_get(params, API_KEY, url=BASE, timeout=30)
 
 def fetch_global_quote(symbol: str) -> float:
     data = av_get({"function": "GLOBAL_QUOTE", "symbol": symbol})
@@ -47,47 +49,61 @@ def fetch_daily_close(symbol: str) -> float:
     return float(px)
 
 def read_previous():
+    return read_json(str(OUT), {"symbols": []})
+
+def fetch_symbol(symbol: str):
+    """GLOBAL_QUOTE with EOD fallback for one symbol -> (price, error)."""
+    try:
+        return fetch_global_quote(symbol), None
+    except Exception as e:
+        err = str(e)
     try:
-        return json.loads(OUT.read_text())
-    except Exception:
-        return {"symbols": []}
+        # fallback to EOD
+        return fetch_daily_close(symbol), None
+    except Exception as e2:
+        return None, f"{err} | fallback: {e2}"
 
-def main():
+@perf.step("fetch_all")
+def fetch_all(symbols, concurrency: int = CONCURRENCY) -> dict:
+    """{symbol: (price, error)}; quote + fallback chains run in parallel per symbol."""
+    symbols = list(symbols)
+    if concurrency <= 1 or len(symbols) <= 1:
+        return {sym: fetch_symbol(sym) for sym in symbols}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(symbols))) as ex:
+        return dict(zip(symbols, ex.map(fetch_symbol, symbols)))
+
+def merge(results: dict, prev: dict, symbols) -> list:
+    """Entries in `symbols` order; failures keep the previous price with a warning."""
+    prev_map = {x.get("symbol"): x for x in prev.get("symbols", [])}
+    entries = []
+    for sym in symbols:
+        px, err = results[sym]
+        if px is not None:
+            entries.append({"symbol": sym, "price": round(px, 2)})
+            continue
+        # keep previous value if exists, but annotate error
+        prev_entry = prev_map.get(sym)
+        if prev_entry and "price" in prev_entry:
+            entries.append({"symbol": sym, "price": prev_entry["price"], "warning": err})
+        else:
+            entries.append({"symbol": sym, "error": err or "unknown error"})
+    return entries
+
+def main(symbols=None, concurrency: int = None):
+    if not API_KEY:
+        raise SystemExit("ALPHAVANTAGE_API_KEY is not set in Actions secrets.")
+    symbols = symbols or SYMBOLS
     prev = read_previous()
     out = {
         "as_of": dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
         "symbols": []
     }
+    results = fetch_all(symbols, CONCURRENCY if concurrency is None else concurrency)
+    out["symbols"] = merge(results, prev, symbols)
+    print(get_session().report())
 
-    for idx, sym in enumerate(SYMBOLS):
-        # Free plan: 5 req/min; be conservative
-        if idx:
-            time.sleep(13)
-        px = None
-        err = None
-        try:
-            px = fetch_global_quote(sym)
-        except Exception as e:
-            err = str(e)
-            try:
-                # fallback to EOD
-                px = fetch_daily_close(sym)
-                err = None
-            except Exception as e2:
-                err = f"{err} | fallback: {e2}"
-
-        if px is not None:
-            out["symbols"].append({"symbol": sym, "price": round(px, 2)})
-        else:
-            # keep previous value if exists, but annotate error
-            prev_map = {x.get("symbol"): x for x in prev.get("symbols", [])}
-            prev_entry = prev_map.get(sym)
-            if prev_entry and "price" in prev_entry:
-                out["symbols"].append({"symbol": sym, "price": prev_entry["price"], "warning": err})
-            else:
-                out["symbols"].append({"symbol": sym, "error": err or "unknown error"})
-
-    OUT.write_text(json.dumps(out, ensure_ascii=False, indent=2))
+    write_artifact(str(OUT), out)
+    print(report())
 
 if __name__ == "__main__":
-    main()
+    perf.run("prices", main)
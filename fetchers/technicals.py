@@ -0,0 +1,33 @@
+import os
+import pandas as pd
+from core.utils import ensure_dir
+from core.transforms import registry_specs, compute, load_ohlc
+from core import perf, handoff
+
+OUT = "data/raw/technicals.csv"
+PERIOD = os.environ.get("TECH_PERIOD", "max")
+
+
+def save_csv(path, df):
+    ensure_dir(os.path.dirname(path))
+    df.to_csv(path, index=True, date_format="%Y-%m-%d")
+
+
+def main():
+    specs = registry_specs()
+    if not specs:
+        print("no prices-sourced factors in the registry")
+        return
+    tickers = sorted({t for t, _ in specs.values()})
+    try:
+        panel = load_ohlc(tickers, period=PERIOD)
+    except Exception as e:
+        print(f"[warn] {e}; keeping previous {OUT}")
+        return
+    out = compute(panel, specs).dropna(how="all")
+    handoff.put(OUT, out, save_csv)
+    print(f"saved {OUT}, {len(tickers)} tickers -> cols={list(out.columns)}, rows={len(out)}")
+
+
+if __name__ == "__main__":
+    perf.run("fetch_technicals", main)
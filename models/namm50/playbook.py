@@ -1,5 +1,6 @@
-import json
-from core.utils import ts_now_iso, write_json
+from core.utils import ts_now_iso
+from core.artifacts import report
+from core import perf, handoff
 
 SIG = "docs/signals_namm50.json"
 OUT = "docs/playbook_namm50.json"
@@ -15,7 +16,7 @@ def plan(s):
 
 def main():
     try:
-        sig = json.load(open(SIG, "r", encoding="utf-8"))
+        sig = handoff.read_json(SIG, {})
         score = float(sig.get("score", 0.0))
     except Exception:
         score = 0.0
@@ -28,9 +29,9 @@ def main():
             "1M": {"action": action, "note": note, "risk": risk},
         },
     }
-    write_json(OUT, payload)
-    print(f"wrote {OUT}")
+    handoff.write_artifact(OUT, payload)
+    print(report())
 
 
 if __name__ == "__main__":
-    main()
+    perf.run("playbook", main)
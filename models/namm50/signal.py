@@ -1,10 +1,21 @@
-import json, numpy as np, pandas as pd
-from core.utils import ts_now_iso, write_json
+import math
+from core.utils import ts_now_iso
+from core.artifacts import report
+from core.rolling import RollingStore
+from core import perf, handoff, regime
 
 MODEL = "docs/models/namm50.json"
 FACT  = "docs/factors_namm50.json"
 OUT   = "docs/signals_namm50.json"
+HISTORY_JSON = "docs/signals_namm50_history.json"
+HISTORY_CSV = "docs/signals_namm50_history.csv"
 WINDOW = 180
+MIN_PERIODS = 60
+STATE = "data/state/rolling_namm50.json"
+# sessions this close to the last history session may have been scored before a lagged
+# source published its rows for them (longest lag in core/calendar.py plus slack), so the
+# daily extension recomputes them
+REDO_DAYS = 60
 
 WEIGHT_MAP = {
     "naaim_exposure": "NAAM",
@@ -27,8 +38,8 @@ WEIGHT_MAP = {
 }
 
 
-def extract_values(series):
-    vals = []
+def extract_rows(series):
+    rows = []
     for row in series:
         if not row:
             continue
@@ -38,45 +49,238 @@ def extract_values(series):
         elif len(row) > 2:
             value = row[2]
         if value is not None:
-            vals.append(float(value))
+            rows.append((row[0], float(value)))
+    return rows
+
+
+class SeriesRows:
+    """Indexable (date, value) view over raw factor rows, with extract_rows' value rule."""
+
+    def __init__(self, series):
+        self.series = series
+
+    def __len__(self):
+        return len(self.series)
+
+    @staticmethod
+    def _row(row):
+        if not row:
+            return ("", None)
+        if len(row) > 1 and row[1] is not None:
+            return (row[0], row[1])
+        return (row[0], row[2] if len(row) > 2 else None)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(r) for r in self.series[i]]
+        return self._row(self.series[i])
+
+
+def extract_values(series):
+    vals = [v for _, v in extract_rows(series)]
+    import pandas as pd  # lazy: the live signal only needs floats
     return pd.Series(vals) if vals else None
 
 
 def compute_z(series):
+    """Full-recompute reference for the last rolling z (see RollingStore for the daily path)."""
     if series is None or series.empty:
         return None
-    win = WINDOW if len(series) >= WINDOW else max(60, len(series))
+    win = WINDOW if len(series) >= WINDOW else max(MIN_PERIODS, len(series))
     if win < 2:
         return None
     z = (series - series.rolling(win).mean()) / series.rolling(win).std(ddof=0)
     return z.iloc[-1] if not z.empty else None
 
 
+def incremental_z(state, fid, series):
+    """Last rolling z for a factor, folding only rows newer than the persisted state."""
+    state.update(fid, SeriesRows(series), window=WINDOW, min_periods=MIN_PERIODS)
+    return state.last_z(fid)
+
+
+def stance_for(score: float) -> str:
+    return regime.stance(score)
+
+
+def _tail_start(series, cutoff: str):
+    """(first raw row to read, valued rows before the seed) so that the rolling z of the
+    seed row, the last valued one dated <= cutoff, and of everything after it comes out
+    exact: the read starts WINDOW valued rows back. (0, 0) when there is no seed."""
+    rows = SeriesRows(series)
+    i = len(rows) - 1
+    while i >= 0 and (str(rows[i][0]) > cutoff or rows[i][1] is None):
+        i -= 1
+    if i < 0:
+        return 0, 0
+    seen = 0
+    while i >= 0:
+        if rows[i][1] is not None:
+            seen += 1
+            if seen == WINDOW:
+                break
+        i -= 1
+    return max(i, 0), seen - 1
+
+
+def z_columns(factors: dict, cutoff: str = None) -> dict:
+    """{fid: rolling z by observation date} for every WEIGHT_MAP factor with rows, the same
+    z the live signal takes for the last row, for all rows in one (rows x factors) pass.
+    With `cutoff` (YYYY-MM-DD) only rows from the last one dated <= cutoff onward."""
+    import numpy as np
+    import pandas as pd
+    from core.backtest import normalize
+    fids, dates, vals, skip = [], [], [], []
+    for fid in WEIGHT_MAP:
+        series = (factors.get(fid) or {}).get("series")
+        if not series:
+            continue
+        start, k = (0, 0) if cutoff is None else _tail_start(series, cutoff)
+        rows = extract_rows(series[start:])
+        if len(rows) <= k:
+            continue
+        fids.append(fid)
+        dates.append(pd.to_datetime([d for d, _ in rows], format="ISO8601", errors="coerce"))
+        vals.append(np.array([v for _, v in rows]))
+        skip.append(k)
+    if not fids:
+        return {}
+    X = np.full((max((len(v) for v in vals), default=0), len(fids)), np.nan)
+    for j, v in enumerate(vals):
+        X[:len(v), j] = v
+    # each column is one factor's own row sequence: expanding until WINDOW rows, then rolling
+    Z = normalize(X, mode="rolling", window=WINDOW, min_periods=MIN_PERIODS, fill=np.nan)
+    out = {}
+    for j, fid in enumerate(fids):
+        z = pd.Series(Z[skip[j]:len(vals[j]), j], index=dates[j][skip[j]:])
+        out[fid] = z[z.index.notna()]
+    return out
+
+
+def score_history(factors: dict, weights: dict, start=None, end=None, cutoff: str = None):
+    """(sessions, score, factors used) from the first session any factor is known (or
+    `start`) to `end`: each factor's latest z published by that close (core/calendar.py
+    lags) times its weight; unknown factors count 0, like placeholders in main()."""
+    import numpy as np
+    import pandas as pd
+    from core import calendar
+    cols = z_columns(factors, cutoff)
+    cols = {f: z for f, z in cols.items() if z.notna().any()}
+    if not cols:
+        return pd.DatetimeIndex([], name="date"), np.zeros(0), np.zeros(0, int)
+    first_row = min(z.first_valid_index() for z in cols.values())
+    start = first_row if start is None else pd.Timestamp(start)
+    # the calendar starts at the first z row so that session lags of rows dated before
+    # `start` are counted from their own date, then the leading sessions are dropped
+    index = calendar.sessions(min(start, first_row), end if end is not None else pd.Timestamp.now())
+    Z = calendar.asof_join(cols, index, lags={f: calendar.lag_for(f) for f in cols})
+    Z = Z[Z.index >= start].to_numpy()
+    index = index[index >= start]
+    w = np.array([float(weights.get(WEIGHT_MAP[f], 0.0)) for f in cols])
+    known = np.isfinite(Z)
+    score, used = np.where(known, Z, 0.0) @ w, known.sum(axis=1)
+    first = int(np.argmax(used > 0)) if used.any() else len(used)
+    return index[first:], score[first:], used[first:]
+
+
+def _redo_start(dates: list) -> str:
+    """First session the next extension of a timeline ending at dates[-1] recomputes."""
+    import bisect
+    import pandas as pd
+    since = pd.Timestamp(dates[-1]) - pd.Timedelta(days=REDO_DAYS)
+    return dates[bisect.bisect_left(dates, since.strftime("%Y-%m-%d"))]
+
+
+def _inputs(factors: dict, before: str) -> dict:
+    """{fid: [rows, sha1]} over every factor row dated before `before`. Those rows are all
+    the sessions before `before` were scored from: a row neither moves an earlier z nor is
+    published before its own date, so anything later is redone, never kept."""
+    import hashlib
+    out = {}
+    for fid in WEIGHT_MAP:
+        series = (factors.get(fid) or {}).get("series")
+        if not series:
+            continue
+        h, n = hashlib.sha1(), 0
+        for d, v in SeriesRows(series)[:]:
+            if str(d) < before:
+                h.update(f"{d}={v!r};".encode())
+                n += 1
+        out[fid] = [n, h.hexdigest()]
+    return out
+
+
+def history(factors: dict, weights: dict, prev: dict = None, end=None) -> dict:
+    """The score / stance timeline payload. When `prev` was built with the same parameters
+    and every factor row its kept sessions depend on is unchanged (no revision or back-fill
+    dated before the redo window), its sessions from REDO_DAYS before its last date onward
+    are recomputed (a lagged source may have published rows for them since) and the
+    sessions after it appended; otherwise the timeline is rebuilt."""
+    import pandas as pd
+    params = {"window": WINDOW, "min_periods": MIN_PERIODS, "redo_days": REDO_DAYS,
+              "on": regime.ON_AT, "off": regime.OFF_AT,
+              "weights": {k: float(weights.get(k, 0.0)) for k in WEIGHT_MAP.values()}}
+    prev = prev if isinstance(prev, dict) else {}
+    dates, scores = list(prev.get("dates") or []), list(prev.get("score") or [])
+    stances, used = list(prev.get("stance") or []), list(prev.get("factors_used") or [])
+    inputs = prev.get("inputs") or {}
+    if (dates and prev.get("params") == params and inputs.get("before") == _redo_start(dates)
+            and inputs.get("rows") == _inputs(factors, inputs["before"])):
+        since = pd.Timestamp(dates[-1])
+        redo = dates.index(inputs["before"])
+        start = pd.Timestamp(dates[redo])
+        # z rows from REDO_DAYS before the first redone session cover every publication lag
+        cutoff = (start - pd.Timedelta(days=REDO_DAYS)).strftime("%Y-%m-%d")
+        idx, sc, n = score_history(factors, weights, start, end, cutoff)
+        dates, scores, stances, used = dates[:redo], scores[:redo], stances[:redo], used[:redo]
+        mode, added = "incremental", int((idx > since).sum())
+    else:
+        dates, scores, stances, used = [], [], [], []
+        idx, sc, n = score_history(factors, weights, end=end)
+        mode, added = "full", len(idx)
+    dates += [d.strftime("%Y-%m-%d") for d in idx]
+    scores += [round(float(x), 6) for x in sc]
+    stances += regime.labels(regime.classify(sc)).tolist()
+    used += [int(x) for x in n]
+    before = _redo_start(dates) if dates else None
+    inputs = {"before": before, "rows": _inputs(factors, before)} if before else {}
+    return {"as_of": ts_now_iso(), "model": "NAMM-50", "params": params, "inputs": inputs,
+            "dates": dates, "score": scores, "stance": stances, "factors_used": used,
+            "update": {"mode": mode, "added": added, "redone": len(idx) - added}}
+
+
+def _write_history_csv(path: str, payload: dict) -> None:
+    import pandas as pd
+    from tools.utils import safe_write_csv
+    safe_write_csv(pd.DataFrame({"date": payload["dates"], "score": payload["score"],
+                                 "stance": payload["stance"], "factors_used": payload["factors_used"]}), path)
+
+
 def main():
     try:
-        weights = json.load(open(MODEL, "r", encoding="utf-8")).get("weights", {})
+        weights = handoff.read_json(MODEL, {}).get("weights", {})
     except Exception:
         weights = {}
     try:
-        factors = json.load(open(FACT, "r", encoding="utf-8")).get("factors", {})
+        factors = handoff.read_json(FACT, {}).get("factors", {})
     except Exception:
         factors = {}
     factors_used, placeholders = [], []
     score = 0.0
+    state = RollingStore(STATE)
     for fid, wkey in WEIGHT_MAP.items():
         w = weights.get(wkey, 0.0)
         series = factors.get(fid, {}).get("series")
         if not series:
             placeholders.append(wkey)
             continue
-        vals = extract_values(series)
-        z = compute_z(vals)
-        if z is None or np.isnan(z):
+        z = incremental_z(state, fid, series)
+        if z is None or math.isnan(z):
             placeholders.append(wkey)
             continue
         score += w * float(z)
         factors_used.append(wkey)
-    stance = "Risk-On" if score >= 0.5 else ("Risk-Off" if score <= -0.5 else "Neutral")
+    stance = stance_for(score)
     payload = {
         "as_of": ts_now_iso(),
         "model": "NAMM-50",
@@ -88,9 +292,19 @@ def main():
             "window": WINDOW,
         },
     }
-    write_json(OUT, payload)
-    print(f"wrote {OUT}: score={score:.3f}, stance={stance}")
+    handoff.write_artifact(OUT, payload)
+    state.save()
+    print(f"{OUT}: score={score:.3f}, stance={stance}")
+    try:
+        hist = history(factors, weights, handoff.read_json(HISTORY_JSON, None))
+        handoff.write_artifact(HISTORY_JSON, hist, indent=None)
+        handoff.put(HISTORY_CSV, hist, _write_history_csv)
+        print(f"{HISTORY_JSON}: {len(hist['dates'])} sessions, {hist['update']['added']} added, "
+              f"{hist['update']['redone']} redone ({hist['update']['mode']})")
+    except Exception as e:
+        print(f"[warn] signal history not updated: {e}")
+    print(report())
 
 
 if __name__ == "__main__":
-    main()
+    perf.run("signal", main)
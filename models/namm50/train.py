@@ -1,13 +1,24 @@
 
 import os
-import time
-import requests
 import pandas as pd
-import yfinance as yf
 
-from core.utils import ts_now_iso, write_json
+from core.utils import ts_now_iso
+from core.artifacts import report
+from core.price_store import get_store, av_outputsize
+from core.alphavantage import AV_URL, AVThrottled, av_get
+from core.backtest import search, weight_grid, random_weights
+from core import costs, perf, handoff, calendar
+from models.namm50 import signal
 
-AV_URL = "https://www.alphavantage.co/query"
+MODEL_JSON = "docs/models/namm50.json"
+DEFAULT_WEIGHTS = {"NAAM": 1.0, "FRED": 0.0, "NDX50": 0.0, "CHINA": 0.0}
+# weight keys searched over (signal.WEIGHT_MAP values); see load_z_frame
+SEARCH_KEYS = ["NAAM", "FRED", "NDX50", "CHINA", "VIXCLS"]
+SEARCH = os.getenv("NAMM_SEARCH", "grid")            # grid | random | off
+GRID_LEVELS = int(os.getenv("NAMM_GRID_LEVELS", "5"))
+SAMPLES = int(os.getenv("NAMM_SAMPLES", "20000"))
+WORKERS = int(os.getenv("NAMM_WORKERS", "1"))
+TOP = int(os.getenv("NAMM_TOP", "0"))                # 0 = keep the full leaderboard
 
 def _from_av_json(data: dict) -> pd.Series:
     # Accept both adjusted and non-adjusted
@@ -36,9 +47,16 @@ def _from_av_json(data: dict) -> pd.Series:
     s = s.sort_index().rename("close").dropna()
     return s
 
-def fetch_yf_daily(symbol: str) -> pd.Series:
+def fetch_yf_daily(symbol: str, start=None, use_store: bool = True) -> pd.Series:
+    """Daily adjusted closes from yfinance; served from the local price store by default."""
+    if use_store:
+        return get_store().sync(symbol, lambda since: fetch_yf_daily(symbol, start=since, use_store=False))
+    import yfinance as yf  # lazy: only the fallback path needs it
     t = yf.Ticker(symbol)
-    df = t.history(period="max", auto_adjust=True)
+    if start is not None:
+        df = t.history(start=pd.Timestamp(start).strftime("%Y-%m-%d"), auto_adjust=True)
+    else:
+        df = t.history(period="max", auto_adjust=True)
     if df is None or df.empty or "Close" not in df.columns:
         raise RuntimeError("yfinance daily fetch failed.")
     s = df["Close"].rename("close").dropna()
@@ -47,35 +65,42 @@ def fetch_yf_daily(symbol: str) -> pd.Series:
     return s
 
 def fetch_alpha_daily(symbol: str, api_key: str, outputsize: str = "full",
-                      max_retries: int = 8, cooldown_sec: int = 15) -> pd.Series:
-    """Try AlphaVantage first; on rate-limit/Note/Information fall back to yfinance."""
+                      max_retries: int = 8, cooldown_sec: int = None, use_store: bool = True) -> pd.Series:
+    """Try AlphaVantage first; on rate-limit/Note/Information fall back to yfinance.
+
+    With `use_store` the local price store is consulted first and only the missing
+    tail is requested (`compact` when it fits, `full` otherwise). Throttling is paced
+    by the shared Alpha Vantage token bucket instead of fixed cooldown sleeps;
+    `cooldown_sec` is deprecated and ignored.
+    """
     if not api_key:
-        return fetch_yf_daily(symbol)
+        return fetch_yf_daily(symbol, use_store=use_store)
+    if use_store:
+        return get_store().sync(symbol, lambda since: fetch_alpha_daily(
+            symbol, api_key, outputsize=av_outputsize(since, default=outputsize),
+            max_retries=max_retries, use_store=False), full=outputsize == "full")
 
     params = {
         "function": "TIME_SERIES_DAILY_ADJUSTED",
         "symbol": symbol,
         "outputsize": outputsize,
-        "apikey": api_key,
     }
     last_err = None
-    for i in range(max_retries):
+    for i in range(3):  # transport errors only; throttle notes are retried inside av_get
         try:
-            r = requests.get(AV_URL, params=params, timeout=30)
-            data = r.json()
+            data = av_get(params, api_key, url=AV_URL, max_retries=max_retries)
             if any("Time Series (Daily)" in k for k in data.keys()):
                 return _from_av_json(data)
-            if "Note" in data or "Information" in data:
-                msg = data.get("Note") or data.get("Information")
-                print(f"[namm50] AV backoff ({i+1}/{max_retries}): {msg}")
-                time.sleep(cooldown_sec)
-                continue
             last_err = RuntimeError(f"Unexpected keys: {list(data.keys())[:5]}")
+        except AVThrottled as e:
+            last_err = e
+            break
         except Exception as e:
             last_err = e
-        time.sleep(1)
+        perf.count("retries")
+        perf.sleep(1)
     print(f"[namm50] AlphaVantage failed after retries: {last_err}. Falling back to yfinance.")
-    return fetch_yf_daily(symbol)
+    return fetch_yf_daily(symbol, use_store=False)
 
 def prep_features_prices(symbol: str) -> pd.DataFrame:
     api_key = os.getenv("ALPHAVANTAGE_API_KEY", "")
@@ -89,21 +114,76 @@ def prep_features_prices(symbol: str) -> pd.DataFrame:
     df = df.dropna()
     return df
 
+def load_z_frame(path: str = signal.FACT) -> pd.DataFrame:
+    """Rolling factor z-scores keyed by SEARCH_KEYS on the trading calendar. Each factor is
+    z-scored over its own rows (signal.z_columns, 180 weeks for NAAIM) and every z is placed
+    on the first close after its publication, so the search sees the live signal's inputs."""
+    try:
+        factors = handoff.read_json(path, {}).get("factors", {})
+    except Exception:
+        factors = {}
+    fids = {v: k for k, v in signal.WEIGHT_MAP.items()}
+    z = signal.z_columns({fids[key]: factors.get(fids[key]) for key in SEARCH_KEYS})
+    cols = {key: z[fids[key]] for key in SEARCH_KEYS if fids[key] in z and z[fids[key]].notna().any()}
+    if not cols:
+        return pd.DataFrame()
+    return calendar.asof_join(cols, lags={key: calendar.lag_for(fids[key]) for key in cols})
+
+@perf.step("search")
+def train_weights(factors: pd.DataFrame, close: pd.Series, mode: str = SEARCH, symbol: str = None):
+    """Search weight vectors over the factor z columns of load_z_frame; returns (best
+    weights, leaderboard, info). Candidates are ranked by Sharpe net of `symbol`'s trading costs (core/costs.py)."""
+    k = factors.shape[1]
+    W = weight_grid(k, GRID_LEVELS) if mode == "grid" else random_weights(SAMPLES, k)
+    close = close[close.index >= factors.index.min()]
+    bps = costs.trade_bps(symbol)
+    res = search(factors, close, W, workers=WORKERS, mode="none", cost_bps=bps, band=costs.BAND,
+                 min_trade=costs.MIN_TRADE)
+    board = res["leaderboard"]
+    if TOP:
+        board = board.head(TOP)
+    cols = list(factors.columns)
+    best = {key: 0.0 for key in SEARCH_KEYS}
+    if board["sharpe"].notna().any():
+        best.update({c: round(float(board.iloc[0][c]), 4) for c in cols})
+    else:
+        # no candidate has a Sharpe (flat prices or no warm z); do not publish the first row
+        print("[warn] namm50: no candidate has a finite Sharpe; keeping default weights")
+        best.update(DEFAULT_WEIGHTS)
+    leaderboard = {
+        "columns": list(board.columns),
+        "rows": [[None if pd.isna(v) else round(float(v), 4) for v in row] for row in board.itertuples(index=False)],
+    }
+    info = {"search": mode, "candidates": int(len(W)), "factors": cols, "days": int(len(close)),
+            "ranked_by": "sharpe", "cost_bps": round(bps, 3), "band": costs.BAND, "min_trade": costs.MIN_TRADE,
+            "seconds": round(res["seconds"], 3),
+            "configs_per_sec": round(res["throughput"], 1)}
+    print(f"[namm50] searched {len(W)} weight sets over {cols} in {res['seconds']:.2f}s "
+          f"({res['throughput']:.0f}/s); best sharpe={board.iloc[0]['sharpe']:.3f} net of {bps:.1f} bps "
+          f"(gross {board.iloc[0]['gross_sharpe']:.3f}, turnover {board.iloc[0]['turnover']:.1f}x/yr)")
+    return best, leaderboard, info
+
 def main(symbol: str = None):
     symbol = symbol or os.getenv("SYMBOL", "SPY")
     print(f"[namm50] Training NAMM-50 on {symbol}")
     df = prep_features_prices(symbol)
-    weights = {"NAAM": 1.0, "FRED": 0.0, "NDX50": 0.0, "CHINA": 0.0}
+    print(get_store().report())
+    weights = dict(DEFAULT_WEIGHTS)
     out = {
         "as_of": ts_now_iso(),
         "model": "NAMM-50",
-        "version": "v0.1-hotfix-av-fallback",
+        "version": "v0.2-weight-search",
         "weights": weights,
         "latest": {"rows": int(len(df))}
     }
-    os.makedirs("docs/models", exist_ok=True)
-    write_json("docs/models/namm50.json", out, indent=2)
-    print("wrote docs/models/namm50.json")
+    factors = load_z_frame() if SEARCH != "off" else pd.DataFrame()
+    if not factors.empty and len(df[df.index >= factors.index.min()]) > signal.MIN_PERIODS:
+        out["weights"], out["leaderboard"], out["training"] = train_weights(factors, df["close"], symbol=symbol)
+    elif SEARCH != "off":
+        print("[namm50] No factor history overlapping prices; keeping default weights.")
+    # the leaderboard can hold thousands of rows; keep that file compact
+    handoff.write_artifact(MODEL_JSON, out, indent=None if "leaderboard" in out else 2)
+    print(report())
 
 if __name__ == "__main__":
-    main()
+    perf.run("train", main)
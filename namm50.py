@@ -1,5 +1,6 @@
 
 import pandas as pd, numpy as np
+from core.regime import classify, labels, ON_AT, OFF_AT
 
 def zscore(s: pd.Series):
     s = pd.Series(s).astype(float)
@@ -19,10 +20,11 @@ def combine(naaim: pd.Series=None, breadth: pd.Series=None, china: pd.Series=Non
     score = X.mean(axis=1)
     return score
 
-def regime_from(score: pd.Series, on=0.5, off=-0.5):
+def regime_from(score: pd.Series, on=ON_AT, off=OFF_AT, band=0.0, hold=1):
+    """Risk-On / Neutral / Risk-Off labels (NaN where the score is); see core.regime for
+    the hysteresis `band` and minimum `hold`."""
     if score.empty: return pd.Series(dtype=object)
-    r = pd.Series(index=score.index, dtype=object)
-    r[score >= on] = "Risk-On"
-    r[score <= off] = "Risk-Off"
-    r[(score < on) & (score > off)] = "Neutral"
-    return r
+    x = score.to_numpy(dtype=float)
+    r = labels(classify(x, on, off, band, hold))
+    r[np.isnan(x)] = np.nan
+    return pd.Series(r, index=score.index, dtype=object)
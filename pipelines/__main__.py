@@ -0,0 +1,138 @@
+"""Run pipeline stages in one process, handing data between them in memory.
+
+    python -m pipelines                          # every stage in pipelines/dag.py
+    python -m pipelines --only compose,train,signal,playbook
+    python -m pipelines --startup                # also time a cold interpreter per stage
+
+Stages are the ones in pipelines/dag.py, in the same order, but each is imported and its
+main() called here instead of in a fresh `python -m` per stage. pandas and numpy are
+imported once, and a stage module only when it is about to run, so the heavy fetch
+libraries (yfinance, bs4, lxml) stay unloaded unless a selected stage needs them.
+Outputs are held in memory (core/handoff.py): compose reads the fetchers' frames, train
+and signal read compose's payload, and so on; the files are written after the last
+stage. A stage that fails has its outputs dropped and blocks the stages that read them,
+as in the DAG runner. There is no content-hash caching here: selected stages always run.
+
+The summary compares with the one-script-per-stage workflow: each stage's import time
+here against a cold `python -c "import <module>"` (with --startup), and the total
+against the per-stage run times the DAG runner last recorded in data/state/pipeline.json.
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import perf, handoff
+from core.artifacts import report
+from pipelines import dag
+
+
+def run_stage(stage) -> dict:
+    """Import the stage module and call its main(); {"status", "import", "run"}."""
+    rec = {"status": "failed", "import": 0.0, "run": 0.0}
+    before = set(handoff.paths())
+    with perf.step(stage["name"]):
+        try:
+            t0 = time.perf_counter()
+            mod = importlib.import_module(stage["module"])
+            rec["import"] = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            try:
+                code = mod.main()
+            except SystemExit as e:
+                code = e.code
+            rec["run"] = time.perf_counter() - t0
+            if code in (None, 0):
+                rec["status"] = "ran"
+            else:
+                rec["error"] = f"exit {code}"
+        except Exception as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+    if rec["status"] != "ran":
+        handoff.discard(set(handoff.paths()) - before)
+    return rec
+
+
+def run(stages=None, log=print) -> dict:
+    """Run `stages` in order in this process; {stage name: record}, status "ran" | "failed" | "blocked"."""
+    stages = stages or dag.STAGES
+    ups = dag.upstream(stages)
+    result = {}
+    handoff.hold()
+    try:
+        for s in stages:
+            name = s["name"]
+            if any(result[u]["status"] != "ran" for u in ups[name]):
+                result[name] = {"status": "blocked", "import": 0.0, "run": 0.0}
+                log(f"[pipeline] {name}: blocked by failed upstream")
+                continue
+            log(f"[pipeline] {name}: run")
+            rec = result[name] = run_stage(s)
+            if rec["status"] == "ran":
+                log(f"[pipeline] {name}: done in {rec['run']:.2f}s (import {rec['import']:.2f}s)")
+            else:
+                log(f"[pipeline] {name}: failed: {rec.get('error')}")
+    finally:
+        written = handoff.flush()
+        log(f"[pipeline] wrote {len(written)} outputs: {', '.join(written)}")
+    return result
+
+
+def cold_start(module: str) -> float:
+    """Seconds for a fresh interpreter to start and import `module`."""
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"],
+                   capture_output=True, cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    return time.perf_counter() - t0
+
+
+def summary(stages, result: dict, total: float, cold: dict = None, state: dict = None) -> list:
+    """Report lines: per stage import / run here, cold start and last run per script."""
+    cold, state = cold or {}, state or {}
+    lines = [f"  {'stage':<18} {'status':<8} {'import':>8} {'run':>8} {'cold start':>11} {'per-script':>11}"]
+    fmt = lambda v: f"{v:10.2f}s" if v is not None else f"{'-':>11}"
+    for s in stages:
+        r = result.get(s["name"], {})
+        prev = (state.get(s["name"]) or {}).get("seconds")
+        lines.append(f"  {s['name']:<18} {r.get('status', '-'):<8} {r.get('import', 0.0):7.2f}s "
+                     f"{r.get('run', 0.0):7.2f}s {fmt(cold.get(s['name']))} {fmt(prev)}")
+    imports = sum(r.get("import", 0.0) for r in result.values())
+    lines.append(f"[pipeline] one process: {total:.2f}s total, {imports:.2f}s importing stages")
+    if cold:
+        lines.append(f"[pipeline] one script per stage: {sum(cold.values()):.2f}s spent starting "
+                     f"{len(cold)} interpreters and importing before any work")
+    prev = [(state.get(s["name"]) or {}).get("seconds") for s in stages]
+    if prev and all(p is not None for p in prev):
+        lines.append(f"[pipeline] one script per stage: {sum(prev):.2f}s total on the last DAG run")
+    return lines
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run pipeline stages in one process, data handed over in memory.")
+    ap.add_argument("--only", default="", help="comma-separated stage names")
+    ap.add_argument("--startup", action="store_true",
+                    help="time a cold interpreter + import per stage for comparison")
+    a = ap.parse_args(argv)
+    stages = dag.STAGES
+    if a.only:
+        keep = {n.strip() for n in a.only.split(",") if n.strip()}
+        unknown = keep - {s["name"] for s in dag.STAGES}
+        if unknown:
+            ap.error(f"unknown stages: {sorted(unknown)}")
+        stages = [s for s in dag.STAGES if s["name"] in keep]
+    # timed before the run so the cold starts do not compete with it for the CPU
+    cold = {s["name"]: cold_start(s["module"]) for s in stages} if a.startup else {}
+    t0 = time.perf_counter()
+    result = run(stages)
+    total = time.perf_counter() - t0
+    for line in summary(stages, result, total, cold, dag.load_state()):
+        print(line)
+    print(report())
+    return 1 if any(r["status"] != "ran" for r in result.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(perf.run("pipeline", main))
@@ -1,27 +1,75 @@
 
 import os, json, csv, datetime
-from core.utils import ensure_dir, ts_now_iso, write_json
+from core.utils import ensure_dir, ts_now_iso
+from core import artifacts, perf, handoff
+from core.artifacts import report
 
 RAW_NAAIM = 'data/raw/naaim_exposure.csv'
 RAW_FRED  = 'data/raw/fred_namm50.csv'   # optional
+RAW_BREADTH = 'data/raw/ndx_breadth.csv'  # optional; value + extra breadth columns
+BREADTH_EXTRA = ['pct_above_20dma', 'pct_above_200dma', 'pct_new_high', 'pct_new_low', 'ad_line']
+RAW_TECH = 'data/raw/technicals.csv'     # optional; one column per prices-sourced registry factor
+OUT_JSON = 'docs/factors_namm50.json'
+OUT_NPZ = 'docs/factors_namm50.npz'
 
-def read_csv_series(path):
+def _records(held):
+    """Row dicts from a stage output held in memory (list of dicts or a DataFrame),
+    shaped like csv.DictReader would read the file it stands for."""
+    if isinstance(held, list):
+        return held
+    df = held if 'date' in held.columns else held.reset_index()
+    return df.to_dict('records')
+
+def _date(d):
+    if hasattr(d, 'strftime'):
+        return d.strftime('%Y-%m-%d') if (d.hour, d.minute, d.second) == (0, 0, 0) else str(d)
+    return d
+
+def records_series(records, col=None):
     out = []
+    for r in records:
+        # expect columns date,value (or an explicit `col`)
+        d = r.get('date') or r.get('Date') or r.get('DATE')
+        if col:
+            v = r.get(col)
+        else:
+            # first header present, so a held 0.0 is not skipped like an empty CSV cell
+            v = next((r[k] for k in ('value', 'Value', 'VALUE') if k in r), None)
+        try:
+            v = float(v) if v not in (None, '') else None
+        except Exception:
+            v = None
+        if v is not None and v != v:
+            v = None
+        if d:
+            out.append([_date(d), v])
+    return out
+
+def read_csv_series(path, col=None):
+    held = handoff.get(path)
+    if held is not None:
+        return records_series(_records(held), col)
     if not os.path.exists(path):
-        return out
+        return []
     with open(path, 'r', encoding='utf-8') as f:
-        rd = csv.DictReader(f)
-        for r in rd:
-            # expect columns date,value
-            d = r.get('date') or r.get('Date') or r.get('DATE')
-            v = r.get('value') or r.get('Value') or r.get('VALUE')
-            try:
-                v = float(v) if v not in (None, '') else None
-            except Exception:
-                v = None
-            if d:
-                out.append([d, v])
-    return out
+        return records_series(csv.DictReader(f), col)
+
+def csv_columns(path):
+    """Header of a CSV (or of the DataFrame held for it), without the date column."""
+    held = handoff.get(path)
+    if held is not None:
+        return [c for c in held.columns if c != 'date']
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return next(csv.reader(f), [])[1:]
+
+def save_npz(path, data):
+    # columnar copy for loaders that want arrays (see core/factor_io.py); only when the JSON moved
+    if OUT_JSON in artifacts.CHANGED or not os.path.exists(path):
+        from core.factor_io import write_npz
+        write_npz(path, data["factors"], as_of=data["as_of"])
+        print(f'wrote {path}')
 
 def main():
     ensure_dir('docs')
@@ -30,12 +78,22 @@ def main():
         "factors": {
             "naaim_exposure": {"series": read_csv_series(RAW_NAAIM)},
             "fred_macro": {"series": read_csv_series(RAW_FRED)},
-            "ndx_breadth": {"series": None},
+            "ndx_breadth": {"series": read_csv_series(RAW_BREADTH) or None},
             "china_proxy": {"series": None}
         }
     }
-    write_json('docs/factors_namm50.json', data, indent=2)
-    print('wrote docs/factors_namm50.json with keys:', list(data["factors"].keys()))
+    for col in BREADTH_EXTRA:
+        series = read_csv_series(RAW_BREADTH, col)
+        if any(v is not None for _, v in series):
+            data["factors"][f"ndx_{col}"] = {"series": series}
+    for col in csv_columns(RAW_TECH):
+        series = read_csv_series(RAW_TECH, col)
+        if any(v is not None for _, v in series):
+            data["factors"][col] = {"series": series}
+    handoff.write_artifact(OUT_JSON, data, indent=None)
+    print(f'{OUT_JSON} keys:', list(data["factors"].keys()))
+    handoff.put(OUT_NPZ, data, save_npz)
+    print(report())
 
 if __name__ == '__main__':
-    main()
+    perf.run("compose", main)
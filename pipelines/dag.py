@@ -0,0 +1,289 @@
+"""Content-hash pipeline runner: fetch -> compose -> train -> signal -> playbook.
+
+Each stage declares the files it reads and writes. A stage is skipped when the hash of
+its inputs (plus its own source file and every repo module it imports) matches the last
+successful run and its outputs are still what that run produced. Source stages (fetchers)
+have no file inputs and run every time; their dependents are re-checked once they
+finish. The scheduler blocks on the running stages instead of polling. Stages whose upstream
+stages are done run in parallel as subprocesses.
+
+    python -m pipelines.dag               # run what is stale
+    python -m pipelines.dag --dry-run     # print the plan and the time cached stages save
+    python -m pipelines.dag --only compose,train --force
+"""
+import os
+import sys
+import ast
+import glob
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.utils import ts_now_iso, write_json
+
+STATE = "data/state/pipeline.json"
+MAX_WORKERS = int(os.environ.get("PIPELINE_WORKERS", "4"))
+# inputs no stage writes: fred_bundle.py produces compose's FRED file outside the pipeline
+EXTERNAL_INPUTS = ["data/raw/fred_namm50.csv"]
+
+STAGES = [
+    {"name": "fetch_naaim", "module": "fetchers.naaim", "always": True,
+     "inputs": [], "outputs": ["data/raw/naaim_exposure.csv"]},
+    {"name": "fetch_ndx_breadth", "module": "fetchers.ndx_breadth", "always": True,
+     "inputs": [], "outputs": ["data/raw/ndx_breadth.csv"]},
+    {"name": "fetch_fred", "module": "pipelines.fetch_fred_namm50", "always": True,
+     "inputs": [], "outputs": ["data/raw/fred_macro.csv", "data/raw/vix_fred.csv"]},
+    {"name": "fetch_technicals", "module": "fetchers.technicals", "always": True,
+     "inputs": [], "outputs": ["data/raw/technicals.csv"]},
+    {"name": "compose", "module": "pipelines.compose_outputs",
+     "inputs": ["data/raw/naaim_exposure.csv", "data/raw/fred_namm50.csv", "data/raw/ndx_breadth.csv",
+                "data/raw/technicals.csv"],
+     "outputs": ["docs/factors_namm50.json", "docs/factors_namm50.npz"]},
+    # train also reads daily closes through the price store: "session" adds the latest
+    # published session to its input hash, so a new close reruns it
+    {"name": "train", "module": "models.namm50.train", "session": True,
+     "inputs": ["docs/factors_namm50.json"], "outputs": ["docs/models/namm50.json"]},
+    {"name": "signal", "module": "models.namm50.signal",
+     "inputs": ["docs/models/namm50.json", "docs/factors_namm50.json"],
+     "outputs": ["docs/signals_namm50.json", "docs/signals_namm50_history.json", "docs/signals_namm50_history.csv"]},
+    {"name": "playbook", "module": "models.namm50.playbook",
+     "inputs": ["docs/signals_namm50.json"], "outputs": ["docs/playbook_namm50.json"]},
+]
+
+
+def file_hash(path: str) -> str:
+    """sha1 of a file; JSON is hashed without its top-level `as_of` so reruns that only
+    restamp the time do not invalidate dependents."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".json"):
+        try:
+            js = json.loads(raw)
+            if isinstance(js, dict):
+                js.pop("as_of", None)
+            raw = json.dumps(js, sort_keys=True, separators=(",", ":")).encode()
+        except ValueError:
+            pass
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _expand(patterns):
+    out = []
+    for p in patterns:
+        hits = sorted(glob.glob(p))
+        out.extend(hits if hits else [p])
+    return out
+
+
+def files_hash(patterns, extra=()) -> str:
+    """Combined hash of the given files (missing files hash as absent)."""
+    h = hashlib.sha1()
+    for p in list(extra) + _expand(patterns):
+        h.update(p.encode())
+        h.update(file_hash(p).encode() if os.path.exists(p) else b"-")
+    return h.hexdigest()
+
+
+def _module_file(name: str):
+    base = name.replace(".", os.sep)
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _local_imports(path: str) -> list:
+    """Repo-local module files `path` imports anywhere (function-level imports included)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # `from pkg import mod` may name a submodule
+            names += [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+    return [p for p in map(_module_file, names) if p]
+
+
+def stage_source(stage) -> list:
+    """The stage's module file and every repo-local module it imports, transitively."""
+    mod = stage.get("module")
+    first = _module_file(mod) if mod else None
+    if not first:
+        return []
+    seen, todo = set(), [first]
+    while todo:
+        path = todo.pop()
+        if path not in seen:
+            seen.add(path)
+            todo += _local_imports(path)
+    return sorted(seen)
+
+
+def upstream(stages) -> dict:
+    """{stage name: set of stage names whose outputs it reads}."""
+    producers = {}
+    for s in stages:
+        for p in _expand(s["outputs"]):
+            producers[p] = s["name"]
+    return {s["name"]: {producers[p] for p in _expand(s["inputs"]) if p in producers and producers[p] != s["name"]}
+            for s in stages}
+
+
+def load_state(path=STATE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _session(stage) -> list:
+    if not stage.get("session"):
+        return []
+    from core.price_store import last_session
+    return ["session:" + last_session().strftime("%Y-%m-%d")]
+
+
+def check(stage, state) -> tuple:
+    """(status, reason, input hash): status is "run" or "cached"."""
+    in_hash = files_hash(stage["inputs"], extra=stage_source(stage) + _session(stage))
+    prev = state.get(stage["name"])
+    if stage.get("always"):
+        return "run", "source", in_hash
+    if not prev:
+        return "run", "never ran", in_hash
+    if prev.get("inputs") != in_hash:
+        return "run", "inputs changed", in_hash
+    if not all(os.path.exists(p) for p in _expand(stage["outputs"])):
+        return "run", "outputs missing", in_hash
+    if prev.get("outputs") != files_hash(stage["outputs"]):
+        return "run", "outputs modified", in_hash
+    return "cached", "unchanged", in_hash
+
+
+def command(stage) -> list:
+    return stage.get("cmd") or [sys.executable, "-m", stage["module"]]
+
+
+def run_stage(stage) -> tuple:
+    t0 = time.perf_counter()
+    proc = subprocess.run(command(stage), capture_output=True, text=True)
+    return proc.returncode, time.perf_counter() - t0, (proc.stdout or "") + (proc.stderr or "")
+
+
+def _by_name(stages, name):
+    return next(s for s in stages if s["name"] == name)
+
+
+def plan(stages, state, force=False) -> list:
+    """Dry-run view using the files as they are now: [(name, status, reason, est seconds)]."""
+    ups = upstream(stages)
+    status = {}
+    rows = []
+    for s in stages:
+        st, why, _ = check(s, state)
+        if force:
+            st, why = "run", "forced"
+        elif st == "cached" and any(status.get(u) == "run" and not _by_name(stages, u).get("always")
+                                    for u in ups[s["name"]]):
+            st, why = "run", "upstream reruns"
+        status[s["name"]] = st
+        rows.append((s["name"], st, why, float((state.get(s["name"]) or {}).get("seconds", 0.0))))
+    return rows
+
+
+def run(stages=None, state_path=STATE, force=False, workers=MAX_WORKERS, log=print) -> dict:
+    """Run stale stages in dependency order, in parallel where possible.
+
+    Returns {stage name: "ran" | "cached" | "failed" | "blocked"}.
+    """
+    stages = stages or STAGES
+    state = load_state(state_path)
+    ups = upstream(stages)
+    result = {}
+    pending = {s["name"]: s for s in stages}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        while pending or running:
+            before = len(pending)
+            for name in list(pending):
+                deps = ups[name]
+                if any(result.get(u) in ("failed", "blocked") for u in deps):
+                    result[name] = "blocked"
+                    log(f"[pipeline] {name}: blocked by failed upstream")
+                    del pending[name]
+                elif all(u in result for u in deps):
+                    stage = pending.pop(name)
+                    st, why, in_hash = check(stage, state)
+                    if st == "cached" and not force:
+                        result[name] = "cached"
+                        log(f"[pipeline] {name}: cached ({why})")
+                        continue
+                    log(f"[pipeline] {name}: run ({'forced' if force else why})")
+                    running[ex.submit(run_stage, stage)] = (stage, in_hash)
+            if not running:
+                if len(pending) < before:
+                    continue  # cached stages may have released others; scan again
+                # nothing in flight and nothing could start: the rest wait on each other
+                for name in pending:
+                    result[name] = "blocked"
+                    log(f"[pipeline] {name}: blocked by a dependency cycle")
+                pending.clear()
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, in_hash = running.pop(fut)
+                code, secs, out = fut.result()
+                name = stage["name"]
+                if code == 0:
+                    result[name] = "ran"
+                    state[name] = {"inputs": in_hash, "outputs": files_hash(stage["outputs"]),
+                                   "seconds": round(secs, 3), "ran_at": ts_now_iso()}
+                    write_json(state_path, state)
+                    log(f"[pipeline] {name}: done in {secs:.1f}s")
+                else:
+                    result[name] = "failed"
+                    tail = "\n".join(out.strip().splitlines()[-5:])
+                    log(f"[pipeline] {name}: failed (exit {code}) in {secs:.1f}s\n{tail}")
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the NAMM-50 pipeline, skipping unchanged stages.")
+    ap.add_argument("--dry-run", action="store_true", help="print the plan without running anything")
+    ap.add_argument("--force", action="store_true", help="rerun selected stages even if cached")
+    ap.add_argument("--only", default="", help="comma-separated stage names")
+    ap.add_argument("--workers", type=int, default=MAX_WORKERS)
+    a = ap.parse_args(argv)
+    stages = STAGES
+    if a.only:
+        keep = {n.strip() for n in a.only.split(",") if n.strip()}
+        unknown = keep - {s["name"] for s in STAGES}
+        if unknown:
+            ap.error(f"unknown stages: {sorted(unknown)}")
+        stages = [s for s in STAGES if s["name"] in keep]
+    if a.dry_run:
+        rows = plan(stages, load_state(), force=a.force)
+        for name, st, why, secs in rows:
+            print(f"  {name:<18} {st:<7} {why:<16} last {secs:6.1f}s")
+        saved = sum(secs for _, st, _, secs in rows if st == "cached")
+        total = sum(secs for *_, secs in rows)
+        print(f"[pipeline] {sum(st == 'run' for _, st, _, _ in rows)} to run, "
+              f"{sum(st == 'cached' for _, st, _, _ in rows)} cached; expected saving {saved:.1f}s of {total:.1f}s")
+        print("[pipeline] stages after a source are re-checked once it has fetched")
+        return 0
+    res = run(stages, force=a.force, workers=a.workers)
+    return 1 if any(v == "failed" for v in res.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
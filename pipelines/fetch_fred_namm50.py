@@ -1,61 +1,61 @@
 
-import os, sys, json, time, requests
+import os, sys, json, time
 import pandas as pd
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from tools.utils import ensure_dir
+from core.fred import FredClient, build_frame
+from core.http import get_session
+from core import perf, handoff
 
 OUT_MACRO = "data/raw/fred_macro.csv"
 OUT_VIX = "data/raw/vix_fred.csv"
 
 FRED_API_KEY = os.environ.get("FRED_API_KEY", "")
-BASE = "https://api.stlouisfed.org/fred/series/observations"
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = FredClient(FRED_API_KEY)
+    return _client
 
 def fetch_series(series_id, start="2010-01-01"):
-    params = {
-        "series_id": series_id,
-        "api_key": FRED_API_KEY,
-        "file_type": "json",
-        "observation_start": start,
-    }
-    r = requests.get(BASE, params=params, timeout=60)
-    r.raise_for_status()
-    j = r.json()
-    rows = []
-    for ob in j.get("observations", []):
-        d = ob.get("date")
-        v = ob.get("value")
-        try:
-            x = float(v)
-        except Exception:
-            x = None
-        rows.append([d, x])
-    df = pd.DataFrame(rows, columns=["date","value"]).dropna()
-    df["date"] = pd.to_datetime(df["date"])
-    return df.set_index("date").sort_index()
+    s = get_client().fetch(series_id, start=start).dropna()
+    df = s.rename("value").to_frame()
+    df.index.name = "date"
+    return df
+
+def save_csv(path, df):
+    ensure_dir(os.path.dirname(path))
+    df.to_csv(path)
 
 def main():
     if not FRED_API_KEY:
         print("FRED_API_KEY missing; skipping FRED fetch.")
-        ensure_dir(OUT_MACRO); pd.DataFrame(columns=["DGS10","DFF"]).to_csv(OUT_MACRO)
-        ensure_dir(OUT_VIX); pd.DataFrame(columns=["VIX"]).to_csv(OUT_VIX)
+        handoff.put(OUT_MACRO, pd.DataFrame(columns=["DGS10","DFF"]), save_csv)
+        handoff.put(OUT_VIX, pd.DataFrame(columns=["VIX"]), save_csv)
         return
 
-    dgs10 = fetch_series("DGS10")
-    dff = fetch_series("DFF")
-    macro = pd.concat([dgs10.rename(columns={"value":"DGS10"}),
-                       dff.rename(columns={"value":"DFF"})], axis=1).dropna()
-    ensure_dir(OUT_MACRO)
-    macro.to_csv(OUT_MACRO)
+    got = get_client().fetch_many(["DGS10", "DFF", "VIXCLS"], start="2010-01-01")
+    print(get_client().report())
+    print(get_session().report())
+    if "DGS10" not in got or "DFF" not in got:
+        raise RuntimeError("DGS10/DFF fetch failed")
+    macro = build_frame({k: got[k].dropna() for k in ("DGS10", "DFF")}).dropna()
+    handoff.put(OUT_MACRO, macro, save_csv)
     print(f"saved {OUT_MACRO}, rows={len(macro)}")
 
-    try:
-        vix = fetch_series("VIXCLS").rename(columns={"value":"VIX"})
-    except Exception as e:
-        print("VIX fetch failed:", e); vix = pd.DataFrame(columns=["VIX"])
-    ensure_dir(OUT_VIX); vix.to_csv(OUT_VIX)
+    if "VIXCLS" in got:
+        vix = got["VIXCLS"].dropna().rename("VIX").to_frame()
+        vix.index.name = "date"
+    else:
+        vix = pd.DataFrame(columns=["VIX"])
+    handoff.put(OUT_VIX, vix, save_csv)
     print(f"saved {OUT_VIX}, rows={len(vix)}")
 
 if __name__ == "__main__":
     import pandas as pd
-    main()
+    perf.run("fetch_fred", main)
@@ -2,7 +2,8 @@
 import os, io, json
 import pandas as pd
 import numpy as np
-import requests
+from core.http import get_session
+from core import perf
 from bs4 import BeautifulSoup
 
 OUT_CSV = "data/raw/naaim_exposure.csv"
@@ -21,7 +22,7 @@ def try_nasdaq():
         for base in bases:
             url = base.format(code=code, key=API_KEY)
             try:
-                r = requests.get(url, timeout=30)
+                r = get_session().get(url, timeout=30)
                 if r.status_code != 200:
                     continue
                 j = r.json()
@@ -48,7 +49,7 @@ def try_nasdaq():
 def fallback_scrape_excel():
     # Find downloadable excel on NAAIM page
     url = "https://naaim.org/programs/naaim-exposure-index/"
-    r = requests.get(url, timeout=60)
+    r = get_session().get(url, timeout=60)
     r.raise_for_status()
     soup = BeautifulSoup(r.text, "lxml")
     link = None
@@ -59,7 +60,7 @@ def fallback_scrape_excel():
             break
     if not link:
         return None
-    er = requests.get(link, timeout=120)
+    er = get_session().get(link, timeout=120)
     if er.status_code != 200:
         return None
     try:
@@ -96,4 +97,4 @@ def main():
     print(f"saved {OUT_CSV}, rows={len(df)}")
 
 if __name__ == "__main__":
-    main()
+    perf.run("fetch_naaim_html", main)
@@ -1,13 +1,15 @@
-import sys, os, time, re
+import sys, os, re
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import json
 import pandas as pd
 import numpy as np
-import requests
 import yfinance as yf
 from bs4 import BeautifulSoup
 from tools.utils import ensure_dir
+from core.http import get_session
+from core.breadth import compute_breadth as compute_breadth_matrix
+from core import perf
 
 OUT_CSV = "data/raw/ndx_breadth_50dma.csv"
 WIKI_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
@@ -15,9 +17,10 @@ WIKI_URL = "https://en.wikipedia.org/wiki/Nasdaq-100"
 TOP_N = int(os.environ.get("NDX_TOP_N", "10"))
 
 def get_ndx_constituents_topN(n=10):
-    r = requests.get(WIKI_URL, timeout=60)
+    r = get_session().get(WIKI_URL, timeout=60, ttl=24 * 3600)
     r.raise_for_status()
-    tables = pd.read_html(r.text)
+    with perf.step("read_html"):
+        tables = pd.read_html(r.text)
     best = None
     for df in tables:
         cols = [str(c).lower() for c in df.columns]
@@ -69,7 +72,8 @@ def batch_download(tickers, tries=3, sleep_s=8):
                 return df
         except Exception as e:
             last = e
-        time.sleep(sleep_s * (i + 1))
+        perf.count("retries")
+        perf.sleep(sleep_s * (i + 1))
     if last:
         print(f"yfinance batch err: {last}")
     return pd.DataFrame()
@@ -89,9 +93,7 @@ def compute_breadth(df, tickers):
     if not closes:
         return pd.DataFrame()
     prices = pd.DataFrame(closes).sort_index()
-    sma50 = prices.rolling(50).mean()
-    breadth = (prices >= sma50).sum(axis=1) / prices.shape[1] * 100.0
-    return breadth.to_frame("pct_above_50dma")
+    return compute_breadth_matrix(prices)
 
 def main():
     tickers = get_ndx_constituents_topN(TOP_N)
@@ -109,4 +111,4 @@ def main():
             print("Breadth empty; wrote placeholder.")
 
 if __name__ == "__main__":
-    main()
+    perf.run("fetch_ndx_breadth_topn", main)
@@ -1,29 +1,44 @@
 
-import os, sys, json, time, math, requests
+import os, sys, json, time, math
 import pandas as pd
 import numpy as np
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from tools.utils import ensure_dir, zscore, ts_now_iso
+from core.utils import read_json, series_rows
+from core.artifacts import write_artifact, report
+from core.price_store import get_store, av_outputsize
+from core.alphavantage import av_get
+from core.backtest import walk_forward
+from core.metrics import rolling, summary
+from core import costs, perf
+from core.factor_io import load_frame
+from models.namm50 import signal
+from models.namm50.train import load_z_frame
 
 FACTORS_JSON = "docs/factors_namm50.json"
+FACTORS_NPZ = "docs/factors_namm50.npz"
+# load_factors column -> factor_io column
+NPZ_COLUMNS = {"naaim": "naaim_exposure", "ndx": "ndx_breadth", "dgs10": "fred_macro", "dff": "fred_macro:1",
+               "china": "china_proxy", "vix": "vix"}
 MODEL_JSON = "docs/models/namm50.json"
 
 ALPHAVANTAGE_API_KEY = os.environ.get("ALPHAVANTAGE_API_KEY", "")
 
-def fetch_av_daily(symbol, outputsize="compact"):
+def fetch_av_daily(symbol, outputsize="compact", use_store=True):
     if not ALPHAVANTAGE_API_KEY:
         raise RuntimeError("ALPHAVANTAGE_API_KEY missing")
-    url = "https://www.alphavantage.co/query"
+    if use_store:
+        s = get_store().sync(symbol, lambda since: fetch_av_daily(
+            symbol, outputsize=av_outputsize(since, default=outputsize), use_store=False)["close"],
+            full=outputsize == "full")
+        return s.rename_axis("date").to_frame("close")
     params = {
         "function": "TIME_SERIES_DAILY_ADJUSTED",
         "symbol": symbol,
         "outputsize": outputsize,
-        "apikey": ALPHAVANTAGE_API_KEY
     }
-    r = requests.get(url, params=params, timeout=60)
-    r.raise_for_status()
-    j = r.json()
+    j = av_get(params, ALPHAVANTAGE_API_KEY, timeout=60)
     ts = j.get("Time Series (Daily)", {})
     rows = []
     for k, v in ts.items():
@@ -38,9 +53,24 @@ def fetch_av_daily(symbol, outputsize="compact"):
     df = df.sort_values("date").set_index("date")
     return df
 
+def load_factors_npz(path=FACTORS_NPZ):
+    fr = load_frame(path)
+    out = {k: fr[c].astype(float) for k, c in NPZ_COLUMNS.items() if c in fr}
+    if "dgs10" not in out or "dff" not in out:
+        out.pop("dgs10", None); out.pop("dff", None)
+    return pd.DataFrame(out).sort_index()
+
 def load_factors():
-    with open(FACTORS_JSON, "r") as f:
-        j = json.load(f)
+    # the binary copy is written by compose right after the JSON; skip it if it is older
+    if os.path.exists(FACTORS_NPZ) and (not os.path.exists(FACTORS_JSON)
+                                        or os.path.getmtime(FACTORS_NPZ) >= os.path.getmtime(FACTORS_JSON)):
+        try:
+            return load_factors_npz(FACTORS_NPZ)
+        except Exception as e:
+            print(f"[warn] {FACTORS_NPZ}: {e}; reading JSON")
+    j = read_json(FACTORS_JSON)
+    if j is None:
+        raise FileNotFoundError(FACTORS_JSON)
     fac = j.get("factors", {})
     def series_to_df(series, name):
         if not series:
@@ -80,105 +110,122 @@ def load_factors():
     df = pd.DataFrame(out).sort_index()
     return df
 
-def compute_signal(df, weights):
+# model weight key (models/namm50/train.SEARCH_KEYS) -> factor_frame column
+WEIGHT_KEYS = {"NAAM": "naaim", "FRED": "fred", "NDX50": "ndx", "CHINA": "china", "VIXCLS": "vix"}
+DEFAULT_WEIGHTS = {"NAAM":0.4,"FRED":0.3,"NDX50":0.2,"CHINA":0.1,"VIXCLS":0.0}
+
+def factor_frame(df):
+    """Raw, sign-adjusted factor columns (higher = more bullish), not yet normalized."""
     x = pd.DataFrame(index=df.index)
-    if "naaim" in df: x["naaim"] = zscore(df["naaim"].astype(float)/100.0)
-    if "ndx" in df: x["ndx"] = zscore(df["ndx"].astype(float)/100.0)
+    if "naaim" in df: x["naaim"] = df["naaim"].astype(float)/100.0
+    if "ndx" in df: x["ndx"] = df["ndx"].astype(float)/100.0
     if "dgs10" in df and "dff" in df:
-        slope = (df["dgs10"].astype(float) - df["dff"].astype(float))
-        x["fred"] = zscore(-slope)
-    if "china" in df: x["china"] = zscore(pd.Series(df["china"].astype(float)).pct_change().fillna(0.0))
-    if "vix" in df: x["vix"] = zscore(-df["vix"].astype(float))
+        x["fred"] = -(df["dgs10"].astype(float) - df["dff"].astype(float))
+    if "china" in df: x["china"] = pd.Series(df["china"].astype(float)).pct_change().fillna(0.0)
+    if "vix" in df: x["vix"] = -df["vix"].astype(float)
+    return x
+
+def model_weights(weights):
+    ws = pd.Series({k: float(weights.get(k, 0.0)) for k in WEIGHT_KEYS})
+    if ws.sum() == 0:
+        ws = pd.Series(DEFAULT_WEIGHTS)
+    return {WEIGHT_KEYS[k]: float(v) for k, v in ws.items()}
+
+def compute_signal(df, weights):
+    """Full-sample z-score signal (in-sample; the backtest in main uses walk_forward)."""
+    raw = factor_frame(df)
+    x = pd.DataFrame(index=df.index)
+    for col in raw: x[col] = zscore(raw[col])
     for col in ["naaim","ndx","fred","china","vix"]:
         if col not in x: x[col] = 0.0
-    w = {
-        "NAAM": float(weights.get("NAAM", 0.0)),
-        "NDX50": float(weights.get("NDX50", 0.0)),
-        "FRED": float(weights.get("FRED", 0.0)),
-        "CHINA": float(weights.get("CHINA", 0.0)),
-        "VIX": float(weights.get("VIX", 0.0)),
-    }
-    ws = pd.Series(w)
-    if ws.sum() == 0:
-        ws = pd.Series({"NAAM":0.4,"FRED":0.3,"NDX50":0.2,"CHINA":0.1,"VIX":0.0})
-    comp = (ws["NAAM"]*x["naaim"] + ws["FRED"]*x["fred"] + ws["NDX50"]*x["ndx"] + ws["CHINA"]*x["china"] + ws["VIX"]*x["vix"])
+    w = model_weights(weights)
+    comp = sum(w[c]*x[c] for c in ["naaim","fred","ndx","china","vix"])
     sig = np.tanh(comp)
     return sig
 
-def sharpe_annualized(rets):
-    r = pd.Series(rets).dropna()
-    if len(r) < 5: return None
-    mu = r.mean(); sd = r.std(ddof=0)
-    if sd == 0 or pd.isna(sd): return None
-    return float((mu / sd) * (252 ** 0.5))
-
-def max_drawdown(equity):
-    x = pd.Series(equity).dropna()
-    if x.empty: return None
-    roll_max = x.cummax(); dd = x/roll_max - 1.0
-    return float(dd.min())
+def trailing_metrics(rets):
+    """Full-period and trailing 3m / 12m metrics (core.metrics, one pass per window set)."""
+    r = np.nan_to_num(np.asarray(rets, dtype=float))
+    keys = ("sharpe_all", "sharpe_3m", "sharpe_12m", "sortino_12m", "winrate_12m", "max_drawdown", "underwater_days")
+    if len(r) == 0:
+        return dict.fromkeys(keys)
+    full = summary(r)
+    roll = rolling(r, windows=(63, 252), min_periods=5)
+    last = lambda a: None if np.isnan(a[0, -1]) else float(a[0, -1])
+    return {
+        "sharpe_all": None if len(r) < 5 else last(full["sharpe"][None, :]),
+        "sharpe_3m": last(roll["sharpe_63"]),
+        "sharpe_12m": last(roll["sharpe_252"]),
+        "sortino_12m": last(roll["sortino_252"]),
+        "winrate_12m": float((r[-252:] > 0).mean()) if len(r) >= 10 else None,
+        "max_drawdown": float(full["max_dd"][0]),
+        "underwater_days": int(roll["underwater"][0, -1]),
+    }
 
 def main():
     base = {
         "as_of": ts_now_iso(),
         "model": "NAMM-50",
         "version": "v2-metrics",
-        "weights": {"NAAM":0.4,"FRED":0.3,"NDX50":0.2,"CHINA":0.1,"VIX":0.0}
+        "weights": dict(DEFAULT_WEIGHTS)
     }
     if os.path.exists(MODEL_JSON):
         try:
-            with open(MODEL_JSON,"r") as f: cur = json.load(f)
+            cur = read_json(MODEL_JSON, {})
             base.update({k:v for k,v in cur.items() if k != "weights"})
             if "weights" in cur and isinstance(cur["weights"], dict):
                 base["weights"].update(cur["weights"])
         except Exception: pass
+    # models published before the keys were unified carry VIX for VIXCLS
+    if "VIX" in base["weights"]:
+        base["weights"]["VIXCLS"] = base["weights"].pop("VIX")
 
-    df = load_factors()
+    # the same per-factor z-scores the weight search ranks on (models/namm50/train.py)
+    fac = load_z_frame()
 
+    symbol = "QQQ"
     try:
-        px = fetch_av_daily("QQQ", outputsize="compact")
+        px = fetch_av_daily(symbol, outputsize="compact")
     except Exception as e:
         try:
-            time.sleep(12); px = fetch_av_daily("SPY", outputsize="compact")
+            symbol = "SPY"
+            px = fetch_av_daily(symbol, outputsize="compact")
         except Exception as e2:
-            ensure_dir(MODEL_JSON); 
-            with open(MODEL_JSON,"w") as f: json.dump(base, f)
+            write_artifact(MODEL_JSON, base, indent=None)
             print("No price series; wrote base model only."); 
             return
 
-    rets = px["close"].pct_change().rename("ret")
-    df_all = df.join(rets, how="inner")
-    if df_all.empty:
-        ensure_dir(MODEL_JSON); 
-        with open(MODEL_JSON,"w") as f: json.dump(base, f)
+    print(get_store().report())
+    if fac.empty or fac.index.max() < px.index.min() or fac.index.min() > px.index.max():
+        write_artifact(MODEL_JSON, base, indent=None)
         print("No overlap; wrote base model only."); 
         return
 
-    sig = compute_signal(df_all, base["weights"])
-    strat_ret = sig.shift(1).fillna(0.0) * df_all["ret"]
+    px = px[px.index >= fac.index.min()]
+    bps = costs.trade_bps(symbol)
+    weights = {k: float(base["weights"].get(k, 0.0)) for k in fac.columns}
+    bt = walk_forward(fac, px["close"], weights, mode="none", keep_returns=True, cost_bps=bps,
+                      band=costs.BAND, min_trade=costs.MIN_TRADE)
+    strat_ret = pd.Series(bt["returns"][0], index=bt["index"])  # net of costs
     equity = (1.0 + strat_ret).cumprod()
 
-    s_all = sharpe_annualized(strat_ret)
-    s_3m = sharpe_annualized(strat_ret.tail(63))
-    s_12m = sharpe_annualized(strat_ret.tail(252))
-    win_12m = float((strat_ret.tail(252) > 0).mean()) if len(strat_ret) >= 10 else None
-    mdd = max_drawdown(equity)
-
-    metrics = {
-        "sharpe_all": s_all,
-        "sharpe_3m": s_3m,
-        "sharpe_12m": s_12m,
-        "winrate_12m": win_12m,
-        "max_drawdown": mdd
-    }
-    eq_list = [[d.strftime("%Y-%m-%d"), float(v)] for d,v in equity.dropna().items()]
+    metrics = trailing_metrics(strat_ret.to_numpy())
+    eq_list = series_rows(equity.dropna())
 
     out = base.copy(); out["as_of"] = ts_now_iso()
     out["metrics"] = metrics; out["equity_curve"] = eq_list
-
-    ensure_dir(MODEL_JSON)
-    with open(MODEL_JSON,"w") as f: json.dump(out, f)
-    print("wrote", MODEL_JSON, "rows:", len(eq_list))
+    row = bt["metrics"].iloc[0]
+    out["costs"] = {"symbol": symbol, "bps": round(bps, 3), "band": costs.BAND, "min_trade": costs.MIN_TRADE,
+                    "turnover": round(float(row["turnover"]), 3), "cost_drag": round(float(row["cost_drag"]), 6),
+                    "gross_ann_return": round(float(row["gross_ann_return"]), 6),
+                    "gross_sharpe": None if pd.isna(row["gross_sharpe"]) else round(float(row["gross_sharpe"]), 4),
+                    "net_sharpe": None if pd.isna(row["sharpe"]) else round(float(row["sharpe"]), 4)}
+    out["backtest"] = {"method": "walk_forward", "normalize": "rolling per factor", "window": signal.WINDOW,
+                       "min_periods": signal.MIN_PERIODS, "configs_per_sec": round(bt["throughput"], 1)}
+
+    write_artifact(MODEL_JSON, out, indent=None)
+    print(MODEL_JSON, "rows:", len(eq_list))
+    print(report())
 
 if __name__ == "__main__":
-    main()
+    perf.run("train_models", main)
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.alphavantage import TokenBucket, AVQuotaExceeded, AVThrottled, av_get, classify_note
+
+
+class FakeAV(BaseHTTPRequestHandler):
+    """Answers with a throttle Note for the first `notes` requests, then a quote."""
+    notes = 0
+    payload_note = {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per "
+                            "minute and 500 calls per day. Please visit https://www.alphavantage.co/premium/ if "
+                            "you would like to target a higher API call frequency."}
+    hits = 0
+
+    def do_GET(self):
+        cls = type(self)
+        cls.hits += 1
+        body = cls.payload_note if cls.hits <= cls.notes else {"Global Quote": {"05. price": "101.5"}}
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_av():
+    handler = type("Handler", (FakeAV,), {"notes": 0, "hits": 0})
+    srv = HTTPServer(("127.0.0.1", 0), handler)
+    th = threading.Thread(target=srv.serve_forever, daemon=True)
+    th.start()
+    yield handler, f"http://127.0.0.1:{srv.server_address[1]}/query"
+    srv.shutdown()
+
+
+def test_bucket_does_not_wait_while_tokens_remain(tmp_path, fake_av):
+    handler, url = fake_av
+    bucket = TokenBucket("k1", rpm=5, state_dir=str(tmp_path))
+    t0 = time.perf_counter()
+    for _ in range(5):
+        av_get({"function": "GLOBAL_QUOTE", "symbol": "SPY"}, "k1", url=url, bucket=bucket)
+    assert time.perf_counter() - t0 < 1.0
+    assert bucket.waited == 0.0
+
+
+def test_bucket_is_shared_through_state_file(tmp_path):
+    a = TokenBucket("k2", rpm=600, capacity=2, state_dir=str(tmp_path))
+    b = TokenBucket("k2", rpm=600, capacity=2, state_dir=str(tmp_path))
+    assert a.acquire() == 0.0
+    assert b.acquire() == 0.0
+    # third token has to wait ~0.1s for the refill, whichever instance asks
+    assert a.acquire() > 0.0
+
+
+def test_throttle_note_drains_bucket_and_retries(tmp_path, fake_av):
+    handler, url = fake_av
+    handler.notes = 2
+    bucket = TokenBucket("k3", rpm=600, state_dir=str(tmp_path))
+    data = av_get({"function": "GLOBAL_QUOTE", "symbol": "QQQ"}, "k3", url=url, bucket=bucket)
+    assert data["Global Quote"]["05. price"] == "101.5"
+    assert handler.hits == 3
+    assert bucket.throttles == 2
+    assert bucket.waited > 0.0
+
+
+def test_persistent_throttle_and_daily_quota_raise(tmp_path, fake_av):
+    handler, url = fake_av
+    handler.notes = 99
+    bucket = TokenBucket("k4", rpm=6000, state_dir=str(tmp_path))
+    with pytest.raises(AVThrottled):
+        av_get({"function": "GLOBAL_QUOTE", "symbol": "QQQ"}, "k4", url=url, bucket=bucket, max_retries=2)
+    handler.payload_note = {"Information": DAILY_INFO}
+    hits = handler.hits
+    with pytest.raises(AVQuotaExceeded):
+        av_get({"function": "GLOBAL_QUOTE", "symbol": "QQQ"}, "k4", url=url, bucket=bucket)
+    assert handler.hits == hits + 1
+
+
+# message texts as Alpha Vantage returns them
+MINUTE_NOTE = ("Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute and "
+               "500 calls per day. Please visit https://www.alphavantage.co/premium/ if you would like to "
+               "target a higher API call frequency.")
+BURST_INFO = ("Thank you for using Alpha Vantage! Please consider spreading out your free API requests more "
+              "sparingly (1 request per second). You may subscribe to any of the premium plans at "
+              "https://www.alphavantage.co/premium/ to lift the free key rate limit (25 requests per day) "
+              "and enjoy additional benefits.")
+DAILY_INFO = ("We have detected your API key as DEMO123 and our standard API rate limit is 25 requests per "
+              "day. Please subscribe to any of the premium plans at https://www.alphavantage.co/premium/ to "
+              "instantly remove all daily rate limits.")
+PREMIUM_INFO = ("Thank you for using Alpha Vantage! This is a premium endpoint. You may subscribe to any of "
+                "the premium plans at https://www.alphavantage.co/premium/ to instantly unlock all premium "
+                "endpoints")
+
+
+@pytest.mark.parametrize("msg, kind", [(MINUTE_NOTE, "throttle"), (BURST_INFO, "throttle"),
+                                       (DAILY_INFO, "quota"), (PREMIUM_INFO, "error")])
+def test_classify_real_messages(msg, kind):
+    assert classify_note(msg) == kind
+
+
+def test_burst_information_is_retried(tmp_path, fake_av):
+    handler, url = fake_av
+    handler.notes, handler.payload_note = 1, {"Information": BURST_INFO}
+    bucket = TokenBucket("k5", rpm=600, state_dir=str(tmp_path))
+    data = av_get({"function": "GLOBAL_QUOTE", "symbol": "QQQ"}, "k5", url=url, bucket=bucket)
+    assert data["Global Quote"]["05. price"] == "101.5" and bucket.throttles == 1
+    handler.notes, handler.hits, handler.payload_note = 1, 0, {"Information": PREMIUM_INFO}
+    with pytest.raises(RuntimeError) as e:
+        av_get({"function": "GLOBAL_QUOTE", "symbol": "QQQ"}, "k5", url=url, bucket=bucket)
+    assert not isinstance(e.value, AVThrottled)
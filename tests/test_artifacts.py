@@ -0,0 +1,56 @@
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import artifacts
+from core.artifacts import write_artifact, content_hash, load_manifest
+
+
+def _payload(as_of, score=0.5):
+    return {"as_of": as_of, "score": score, "training": {"seconds": as_of[-2:], "w": np.array([0.5, 0.5])}}
+
+
+def test_hash_ignores_volatile_keys():
+    assert content_hash(_payload("2024-01-01T00:00:00Z")) == content_hash(_payload("2024-01-02T00:00:11Z"))
+    assert content_hash(_payload("2024-01-01T00:00:00Z")) != content_hash(_payload("2024-01-01T00:00:00Z", 0.6))
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+
+def test_skips_noop_rewrite_and_tracks_manifest(tmp_path):
+    path, man = str(tmp_path / "docs" / "sig.json"), str(tmp_path / "docs" / "manifest.json")
+    assert write_artifact(path, _payload("2024-01-01T00:00:00Z"), manifest=man)
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_artifact(path, _payload("2024-01-02T00:00:00Z"), manifest=man)
+    assert os.stat(path).st_mtime_ns == mtime
+    entry = load_manifest(man)["files"][path.replace(os.sep, "/")]
+    assert entry["as_of"] == "2024-01-01T00:00:00Z" and entry["bytes"] == os.path.getsize(path)
+    assert write_artifact(path, _payload("2024-01-03T00:00:00Z", 0.7), manifest=man)
+    assert load_manifest(man)["files"][path.replace(os.sep, "/")]["sha1"] == content_hash(_payload("x", 0.7))
+    assert not [f for f in os.listdir(tmp_path / "docs") if f.endswith(".tmp")]
+
+
+def test_adopts_existing_file_and_detects_edits(tmp_path):
+    path, man = str(tmp_path / "p.json"), str(tmp_path / "manifest.json")
+    write_artifact(path, {"as_of": "a", "x": 1}, manifest="")
+    assert not write_artifact(path, {"as_of": "b", "x": 1}, manifest=man)
+    assert path.replace(os.sep, "/") in load_manifest(man)["files"]
+    with open(path, "w") as f:
+        f.write('{"x": 22}')  # edited behind the manifest's back
+    assert write_artifact(path, {"as_of": "c", "x": 1}, manifest=man)
+
+
+def test_report_sets_github_output(tmp_path, monkeypatch):
+    out = tmp_path / "gh_out"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(out))
+    monkeypatch.setattr(artifacts, "CHANGED", [])
+    monkeypatch.setattr(artifacts, "UNCHANGED", ["docs/a.json"])
+    assert "changed=0" in artifacts.report() and not out.exists()
+    monkeypatch.setattr(artifacts, "CHANGED", ["docs/b.json"])
+    artifacts.report()
+    assert out.read_text() == "changed=true\n"
+
+
+def test_manifest_is_kept_out_of_published_docs():
+    if "ARTIFACT_MANIFEST" not in os.environ:
+        assert not artifacts.MANIFEST.replace(os.sep, "/").startswith("docs/")
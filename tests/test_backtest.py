@@ -0,0 +1,78 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+from core.backtest import normalize, evaluate, walk_forward, weight_grid, random_weights, search
+from synthetic import market
+
+
+def test_normalize_matches_pandas_and_has_no_lookahead():
+    fac, _ = market(800, start="2010-01-01", level=1e3)
+    X = fac.to_numpy()
+    z = normalize(X, mode="rolling", window=120, min_periods=60)
+    r = fac.rolling(120, min_periods=60)
+    ref = ((fac - r.mean()) / r.std(ddof=0)).fillna(0.0).to_numpy()
+    np.testing.assert_allclose(z, ref, atol=1e-8)
+    ze = normalize(X, mode="expanding", min_periods=60)
+    X2 = X.copy()
+    X2[500:] += 50.0  # changing the future must not move past z-scores
+    np.testing.assert_array_equal(normalize(X2, mode="expanding", min_periods=60)[:500], ze[:500])
+
+
+def test_refit_holds_stats_between_refits():
+    fac, _ = market(300, 1, start="2010-01-01", level=1e3)
+    X = fac.to_numpy()
+    z = normalize(X, mode="expanding", min_periods=20, refit=50)
+    x = X[:, 0]
+    m, s = x[:101].mean(), x[:101].std()
+    np.testing.assert_allclose(z[100:150, 0], (x[100:150] - m) / s)
+
+
+def test_evaluate_matches_per_config_loop():
+    fac, px = market(800, start="2010-01-01", level=1e3)
+    W = np.random.default_rng(3).normal(size=(37, 3))
+    res = walk_forward(fac, px, W, mode="rolling", window=252, keep_returns=True, chunk=10)
+    z = normalize(fac.to_numpy(), mode="rolling", window=252)
+    ret = px.pct_change().fillna(0.0)
+    for i in (0, 17, 36):
+        sig = pd.Series(np.tanh(z @ W[i]), index=px.index)
+        r = sig.shift(1).fillna(0.0) * ret
+        eq = (1 + r).cumprod()
+        np.testing.assert_allclose(res["returns"][i], r.to_numpy(), atol=1e-15)
+        row = res["metrics"].iloc[i]
+        assert abs(row["sharpe"] - r.mean() / r.std(ddof=0) * np.sqrt(252)) < 1e-9
+        assert abs(row["max_dd"] - (eq / eq.cummax() - 1).min()) < 1e-12
+        assert abs(row["final_equity"] - eq.iloc[-1]) < 1e-12
+    assert list(res["metrics"].columns[:3]) == ["f0", "f1", "f2"]
+
+
+def test_dict_weights_and_sparse_factor_dates():
+    fac, px = market(400, 2, start="2010-01-01", level=1e3)
+    weekly = fac.iloc[::5]
+    res = walk_forward(weekly, px, [{"f0": 1.0}, {"f1": 0.5, "f0": 0.5}], min_periods=20)
+    assert len(res["metrics"]) == 2 and res["throughput"] > 0
+    zero = evaluate(np.zeros((10, 2)), np.ones(10), np.ones((1, 2)))
+    assert zero["final_equity"][0] == 1.0 and np.isnan(zero["sharpe"][0])
+
+
+def test_weight_grid_and_random_weights_are_l1_normalized():
+    assert len(weight_grid(3, 3)) == 26
+    W = weight_grid(2, 5)
+    assert len(W) == 16  # (0.5, 0.5) and (1, 1) etc. collapse onto one row
+    np.testing.assert_allclose(np.abs(W).sum(axis=1), 1.0)
+    R = random_weights(100, 4, seed=1)
+    np.testing.assert_allclose(np.abs(R).sum(axis=1), 1.0)
+    assert (R < 0).any()
+
+
+def test_search_sharded_pool_matches_single_pass():
+    fac, px = market(500, start="2010-01-01", level=1e3)
+    W = random_weights(300, 3)
+    one = search(fac, px, W, mode="rolling", window=120)
+    many = search(fac, px, W, workers=2, shard_size=70, mode="rolling", window=120)
+    pd.testing.assert_frame_equal(one["leaderboard"], many["leaderboard"])
+    board = one["leaderboard"]
+    assert board["sharpe"].is_monotonic_decreasing and len(board) == 300
@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import backtest_runner as br
+from core import artifacts
+from core.utils import read_json
+
+IDX = pd.bdate_range("2012-01-02", "2016-12-30")
+
+
+def _factors():
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({"NAAM": rng.normal(size=len(IDX)), "FRED": rng.normal(size=len(IDX))}, index=IDX)
+
+
+def _loader(sym):
+    if sym == "BAD":
+        raise RuntimeError("no data")
+    rng = np.random.default_rng(sum(map(ord, sym)))
+    return pd.Series(100 * np.cumprod(1 + rng.normal(3e-4, 0.02, len(IDX))), index=IDX)
+
+
+def test_run_starts_at_start_and_reports_errors():
+    w = {"NAAM": 0.7, "FRED": -0.3}
+    res = br.run(["AAA", "BAD", "BBB"], "2015-01-01", _factors(), w, loader=_loader, workers=1)
+    assert list(res) == ["AAA", "BAD", "BBB"] and "error" in res["BAD"]
+    a = res["AAA"]
+    assert a["equity_curve"][0][0] >= "2015-01-01" and a["days"] == len(a["equity_curve"])
+    assert {"ann_return", "ann_vol", "max_dd", "sharpe", "sortino", "max_underwater"} <= set(a["metrics"])
+    assert a["rolling"]["dates"] == [d for d, _ in a["equity_curve"]]
+    assert a["costs"]["bps"] > 0 and a["costs"]["turnover"] > 0
+    assert a["gross"]["ann_return"] > a["metrics"]["ann_return"]
+    assert [v for _, v in a["rolling_sharpe_63d"]] == a["rolling"]["sharpe_63"]
+    assert a["metrics"]["max_dd"] <= 0
+    # the first 62 rolling values are not warm yet
+    assert a["rolling_sharpe_63d"][61][1] is None and a["rolling_sharpe_63d"][62][1] is not None
+
+
+def test_single_day_symbol_reports_empty_metrics():
+    res = br.run(["AAA"], "2016-12-30", _factors(), {"NAAM": 1.0}, loader=_loader, workers=1)
+    a = res["AAA"]
+    assert a["days"] == 1 and set(a["metrics"]) == set(br.EMPTY_METRICS) == set(a["gross"])
+    assert {"sharpe", "sortino", "max_underwater", "final_equity"} <= set(a["metrics"])
+    assert all(v is None for v in a["metrics"].values())
+
+
+def test_pool_matches_serial():
+    w = {"NAAM": 0.5, "FRED": 0.5}
+    serial = br.run(["AAA", "BBB"], "2014-06-01", _factors(), w, loader=_loader, workers=1)
+    pooled = br.run(["AAA", "BBB"], "2014-06-01", _factors(), w, loader=_loader, workers=2)
+    for s in serial:
+        assert serial[s]["equity_curve"] == pooled[s]["equity_curve"]
+        assert serial[s]["metrics"] == pooled[s]["metrics"]
+
+
+def test_main_writes_contract(tmp_path, monkeypatch):
+    monkeypatch.setattr(br, "load_history", _loader)
+    monkeypatch.setattr(br, "load_weights", lambda: {"NAAM": 1.0})
+    import models.namm50.train as train
+    monkeypatch.setattr(train, "load_z_frame", _factors)
+    out, reg = str(tmp_path / "bt.json"), str(tmp_path / "reg.json")
+    monkeypatch.setattr(artifacts, "MANIFEST", str(tmp_path / "manifest.json"))
+    rc = br.main(["--start", "2015-01-01", "--version", "v9", "--out", out, "--registry", reg,
+                  "--symbols", "aaa,BAD", "--workers", "1"])
+    assert rc == 0
+    m = read_json(out)["models"]["namm50"]
+    assert m["version"] == "v9" and m["symbol"] == "AAA"
+    assert m["equity_curve"] == m["symbols"]["AAA"]["equity_curve"]
+    assert "error" in m["symbols"]["BAD"]
+    assert read_json(reg)["versions"]["v9"]["symbols"] == ["AAA", "BAD"]
@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+import synthetic
+import bench_suite
+from fetchers.naaim import parse
+
+
+def test_generators_match_pipeline_shapes():
+    close = synthetic.price_panel(20, 60)
+    assert close.shape == (60, 20) and close.iloc[-1].notna().all()
+    fred = synthetic.fred_frame(400)
+    assert fred["DGS10"].isna().any() and fred["DFF"].notna().all() and len(fred) < 400
+    rows = parse(synthetic.naaim_csv(30))
+    assert len(rows) == 30 and set(rows[0]) == {"date", "value"}
+    # past the daily timestamp range the calendar turns hourly instead of failing
+    assert len(synthetic.calendar(300_000)) == 300_000
+    payload = synthetic.factors_payload(0.1)
+    assert {"naaim_exposure", "fred_macro", "ndx_breadth"} <= set(payload["factors"])
+
+
+def test_compare_flags_slowdowns_above_threshold_and_floor():
+    res = lambda **kw: {"results": {f"{k}@1x": {"case": k, "scale": 1, "best": v} for k, v in kw.items()}}
+    base = res(a=0.100, b=0.100, c=0.0010, d=0.5)
+    new = res(a=0.200, b=0.110, c=0.0030, e=1.0)
+    flagged = {k: slow for k, *_, slow in bench_suite.compare(base, new, threshold=0.25, floor=0.002)}
+    assert flagged == {"a@1x": True, "b@1x": False, "c@1x": False}
@@ -0,0 +1,53 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.breadth import compute_breadth
+
+
+def _panel(T=600, N=25, seed=1):
+    rng = np.random.default_rng(seed)
+    x = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (T, N)), axis=0))
+    for j, s in enumerate(rng.integers(0, 350, N)):
+        x[:s, j] = np.nan  # listings starting mid-window
+    return pd.DataFrame(x, index=pd.bdate_range("2020-01-01", periods=T))
+
+
+def test_matches_pandas_rolling_with_late_listings():
+    px = _panel()
+    br = compute_breadth(px)
+    for w in (20, 50, 200):
+        sma = px.rolling(w).mean()
+        ok = sma.notna()
+        exp = ((px >= sma) & ok).sum(axis=1) / ok.sum(axis=1).replace(0, np.nan) * 100.0
+        np.testing.assert_allclose(br[f"pct_above_{w}dma"].values, exp.values, atol=1e-9, equal_nan=True)
+    hi = px.rolling(252).max()
+    exp = (px >= hi).sum(axis=1) / hi.notna().sum(axis=1).replace(0, np.nan) * 100.0
+    np.testing.assert_allclose(br["pct_new_high"].values, exp.values, atol=1e-9, equal_nan=True)
+    d = px.diff()
+    np.testing.assert_array_equal(br["advancers"].values, (d > 0).sum(axis=1).values)
+    np.testing.assert_array_equal(br["ad_line"].values, ((d > 0).sum(axis=1) - (d < 0).sum(axis=1)).cumsum().values)
+
+
+def test_unlisted_names_do_not_dilute_breadth():
+    idx = pd.bdate_range("2023-01-02", periods=60)
+    up = pd.Series(np.arange(60, dtype=float) + 10, index=idx)
+    late = up.copy()
+    late[:40] = np.nan
+    br = compute_breadth(pd.DataFrame({"A": up, "B": late}), sma_windows=(20,), hl_window=20)
+    assert br["pct_above_20dma"].iloc[45] == 100.0
+    assert np.isnan(br["pct_above_20dma"].iloc[5])
+
+
+def test_membership_mask_limits_universe_but_keeps_history():
+    px = _panel(T=300, N=4, seed=3).fillna(100.0)
+    member = np.ones(px.shape, dtype=bool)
+    member[:150, 3] = False  # joined the index on day 150
+    br = compute_breadth(px, sma_windows=(50,), membership=member)
+    ref = compute_breadth(px.iloc[:, :3], sma_windows=(50,))
+    np.testing.assert_allclose(br["pct_above_50dma"].values[:150], ref["pct_above_50dma"].values[:150], equal_nan=True)
+    # full SMA history already available on the day it joins
+    assert br["n_active"].iloc[150] == 4
+    assert np.isfinite(br["pct_above_50dma"].iloc[150])
@@ -0,0 +1,66 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import calendar
+
+
+def test_session_counts_and_holidays():
+    assert len(calendar.sessions("2023-01-01", "2023-12-31")) == 250
+    assert len(calendar.sessions("2024-01-01", "2024-12-31")) == 252
+    days = calendar.sessions("2024-03-25", "2024-04-05")
+    assert pd.Timestamp("2024-03-29") not in days          # Good Friday
+    assert pd.Timestamp("2024-03-28") in days
+    assert pd.Timestamp("2022-06-20") not in calendar.sessions("2022-06-01", "2022-06-30")  # Juneteenth observed
+    assert pd.Timestamp("2021-12-31") in calendar.sessions("2021-12-01", "2021-12-31")     # Saturday New Year
+
+
+def test_publication_lags():
+    naaim = pd.Series([50.0, 60.0], index=pd.to_datetime(["2024-01-03", "2024-01-10"]))  # Wednesdays
+    dgs10 = pd.Series([4.0, 4.1], index=pd.to_datetime(["2024-01-05", "2024-01-08"]))    # Fri, Mon
+    unrate = pd.Series([3.7], index=pd.to_datetime(["2024-01-01"]))
+    idx = calendar.sessions("2024-01-02", "2024-02-15")
+    out = calendar.asof_join({"naaim": naaim, "dgs10": dgs10, "unrate": unrate}, idx,
+                             lags={"naaim": calendar.lag_for("naaim_exposure")})
+    assert np.isnan(out.loc["2024-01-03", "naaim"])
+    assert out.loc["2024-01-04", "naaim"] == 50.0
+    assert out.loc["2024-01-10", "naaim"] == 50.0 and out.loc["2024-01-11", "naaim"] == 60.0
+    assert np.isnan(out.loc["2024-01-05", "dgs10"])
+    assert out.loc["2024-01-08", "dgs10"] == 4.0 and out.loc["2024-01-09", "dgs10"] == 4.1
+    # dated the 1st, known once the release is out 35 days later
+    assert np.isnan(out.loc["2024-02-02", "unrate"]) and out.loc["2024-02-05", "unrate"] == 3.7
+
+
+def test_no_lookahead_against_reference():
+    rng = np.random.default_rng(0)
+    raw = pd.date_range("2015-01-01", "2019-12-31", freq="D")
+    s = pd.Series(rng.normal(size=len(raw)), index=raw)[rng.random(len(raw)) > 0.3]
+    idx = calendar.sessions("2015-01-01", "2019-12-31")
+    got = calendar.asof_join({"x": s}, idx, lags={"x": (3, 1)})["x"]
+    for t in rng.choice(len(idx) - 1, 50, replace=False):
+        known = s[s.index + pd.Timedelta(days=3) <= idx[t - 1]] if t else s.iloc[:0]
+        exp = known.iloc[-1] if len(known) else np.nan
+        np.testing.assert_equal(got.iloc[t], exp)
+
+
+def test_max_age_and_default_index():
+    s = pd.Series([1.0], index=pd.to_datetime(["2024-01-02"]))
+    idx = calendar.sessions("2024-01-02", "2024-01-12")
+    out = calendar.asof_join({"mom_x": s}, idx, max_age=2)["mom_x"]
+    assert list(out.notna()) == [True, True, True] + [False] * (len(idx) - 3)
+    weekly = pd.Series([1.0, 2.0], index=pd.to_datetime(["2024-01-06", "2024-01-13"]))  # Saturdays
+    out = calendar.asof_join({"w": weekly})
+    # one session after the next open (MLK Day skipped); the calendar ends once the last value is known
+    assert out.index[0] == pd.Timestamp("2024-01-08") and out.index[-1] == pd.Timestamp("2024-01-17")
+    assert out["w"].first_valid_index() == pd.Timestamp("2024-01-09") and out["w"].iloc[-1] == 2.0
+
+
+def test_align_uses_source_lags():
+    idx = calendar.sessions("2024-01-02", "2024-01-10")
+    frame = pd.DataFrame({"naaim": [50.0, np.nan], "vix": [np.nan, 13.0]},
+                         index=pd.to_datetime(["2024-01-03", "2024-01-04"]))
+    out = calendar.align(frame, idx, sources={"naaim": "naaim_exposure", "vix": "vix_cls"})
+    assert out.loc["2024-01-04"].tolist() == [50.0, 13.0]
+    assert np.isnan(out.loc["2024-01-03", "naaim"])
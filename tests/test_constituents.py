@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.constituents import ConstituentStore, MembershipIndex, parse_html, reconstruct, apply_snapshot, INCEPTION
+
+HTML = """<html><body>
+<table><tr><th>Company</th><th>Ticker</th></tr>
+<tr><td>Apple</td><td>AAPL</td></tr><tr><td>Microsoft</td><td>MSFT</td></tr>
+<tr><td>Palantir</td><td>PLTR</td></tr></table>
+<table><tr><th>Date</th><th>Added</th><th>Removed</th></tr>
+<tr><td>2024-12-23</td><td>PLTR</td><td>ILMN</td></tr>
+<tr><td>2021-01-04</td><td>ILMN</td><td>WBA</td></tr></table>
+</body></html>"""
+
+
+class _Resp:
+    def __init__(self, status, text="", headers=None):
+        self.status_code, self.text, self.headers = status, text, headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses, self.sent = list(responses), []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_reconstruct_walks_changes_backwards():
+    current, changes = parse_html(HTML)
+    assert current == ["AAPL", "MSFT", "PLTR"]
+    idx = MembershipIndex(reconstruct(current, changes, as_of="2025-01-10"))
+    assert idx.members_on("2020-06-01") == ["AAPL", "MSFT", "WBA"]
+    assert idx.members_on("2022-06-01") == ["AAPL", "ILMN", "MSFT"]
+    assert idx.members_on("2025-01-02") == ["AAPL", "MSFT", "PLTR"]
+    assert idx.tickers_between("2024-01-01", "2025-01-01") == ["AAPL", "ILMN", "MSFT", "PLTR"]
+
+
+def test_mask_matches_interval_lookup():
+    iv = pd.DataFrame({"ticker": ["A", "B", "B", "C"],
+                       "start": [INCEPTION, "2024-01-03", "2024-01-08", "2024-01-05"],
+                       "end": [pd.NaT, "2024-01-05", pd.NaT, "2024-01-09"]})
+    idx = MembershipIndex(iv)
+    dates = pd.bdate_range("2024-01-02", "2024-01-10")[::-1]  # order must not matter
+    m = idx.mask(dates, ["A", "B", "C", "ZZZ"])
+    for i, d in enumerate(dates):
+        on = set(idx.members_on(d))
+        assert [t in on for t in ["A", "B", "C", "ZZZ"]] == list(m[i])
+    assert not m[:, 3].any()
+
+
+def test_snapshot_opens_and_closes_intervals():
+    iv = reconstruct(["AAPL", "MSFT"], None)
+    out, changed = apply_snapshot(iv, ["AAPL", "NVDA"], "2025-03-03")
+    assert changed
+    idx = MembershipIndex(out)
+    assert idx.current() == ["AAPL", "NVDA"]
+    assert idx.members_on("2025-03-01") == ["AAPL", "MSFT"]
+    _, changed = apply_snapshot(out, ["AAPL", "NVDA"], "2025-03-04")
+    assert not changed
+
+
+def test_refresh_is_cached_daily_and_conditional(tmp_path):
+    store = ConstituentStore("ndx", root=str(tmp_path))
+    s = _Session([_Resp(200, HTML, {"ETag": '"v1"'}), _Resp(304)])
+    idx = store.refresh(today="2025-01-10", session=s)
+    assert idx.current() == ["AAPL", "MSFT", "PLTR"]
+    assert store.load_meta()["version"] == 1
+    store.refresh(today="2025-01-10", session=s)
+    assert len(s.sent) == 1  # same day: served from disk
+    idx = store.refresh(today="2025-01-11", session=s)
+    assert s.sent[1]["If-None-Match"] == '"v1"'
+    assert idx.current() == ["AAPL", "MSFT", "PLTR"]
+    assert store.load_meta()["checked"] == "2025-01-11"
@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+from core.costs import apply_bands, turnover, charge, trade_bps, SPREAD_BPS
+from core.backtest import walk_forward
+from synthetic import market
+
+
+def test_turnover_and_charge():
+    pos = np.array([[0.5, 0.5, -0.5, 0.0]])
+    np.testing.assert_allclose(turnover(pos), [[0.5, 0.0, 1.0, 0.5]])
+    R = np.full((1, 4), 0.01)
+    charge(R, turnover(pos), 10.0)
+    np.testing.assert_allclose(R, [[0.01, 0.01 - 0.0005, 0.01, 0.01 - 0.001]])
+
+
+def test_trade_bps_uses_half_spread():
+    assert trade_bps(bps=1.0) == 1.0
+    assert trade_bps("soxl", bps=1.0) == 1.0 + SPREAD_BPS["SOXL"] / 2
+    assert trade_bps("UNKNOWN", bps=0.0) > 0
+
+
+def test_bands_and_min_trade():
+    pos = np.array([[0.0, 0.3, 0.35, 0.9, 0.85, 0.1]])
+    np.testing.assert_allclose(apply_bands(pos, band=0.1), [[0.0, 0.2, 0.25, 0.8, 0.8, 0.2]])
+    np.testing.assert_allclose(apply_bands(pos, min_trade=0.2), [[0.0, 0.3, 0.3, 0.9, 0.9, 0.1]])
+    assert apply_bands(pos) is not None and np.shares_memory(apply_bands(pos), pos)
+
+
+def test_walk_forward_net_gross_and_turnover():
+    fac, px = market(600, 2, names=["a", "b"], start="2012-01-02")
+    W = np.random.default_rng(1).normal(size=(9, 2))
+    free = walk_forward(fac, px, W, mode="rolling", window=120, keep_returns=True)
+    paid = walk_forward(fac, px, W, mode="rolling", window=120, keep_returns=True, cost_bps=5.0)
+    m0, m1 = free["metrics"], paid["metrics"]
+    np.testing.assert_allclose(m1["gross_sharpe"], m0["sharpe"])
+    np.testing.assert_allclose(m0["cost_drag"], 0.0, atol=1e-15)
+    assert (m1["sharpe"] < m1["gross_sharpe"]).all() and (m1["cost_drag"] > 0).all()
+    turn = paid["turnover_path"]
+    np.testing.assert_allclose(paid["returns"][:, 1:], free["returns"][:, 1:] - turn[:, :-1] * 5e-4)
+    np.testing.assert_allclose(m1["turnover"], turn[:, :-1].sum(axis=1) / len(px) * 252)
+    np.testing.assert_allclose(m1["cost_drag"], m1["turnover"] * 5e-4, rtol=1e-9)
+    banded = walk_forward(fac, px, W, mode="rolling", window=120, cost_bps=5.0, band=0.1)["metrics"]
+    assert (banded["turnover"] < m1["turnover"]).all()
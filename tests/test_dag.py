@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pipelines import dag
+
+
+def _copy_stage(name, src, dst, always=False, extra=""):
+    code = (f"import json; d=json.load(open({src!r})) if {src!r} else {{}}; d['seen']=d.get('seen',0)+1; "
+            f"d['as_of']=__import__('time').time(); {extra} json.dump(d, open({dst!r},'w'))")
+    return {"name": name, "cmd": [sys.executable, "-c", code], "always": always,
+            "inputs": [src] if src else [], "outputs": [dst]}
+
+
+def _stages(tmp_path):
+    raw, a, b, c = (str(tmp_path / n) for n in ("raw.json", "a.json", "b.json", "c.json"))
+    with open(raw, "w") as f:
+        json.dump({"v": 1}, f)
+    return raw, [_copy_stage("a", raw, a), _copy_stage("b", a, b), _copy_stage("c", raw, c)]
+
+
+def test_skips_unchanged_and_reruns_on_input_change(tmp_path):
+    raw, stages = _stages(tmp_path)
+    state = str(tmp_path / "state.json")
+    assert dag.upstream(stages) == {"a": set(), "b": {"a"}, "c": set()}
+    assert dag.run(stages, state_path=state, log=lambda m: None) == {"a": "ran", "c": "ran", "b": "ran"}
+    assert dag.run(stages, state_path=state, log=lambda m: None) == {"a": "cached", "b": "cached", "c": "cached"}
+    st = dag.run(stages, state_path=state, force=True, log=lambda m: None)
+    assert set(st.values()) == {"ran"}
+    with open(raw, "w") as f:
+        json.dump({"v": 2}, f)
+    res = dag.run(stages, state_path=state, log=lambda m: None)
+    assert res["a"] == "ran" and res["c"] == "ran"
+    rows = dag.plan(stages, dag.load_state(state))
+    assert [r[1] for r in rows] == ["cached", "cached", "cached"]
+
+
+def test_failure_blocks_dependents_and_dry_run_plans(tmp_path):
+    raw, stages = _stages(tmp_path)
+    state = str(tmp_path / "state.json")
+    stages[0]["cmd"] = [sys.executable, "-c", "raise SystemExit(3)"]
+    res = dag.run(stages, state_path=state, log=lambda m: None)
+    assert res == {"a": "failed", "b": "blocked", "c": "ran"}
+    rows = dag.plan(stages, dag.load_state(state))
+    assert [(r[0], r[1], r[2]) for r in rows] == [("a", "run", "never ran"), ("b", "run", "never ran"),
+                                                 ("c", "cached", "unchanged")]
+
+
+def test_json_hash_ignores_as_of(tmp_path):
+    p = str(tmp_path / "x.json")
+    with open(p, "w") as f:
+        json.dump({"as_of": "1", "k": [1, 2]}, f)
+    h1 = dag.file_hash(p)
+    with open(p, "w") as f:
+        json.dump({"k": [1, 2], "as_of": "2"}, f, indent=2)
+    assert dag.file_hash(p) == h1
+
+
+def test_source_hash_follows_local_imports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("pkg")
+    files = {"pkg/__init__.py": "", "pkg/helper.py": "X = 1\n", "pkg/deep.py": "Y = 1\n",
+             "pkg/stage.py": "import json\nfrom pkg import helper\n\ndef main():\n    import pkg.deep\n"}
+    for p, src in files.items():
+        with open(p, "w") as f:
+            f.write(src)
+    stage = {"name": "s", "module": "pkg.stage", "inputs": [], "outputs": []}
+    assert dag.stage_source(stage) == sorted(os.path.join(*p.split("/")) for p in files)
+    h = dag.check(stage, {})[2]
+    with open("pkg/deep.py", "w") as f:
+        f.write("Y = 2\n")
+    assert dag.check(stage, {})[2] != h
+
+
+def test_pipeline_stages_read_what_upstream_writes():
+    produced = {p for s in dag.STAGES for p in s["outputs"]}
+    assert all(p in produced or p in dag.EXTERNAL_INPUTS for s in dag.STAGES for p in s["inputs"])
+    assert {"core/backtest.py", "core/calendar.py", "models/namm50/signal.py"} <= set(
+        dag.stage_source(next(s for s in dag.STAGES if s["name"] == "train")))
+
+
+def test_cycle_is_blocked_not_spun(tmp_path):
+    a, b = str(tmp_path / "a.json"), str(tmp_path / "b.json")
+    stages = [_copy_stage("a", b, a), _copy_stage("b", a, b)]
+    assert dag.run(stages, state_path=str(tmp_path / "state.json"), log=lambda m: None) == \
+        {"a": "blocked", "b": "blocked"}
+
+
+def test_session_stage_reruns_on_a_new_close(tmp_path, monkeypatch):
+    from core import price_store
+    raw, stages = _stages(tmp_path)
+    stages[0]["session"] = True
+    state = str(tmp_path / "state.json")
+    monkeypatch.setattr(price_store, "last_session", lambda now=None: pd.Timestamp("2024-06-27"))
+    dag.run(stages, state_path=state, log=lambda m: None)
+    assert dag.run(stages, state_path=state, log=lambda m: None)["a"] == "cached"
+    monkeypatch.setattr(price_store, "last_session", lambda now=None: pd.Timestamp("2024-06-28"))
+    assert dag.run(stages, state_path=state, log=lambda m: None)["a"] == "ran"
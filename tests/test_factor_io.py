@@ -0,0 +1,48 @@
+import os
+import sys
+import zipfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.factor_io import write_npz, load_frame, load_as_of, to_arrays
+
+FACTORS = {
+    "naaim_exposure": {"series": [["2024-01-04", 60.5], ["2024-01-11", None], ["2024-01-18", 71.25]]},
+    "fred_macro": {"series": [["2024-01-04", 4.1, 5.33], ["2024-01-05", 4.0, 5.33]]},
+    "ndx_breadth": {"series": None},
+    "china_proxy": {"series": []},
+}
+
+
+def test_roundtrip_columns_and_calendar(tmp_path):
+    p = str(tmp_path / "f.npz")
+    write_npz(p, FACTORS, as_of="2024-01-19T00:00:00Z")
+    df = load_frame(p)
+    assert list(df.columns) == ["naaim_exposure", "fred_macro", "fred_macro:1"]
+    assert list(df.index.strftime("%Y-%m-%d")) == ["2024-01-04", "2024-01-05", "2024-01-11", "2024-01-18"]
+    assert df.index.name == "date" and (df.dtypes == np.float32).all()
+    assert df.loc["2024-01-18", "naaim_exposure"] == 71.25
+    assert np.isnan(df.loc["2024-01-11", "naaim_exposure"]) and np.isnan(df.loc["2024-01-05", "naaim_exposure"])
+    assert df.loc["2024-01-05", "fred_macro:1"] == np.float32(5.33)
+    assert load_as_of(p) == "2024-01-19T00:00:00Z"
+    pd.testing.assert_frame_equal(df, load_frame(p, mmap=False))
+
+
+def test_values_are_memory_mapped_and_members_stored(tmp_path):
+    p = str(tmp_path / "f.npz")
+    write_npz(p, FACTORS)
+    with zipfile.ZipFile(p) as zf:
+        assert all(i.compress_type == zipfile.ZIP_STORED for i in zf.infolist())
+    base = load_frame(p).to_numpy()
+    while getattr(base, "base", None) is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+
+
+def test_day_offsets_and_empty_payload(tmp_path):
+    days, values, names = to_arrays({"a": {"series": [["1970-01-03", 1.0]]}})
+    assert days.dtype == np.int32 and days.tolist() == [2] and names == ["a"]
+    p = str(tmp_path / "empty.npz")
+    write_npz(p, {"a": {"series": None}})
+    assert load_frame(p).empty
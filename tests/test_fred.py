@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.fred import FredClient, build_frame
+
+
+class _Resp:
+    def __init__(self, js):
+        self.js = js
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.js
+
+
+class FakeFred:
+    """Serves a fixed daily history and honours observation_start like the real API."""
+
+    def __init__(self, end):
+        self.dates = pd.date_range("2024-01-01", end, freq="D").strftime("%Y-%m-%d")
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(dict(params))
+        start = params.get("observation_start", "0000")
+        obs = [{"date": d, "value": "." if i % 7 == 3 else str(i / 10)}
+               for i, d in enumerate(self.dates) if d >= start]
+        return _Resp({"realtime_start": "2024-03-01", "observations": obs})
+
+
+def test_tail_only_refresh_and_same_day_cache(tmp_path):
+    api = FakeFred("2024-02-15")
+    c = FredClient("k", cache_dir=str(tmp_path), session=api)
+    s1 = c.fetch("DGS10", today="2024-02-15")
+    assert "observation_start" not in api.calls[0]
+    assert np.isnan(s1.iloc[3]) and s1.iloc[4] == 0.4
+    c.fetch("DGS10", today="2024-02-15")
+    assert len(api.calls) == 1
+    api.dates = pd.date_range("2024-01-01", "2024-03-01", freq="D").strftime("%Y-%m-%d")
+    s2 = c.fetch("DGS10", today="2024-03-01")
+    assert api.calls[1]["observation_start"] == "2024-01-15"
+    assert s2.index[-1] == pd.Timestamp("2024-03-01") and len(s2) == len(api.dates)
+    _, meta = c.load_cached("DGS10")
+    assert meta["last_observation"] == "2024-03-01" and meta["realtime_start"] == "2024-03-01"
+    assert c.stats["cold"] == 1 and c.stats["tail"] == 1 and c.stats["fresh"] == 1
+
+
+def test_earlier_start_than_cached_refetches(tmp_path):
+    api = FakeFred("2024-02-15")
+    c = FredClient("k", cache_dir=str(tmp_path), session=api)
+    c.fetch("DFF", start="2024-02-01", today="2024-02-15")
+    s = c.fetch("DFF", start="2024-01-10", today="2024-02-15")
+    assert api.calls[-1]["observation_start"] == "2024-01-10"
+    assert s.index[0] == pd.Timestamp("2024-01-10")
+    got = c.fetch_many(["DFF", "DGS10"], start="2024-02-01")
+    assert set(got) == {"DFF", "DGS10"}
+
+
+def test_build_frame_outer_joins_on_one_index():
+    a = pd.Series([1.0, 2.0], index=pd.to_datetime(["2024-01-01", "2024-01-03"]))
+    b = pd.Series([5.0], index=pd.to_datetime(["2024-01-02"]))
+    out = build_frame({"A": a, "B": b}, ["A", "B", "C"])
+    assert list(out.index.strftime("%Y-%m-%d")) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert out["B"].notna().sum() == 1 and out["C"].isna().all()
+    ref = pd.concat([a.rename("A"), b.rename("B")], axis=1)
+    np.testing.assert_array_equal(out[["A", "B"]].values, ref.values)
+
+
+def test_empty_tail_keeps_cached_overlap(tmp_path):
+    api = FakeFred("2024-02-15")
+    c = FredClient("k", cache_dir=str(tmp_path), session=api)
+    s1 = c.fetch("DGS10", today="2024-02-15")
+    api.dates = []
+    s2 = c.fetch("DGS10", today="2024-02-16")
+    assert api.calls[-1]["observation_start"] == "2024-01-15"
+    pd.testing.assert_series_equal(s2, s1, check_freq=False)
+    pd.testing.assert_series_equal(c.load_cached("DGS10")[0], s1, check_freq=False, check_names=False)
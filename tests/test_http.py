@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.http import CachedSession
+
+
+class FakeHost(BaseHTTPRequestHandler):
+    """Serves /etag/<n> with an ETag (304 on a match) and /plain/<n> without validators."""
+    hits = 0
+    body = b"x" * 1000
+
+    def do_GET(self):
+        type(self).hits += 1
+        etag = '"v1"'
+        if self.path.startswith("/etag") and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        if self.path.startswith("/etag"):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def host():
+    handler = type("Handler", (FakeHost,), {"hits": 0})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield handler, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+
+
+def test_ttl_hit_then_etag_revalidation(tmp_path, host):
+    handler, base = host
+    http = CachedSession(cache_dir=str(tmp_path))
+    r = http.get(base + "/etag/a", params={"k": 1}, ttl=60)
+    assert r.status_code == 200 and r.text == "x" * 1000
+    r = http.get(base + "/etag/a", params={"k": 1}, ttl=60)
+    assert r.text == "x" * 1000 and handler.hits == 1
+    # a fresh process with ttl=0 asks the server, which answers 304
+    http2 = CachedSession(cache_dir=str(tmp_path))
+    r = http2.get(base + "/etag/a", params={"k": 1})
+    assert r.status_code == 200 and r.text == "x" * 1000 and handler.hits == 2
+    assert http2.stats["revalidated"] == 1 and http2.stats["bytes_saved"] == 1000
+    http2.get(base + "/etag/a", params={"k": 2})
+    assert http2.stats["misses"] == 1 and handler.hits == 3
+    assert "hit_rate=50%" in http2.report()
+
+
+def test_no_validators_no_ttl_is_not_cached(tmp_path, host):
+    handler, base = host
+    http = CachedSession(cache_dir=str(tmp_path))
+    http.get(base + "/plain/a")
+    http.get(base + "/plain/a")
+    assert handler.hits == 2 and not os.listdir(tmp_path)
+    # caller-supplied conditional headers go straight to the server
+    http.get(base + "/etag/b", headers={"If-None-Match": '"v1"'})
+    assert http.stats["misses"] == 3
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path, host):
+    handler, base = host
+    http = CachedSession(cache_dir=str(tmp_path), max_bytes=2500)
+    for name in ("a", "b"):
+        http.get(f"{base}/plain/{name}", ttl=60)
+        time.sleep(0.02)
+    http.get(base + "/plain/a", ttl=60)  # touch a
+    time.sleep(0.02)
+    http.get(base + "/plain/c", ttl=60)  # 3000 bytes > 2500: b is evicted
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".body")]) == 2
+    before = handler.hits
+    http.get(base + "/plain/a", ttl=60)
+    http.get(base + "/plain/b", ttl=60)
+    assert handler.hits == before + 1
@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.utils import write_json, read_json, dumps_fast, series_rows, rows_series
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Runs a test with orjson and with the stdlib encoder (orjson hidden from import)."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    return request.param
+
+
+def _series():
+    idx = pd.bdate_range("2024-01-01", periods=4)
+    return pd.Series([1.0, np.nan, 2.5, np.inf], index=idx)
+
+
+def test_series_rows_dates_and_nulls():
+    rows = series_rows(_series())
+    assert rows == [["2024-01-01", 1.0], ["2024-01-02", None], ["2024-01-03", 2.5], ["2024-01-04", None]]
+    assert series_rows(pd.Series(dtype=float)) == []
+
+
+def test_rows_series_roundtrip():
+    s = rows_series(series_rows(_series()), name="eq")
+    assert s.name == "eq" and s.index.name == "date"
+    assert list(s.index.strftime("%Y-%m-%d")) == ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    assert s.iloc[0] == 1.0 and np.isnan(s.iloc[1])
+    assert rows_series([]).empty
+
+
+def test_dumps_fast_numpy_and_pandas(backend):
+    df = pd.DataFrame({"a": [1.0, np.nan]}, index=pd.to_datetime(["2024-01-01", "2024-01-02"]))
+    out = json.loads(dumps_fast({
+        "arr": np.arange(3, dtype=np.int64),
+        "f": np.float32(1.5),
+        "nan": np.array([np.nan, 2.0]),
+        "days": np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[D]"),
+        "df": df,
+        "ts": pd.Timestamp("2024-01-02"),
+    }))
+    assert out["arr"] == [0, 1, 2] and out["f"] == 1.5 and out["nan"] == [None, 2.0]
+    assert out["days"] == ["2024-01-01", "2024-01-02"]
+    assert out["df"] == {"date": ["2024-01-01", "2024-01-02"], "a": [1.0, None]}
+    assert out["ts"] == "2024-01-02"
+
+
+def test_dumps_fast_datetimes_and_non_finite_floats(backend):
+    out = json.loads(dumps_fast({
+        "dt": datetime.datetime(2024, 1, 2),
+        "dt_time": datetime.datetime(2024, 1, 2, 15, 30),
+        "ts_time": pd.Timestamp("2024-01-02 15:30"),
+        "day": datetime.date(2024, 1, 2),
+        "floats": [1.0, float("nan"), float("inf")],
+        "nested": {"x": (float("-inf"), 2)},
+        "f32": np.float32("nan"),
+    }))
+    assert out["dt"] == out["day"] == "2024-01-02"
+    assert out["dt_time"] == out["ts_time"] == "2024-01-02T15:30:00"
+    assert out["floats"] == [1.0, None, None] and out["nested"] == {"x": [None, 2]} and out["f32"] is None
+
+
+def test_backends_write_the_same_document(monkeypatch):
+    pytest.importorskip("orjson")
+    payload = {"ts": pd.Timestamp("2024-01-02"), "dt": datetime.datetime(2024, 1, 2, 9),
+               "x": [float("nan"), 1.5], "s": _series(), "a": np.array([np.nan, 1.0])}
+    fast = dumps_fast(payload)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert dumps_fast(payload) == fast
+
+
+def test_write_json_fast_compact_and_indent(tmp_path, backend):
+    p = str(tmp_path / "sub" / "m.json")
+    payload = {"equity_curve": series_rows(_series()), "w": np.array([0.5, 0.5])}
+    write_json(p, payload, indent=None, fast=True)
+    raw = open(p, encoding="utf-8").read()
+    assert "\n" not in raw and ", " not in raw
+    assert read_json(p)["w"] == [0.5, 0.5]
+    assert not os.path.exists(p + ".tmp")
+    write_json(p, payload, fast=True)
+    assert "\n" in open(p, encoding="utf-8").read()
+    assert read_json(p) == json.loads(dumps_fast(payload))
+
+
+def test_read_json_default(tmp_path):
+    assert read_json(str(tmp_path / "missing.json"), {"x": 1}) == {"x": 1}
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert read_json(str(bad)) is None
@@ -0,0 +1,59 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+from core.metrics import rolling, summary, drawdown, scalars, payload
+from synthetic import returns_matrix
+
+
+def test_rolling_matches_pandas():
+    R = returns_matrix(3, 400)
+    out = rolling(R, windows=(21, 63))
+    for j in range(R.shape[0]):
+        s = pd.Series(R[j])
+        for n in (21, 63):
+            mu, sd = s.rolling(n).mean(), s.rolling(n).std(ddof=0)
+            down = np.sqrt((s.clip(upper=0.0) ** 2).rolling(n).mean())
+            np.testing.assert_allclose(out[f"vol_{n}"][j], sd * np.sqrt(252), rtol=1e-7, equal_nan=True)
+            np.testing.assert_allclose(out[f"sharpe_{n}"][j], mu / sd * np.sqrt(252), rtol=1e-7, equal_nan=True)
+            np.testing.assert_allclose(out[f"sortino_{n}"][j], mu / down * np.sqrt(252), rtol=1e-7, equal_nan=True)
+    assert np.isnan(out["sharpe_63"][:, :62]).all() and np.isfinite(out["sharpe_63"][:, 62:]).all()
+
+
+def test_min_periods_and_short_series():
+    r = returns_matrix(1, 100)[0]
+    out = rolling(r, windows=(63,), min_periods=5)
+    s = pd.Series(r)
+    ref = s.rolling(63, min_periods=5).mean() / s.rolling(63, min_periods=5).std(ddof=0) * np.sqrt(252)
+    np.testing.assert_allclose(out["sharpe_63"][0], ref, rtol=1e-7, equal_nan=True)
+    assert np.isnan(rolling(r[:10], windows=(63,))["vol_63"]).all()
+
+
+def test_drawdown_and_underwater():
+    r = np.array([0.1, -0.5, 0.2, 0.0, 1.5, -0.1])
+    dd, uw = drawdown(r)
+    eq = np.cumprod(1 + r)
+    np.testing.assert_allclose(dd[0], eq / np.maximum.accumulate(eq) - 1)
+    assert uw[0].tolist() == [0, 1, 2, 3, 0, 1]
+
+
+def test_summary_and_scalars():
+    R = returns_matrix(2, 300)
+    full = summary(R)
+    s = pd.Series(R[1])
+    assert np.isclose(full["sharpe"][1], s.mean() / s.std(ddof=0) * np.sqrt(252))
+    assert np.isclose(full["final_equity"][1], np.prod(1 + R[1]))
+    one = scalars(R[0])
+    assert one["max_dd"] <= 0 and isinstance(one["max_underwater"], int)
+    assert scalars(np.zeros(10))["sharpe"] is None
+
+
+def test_payload_columnar():
+    idx = pd.bdate_range("2024-01-01", periods=80)
+    p = payload(idx, returns_matrix(1, 80)[0], windows=(63,))
+    assert p["dates"][0] == "2024-01-01" and len(p["dates"]) == 80 and p["windows"] == [63]
+    assert p["sharpe_63"][61] is None and p["sharpe_63"][62] is not None
+    assert len(p["underwater"]) == 80 and isinstance(p["underwater"][0], int)
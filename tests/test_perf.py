@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import pstats
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import perf
+
+
+def test_steps_are_noops_outside_a_stage(tmp_path, monkeypatch):
+    monkeypatch.setattr(perf, "PERF_JSON", str(tmp_path / "perf.json"))
+    with perf.step("x"):
+        perf.count("retries")
+    assert not perf.active() and not (tmp_path / "perf.json").exists()
+
+
+def test_stage_records_steps_counters_and_history(tmp_path, monkeypatch):
+    path = tmp_path / "docs" / "perf.json"
+    monkeypatch.setattr(perf, "PERF_JSON", str(path))
+    monkeypatch.setattr(perf, "HISTORY", 2)
+
+    @perf.step("fetch")
+    def fetch():
+        perf.count("retries")
+        perf.sleep(0.01)
+
+    def main():
+        for _ in range(2):
+            fetch()
+        with perf.step("parse"):
+            with perf.step("read_html"):
+                time.sleep(0.005)
+        return 7
+
+    for _ in range(3):
+        assert perf.run("demo", main) == 7
+    runs = perf.load()["stages"]["demo"]
+    assert len(runs) == 2
+    rec = runs[-1]
+    assert rec["ok"] and rec["retries"] == 2 and rec["sleep"] >= 0.02 and rec["wall"] >= rec["sleep"]
+    assert rec["steps"]["fetch"]["calls"] == 2 and rec["steps"]["fetch"]["retries"] == 2
+    assert set(rec["steps"]) == {"fetch", "parse", "parse/read_html"}
+    assert rec["http_requests"] == 0 and "cpu" in rec
+    assert not [f for f in os.listdir(path.parent) if f.endswith(".tmp")]
+
+
+def test_failed_stage_is_recorded_and_profiled(tmp_path, monkeypatch):
+    monkeypatch.setattr(perf, "PERF_JSON", str(tmp_path / "perf.json"))
+    monkeypatch.setattr(perf, "PROFILE_DIR", str(tmp_path / "prof"))
+
+    def boom():
+        raise ValueError("x")
+
+    try:
+        with perf.stage("bad", profile=True):
+            boom()
+    except ValueError:
+        pass
+    rec = perf.load()["stages"]["bad"][-1]
+    assert rec["ok"] is False and not perf.active()
+    assert pstats.Stats(rec["profile"]).total_calls > 0
@@ -0,0 +1,66 @@
+import os
+import sys
+import textwrap
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import handoff, artifacts
+from pipelines import __main__ as runner
+from pipelines import compose_outputs
+
+
+def _module(tmp_path, name, body):
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(body))
+    return {"name": name, "module": name}
+
+
+def test_frames_pass_in_memory_and_files_land_at_the_end(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(artifacts, "MANIFEST", str(tmp_path / "manifest.json"))
+    raw, out, bad = (str(tmp_path / n) for n in ("raw.csv", "out.json", "bad.json"))
+    a = _module(tmp_path, "stage_a", f"""
+        import pandas as pd
+        from core import handoff
+        def main():
+            df = pd.DataFrame({{"date": ["2024-01-02"], "value": [0.0]}})
+            handoff.put({raw!r}, df, lambda p, d: d.to_csv(p, index=False))
+    """)
+    b = _module(tmp_path, "stage_b", f"""
+        import os
+        from core import handoff
+        def main():
+            assert not os.path.exists({raw!r})  # nothing on disk until the run ends
+            df = handoff.get({raw!r})
+            handoff.write_artifact({out!r}, {{"n": len(df), "v": float(df["value"][0])}})
+    """)
+    c = _module(tmp_path, "stage_c", f"""
+        from core import handoff
+        def main():
+            handoff.write_artifact({bad!r}, {{"x": 1}})
+            raise RuntimeError("boom")
+    """)
+    a["outputs"], b["inputs"], b["outputs"] = [raw], [raw], [out]
+    c["inputs"], c["outputs"] = [raw], [bad]
+    d = {"name": "stage_d", "module": "stage_d", "inputs": [bad], "outputs": []}
+    for s in (a, b, c):
+        s.setdefault("inputs", [])
+    res = runner.run([a, b, c, d], log=lambda m: None)
+    assert [res[k]["status"] for k in ("stage_a", "stage_b", "stage_c", "stage_d")] == ["ran", "ran", "failed", "blocked"]
+    assert "boom" in res["stage_c"]["error"]
+    assert pd.read_csv(raw).shape == (1, 2) and handoff.read_json(out) == {"n": 1, "v": 0.0}
+    assert not os.path.exists(bad) and not handoff.holding()
+
+
+def test_compose_reads_held_frames_like_their_csv(tmp_path):
+    path = str(tmp_path / "breadth.csv")
+    df = pd.DataFrame({"date": pd.to_datetime(["2024-01-02", "2024-01-03"]), "value": [0.0, float("nan")],
+                       "pct_new_high": [1.5, 2.0]})
+    df.to_csv(path, index=False)
+    from_disk = [compose_outputs.read_csv_series(path), compose_outputs.read_csv_series(path, "pct_new_high")]
+    handoff.hold()
+    try:
+        handoff.put(path, df, lambda p, d: None)
+        held = [compose_outputs.read_csv_series(path), compose_outputs.read_csv_series(path, "pct_new_high")]
+    finally:
+        handoff.flush()
+    assert held == from_disk == [[["2024-01-02", 0.0], ["2024-01-03", None]], [["2024-01-02", 1.5], ["2024-01-03", 2.0]]]
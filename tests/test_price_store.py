@@ -0,0 +1,67 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.price_store import PriceStore, av_outputsize
+
+
+def _hist(end, n=300):
+    idx = pd.bdate_range(end=end, periods=n)
+    return pd.Series(np.linspace(100.0, 200.0, n), index=idx)
+
+
+def test_sync_fetches_only_missing_tail(tmp_path):
+    store = PriceStore(str(tmp_path))
+    full = _hist("2024-06-28")
+    calls = []
+
+    def fetch_tail(since):
+        calls.append(since)
+        return full if since is None else full[full.index >= since]
+
+    s1 = store.sync("SPY", lambda since: full.loc[:"2024-06-19"], now="2024-06-20")
+    assert s1.index[-1] == pd.Timestamp("2024-06-19")
+    s2 = store.sync("SPY", fetch_tail, now="2024-07-01")
+    assert calls[-1] is not None and calls[-1] < pd.Timestamp("2024-06-19")
+    assert s2.index[-1] == pd.Timestamp("2024-06-28")
+    assert np.allclose(s2.values, full.values)
+    n = len(calls)
+    store.sync("SPY", fetch_tail, now="2024-07-01")
+    assert len(calls) == n
+    assert store.stats["cold"] == 1 and store.stats["warm"] == 1 and store.stats["fresh"] == 1
+
+
+def test_append_rejects_readjusted_history(tmp_path):
+    store = PriceStore(str(tmp_path))
+    full = _hist("2024-06-28")
+    store.save("QQQ", full.iloc[:-5])
+    assert not store.append("QQQ", full.tail(10) * 0.98)
+    assert len(store.load("QQQ")) == len(full) - 5
+    assert store.append("QQQ", full.tail(10))
+    assert len(store.load("QQQ")) == len(full)
+
+
+def test_av_outputsize_picks_compact_for_short_gaps():
+    assert av_outputsize(None) == "full"
+    assert av_outputsize(None, default="compact") == "compact"
+    assert av_outputsize("2024-06-20", now="2024-07-01") == "compact"
+    assert av_outputsize("2023-01-02", now="2024-07-01") == "full"
+
+
+def test_full_caller_backfills_a_compact_history(tmp_path):
+    store = PriceStore(str(tmp_path))
+    full = _hist("2024-06-28")
+
+    def fetch(size):
+        return lambda since: full.tail(100) if since is None and size == "compact" else \
+            full if since is None else full[full.index >= since]
+
+    assert len(store.sync("SPY", fetch("compact"), now="2024-07-01", full=False)) == 100
+    # a compact caller is served the short history, a full caller backfills it once
+    assert len(store.sync("SPY", fetch("compact"), now="2024-07-01", full=False)) == 100
+    assert len(store.sync("SPY", fetch("full"), now="2024-07-01")) == len(full)
+    assert store.is_full("SPY") and store.stats["backfill"] == 1
+    assert len(store.sync("SPY", fetch("full"), now="2024-07-01")) == len(full)
+    assert store.stats["backfill"] == 1 and store.stats["fresh"] == 2
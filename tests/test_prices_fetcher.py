@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import fetchers.prices as prices
+
+
+def test_pooled_fetch_keeps_order_and_previous_values(monkeypatch):
+    def quote(sym):
+        if sym in ("SPY", "QQQ"):
+            return {"SPY": 500.123, "QQQ": 400.0}[sym]
+        raise RuntimeError("quote down")
+
+    def daily(sym):
+        if sym == "FEZ":
+            return 60.0
+        raise RuntimeError("eod down")
+
+    monkeypatch.setattr(prices, "fetch_global_quote", quote)
+    monkeypatch.setattr(prices, "fetch_daily_close", daily)
+    syms = ["SPY", "QQQ", "FEZ", "CURE", "SOXL"]
+    res = prices.fetch_all(syms, concurrency=4)
+    assert list(res) == syms
+    assert res == prices.fetch_all(syms, concurrency=1)
+    prev = {"symbols": [{"symbol": "CURE", "price": 74.15}]}
+    out = prices.merge(res, prev, syms)
+    assert [e["symbol"] for e in out] == syms
+    assert out[0] == {"symbol": "SPY", "price": 500.12}
+    assert out[2] == {"symbol": "FEZ", "price": 60.0}
+    assert out[3]["price"] == 74.15 and "fallback: eod down" in out[3]["warning"]
+    assert out[4] == {"symbol": "SOXL", "error": "quote down | fallback: eod down"}
@@ -0,0 +1,72 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+from core import regime
+from signals.namm50 import regime_from
+from synthetic import score_walk
+
+
+def _reference(x, on, off, band, hold):
+    """Plain per-day state machine for one grid point."""
+    state, held, out = 0, 10 ** 9, []
+    for v in x:
+        if not np.isnan(v):
+            target = -1 if v <= off else 1 if v >= on else 0
+            if (state == 1 and v >= on - band) or (state == -1 and v <= off + band):
+                target = state
+            if target != state and held >= hold:
+                state, held = target, 0
+        held += 1
+        out.append(state)
+    return np.array(out)
+
+
+def test_regime_from_keeps_its_labels():
+    idx = pd.bdate_range("2020-01-01", periods=9)
+    s = pd.Series([0.0, 0.5, 0.49, -0.5, -0.51, np.nan, 1.2, -3.0, 0.2], index=idx)
+    r = regime_from(s)
+    assert r.tolist()[:5] == ["Neutral", "Risk-On", "Neutral", "Risk-Off", "Risk-Off"]
+    assert pd.isna(r.iloc[5]) and r.tolist()[6:] == ["Risk-On", "Risk-Off", "Neutral"]
+    assert regime_from(pd.Series(dtype=float)).empty
+    assert regime.stance(0.5) == "Risk-On" and regime.stance(-0.5) == "Risk-Off" and regime.stance(0.0) == "Neutral"
+
+
+def test_band_and_hold():
+    x = np.array([0, 0.6, 0.4, 0.2, np.nan, -0.6, -0.4, 0.1, 0.7])
+    assert regime.classify(x).tolist() == [0, 1, 0, 0, 0, -1, 0, 0, 1]
+    assert regime.classify(x, band=0.3).tolist() == [0, 1, 1, 1, 1, -1, -1, 0, 1]
+    assert regime.classify(x, hold=3).tolist() == [0, 1, 1, 1, 1, -1, -1, -1, 1]
+    assert regime.classify(x).dtype == np.int8
+
+
+def test_grid_in_one_pass_matches_reference():
+    x, _ = score_walk(1500, missing=0.02)
+    g = regime.grid(on=(0.1, 0.4, 0.8), off=(-0.1, -0.5), band=(0.0, 0.15), hold=(1, 4))
+    codes = regime.classify(x, *(g[k].to_numpy() for k in regime.PARAMS))
+    assert codes.shape == (len(x), len(g))
+    for j, p in enumerate(g.itertuples(index=False)):
+        np.testing.assert_array_equal(codes[:, j], _reference(x, p.on, p.off, p.band, p.hold))
+
+
+def test_sweep_stats_and_workers():
+    x, close = score_walk(1500, missing=0.02)
+    g = regime.grid(on=(0.1, 0.4, 0.8), off=(-0.1, -0.5), band=(0.0, 0.15), hold=(1, 4))
+    res = regime.sweep(x, close, g, chunk=5)
+    board = res["leaderboard"]
+    assert len(board) == len(g) and board["spread"].dropna().is_monotonic_decreasing
+    fwd = regime.forward_returns(close)
+    p = board.iloc[3]
+    c = _reference(x, p["on"], p["off"], p["band"], p["hold"])
+    ok = np.isfinite(fwd)
+    on, off = (c == 1) & ok, (c == -1) & ok
+    assert p["on_days"] == on.sum() and p["off_days"] == off.sum()
+    assert p["neutral_days"] == ((c == 0) & ok).sum()
+    np.testing.assert_allclose([p["on_ret"], p["on_hit"], p["off_ret"], p["off_hit"]],
+                               [fwd[on].mean(), (fwd[on] > 0).mean(), fwd[off].mean(), (fwd[off] < 0).mean()])
+    np.testing.assert_allclose(p["turnover"], np.abs(np.diff(c)).sum() / (len(c) / regime.ANN))
+    pooled = regime.sweep(x, close, g, chunk=5, workers=2)["leaderboard"]
+    pd.testing.assert_frame_equal(board, pooled)
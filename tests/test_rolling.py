@@ -0,0 +1,78 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.rolling import RollingWindow, RollingStore
+from models.namm50 import signal
+
+
+def _rows(n, seed=0, start="2015-01-01"):
+    rng = np.random.default_rng(seed)
+    vals = 50 + np.cumsum(rng.normal(0, 1, n))
+    dates = pd.bdate_range(start, periods=n).strftime("%Y-%m-%d")
+    return [[d, float(v)] for d, v in zip(dates, vals)]
+
+
+def test_window_matches_pandas_rolling():
+    x = pd.Series(np.random.default_rng(1).normal(100, 5, 1500))
+    w = RollingWindow(180)
+    zs = w.extend(x.values)
+    ref = (x - x.rolling(180).mean()) / x.rolling(180).std(ddof=0)
+    np.testing.assert_allclose(zs, ref.values, atol=1e-9, equal_nan=True)
+    assert abs(w.mean - x.tail(180).mean()) < 1e-9
+    assert abs(w.std() - x.tail(180).std(ddof=0)) < 1e-9
+
+
+def test_incremental_z_equals_full_recompute(tmp_path):
+    series = _rows(1000)
+    path = str(tmp_path / "rolling.json")
+    for n in (40, 100, 600, 601, 650, 1000):
+        st = RollingStore(path)
+        z = signal.incremental_z(st, "naaim_exposure", series[:n])
+        st.save()
+        ref = signal.compute_z(signal.extract_values(series[:n]))
+        if np.isnan(ref):
+            assert np.isnan(z)
+        else:
+            assert abs(z - ref) < 1e-9
+    # only the new rows are folded on the next run
+    st = RollingStore(path)
+    series.append(["2030-01-01", 1.0])
+    assert list(st.update("naaim_exposure", series, window=signal.WINDOW, min_periods=signal.MIN_PERIODS)) == ["2030-01-01"]
+
+
+def test_revised_history_rebuilds_state(tmp_path):
+    path = str(tmp_path / "rolling.json")
+    series = _rows(400, seed=2)
+    st = RollingStore(path)
+    st.update("f", series, window=60)
+    st.save()
+    series[-1][1] += 10.0  # last stored value revised
+    st = RollingStore(path)
+    folded = st.update("f", series, window=60)
+    assert len(folded) == 400
+    vals = pd.Series([v for _, v in series])
+    ref = ((vals - vals.rolling(60).mean()) / vals.rolling(60).std(ddof=0)).iloc[-1]
+    assert abs(st.last_z("f") - ref) < 1e-9
+
+
+def test_revision_inside_window_rebuilds_state(tmp_path):
+    path = str(tmp_path / "rolling.json")
+    series = _rows(400, seed=3)
+    st = RollingStore(path)
+    st.update("f", series, window=60)
+    st.save()
+    series[-30][1] += 10.0  # revised inside the window, not the last row
+    series.insert(-10, [series[-11][0] + "T12", 55.0])  # and a back-filled row
+    series.append(["2030-01-01", 50.0])
+    st = RollingStore(path)
+    assert len(st.update("f", series, window=60)) == len(series)
+    vals = pd.Series([v for _, v in series])
+    ref = ((vals - vals.rolling(60).mean()) / vals.rolling(60).std(ddof=0)).iloc[-1]
+    assert abs(st.last_z("f") - ref) < 1e-9
+    # a revision older than the window leaves the z alone and folds only new rows
+    series[5][1] += 10.0
+    series.append(["2030-01-02", 51.0])
+    assert list(st.update("f", series, window=60)) == ["2030-01-02"]
@@ -0,0 +1,91 @@
+import os
+import sys
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import shared_panel
+from core.shared_panel import SharedPanel, init_worker, worker_panel
+
+
+def _items():
+    idx = pd.bdate_range("2020-01-01", periods=300, name="date")
+    rng = np.random.default_rng(0)
+    fac = pd.DataFrame(rng.normal(size=(300, 4)), index=idx, columns=["naaim", "ndx", "fred", "vix"])
+    close = pd.Series(100 + np.cumsum(rng.normal(size=300)), index=idx, name="close")
+    return {"factors": fac, "close": close, "grid": rng.random((7, 4)), "ret": np.arange(5.0)}
+
+
+def _exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _job(key):
+    return float(np.nansum(worker_panel().array(key)))
+
+
+def _crash(_):
+    os._exit(3)
+
+
+def test_round_trip_zero_copy_and_read_only():
+    items = _items()
+    with SharedPanel.create(items) as owner:
+        panel = SharedPanel.attach(owner.spec)
+        pd.testing.assert_frame_equal(panel.get("factors"), items["factors"], check_freq=False)
+        pd.testing.assert_series_equal(panel.get("close"), items["close"], check_freq=False)
+        np.testing.assert_array_equal(panel.get("grid"), items["grid"])
+        np.testing.assert_array_equal(panel.get("ret"), items["ret"])
+        assert np.shares_memory(panel.get("factors").to_numpy(), panel.array("factors"))
+        with pytest.raises(ValueError):
+            panel.array("close")[0] = 1.0
+        panel.close()
+    assert not _exists(owner.name)
+
+
+def test_workers_attach_and_exit_without_removing_the_block():
+    items = _items()
+    with SharedPanel.create(items) as panel:
+        with ProcessPoolExecutor(2, initializer=init_worker, initargs=(panel.spec,)) as ex:
+            got = list(ex.map(_job, ["factors", "close", "grid"]))
+        np.testing.assert_allclose(got, [items["factors"].to_numpy().sum(), items["close"].sum(),
+                                         items["grid"].sum()])
+        assert _exists(panel.name)
+    assert not _exists(panel.name)
+
+
+def test_worker_crash_leaves_owner_usable_and_cleans_up():
+    items = _items()
+    with pytest.raises(BrokenProcessPool):
+        with SharedPanel.create(items) as panel:
+            with ProcessPoolExecutor(2, initializer=init_worker, initargs=(panel.spec,)) as ex:
+                list(ex.map(_crash, range(4)))
+    assert not _exists(panel.name)
+
+
+@pytest.mark.skipif(not os.path.isdir(shared_panel.SHM_DIR), reason="no /dev/shm")
+def test_reap_removes_blocks_of_dead_owners():
+    p = subprocess.Popen([sys.executable, "-c", "pass"])
+    p.wait()
+    name = f"{shared_panel.PREFIX}{p.pid}_dead"
+    with open(os.path.join(shared_panel.SHM_DIR, name), "wb") as f:
+        f.write(bytes(64))
+    assert name in shared_panel.reap()
+    assert not _exists(name)
+
+
+def test_rejects_unsupported_inputs():
+    with pytest.raises(ValueError):
+        SharedPanel.create({"x": pd.Series([1.0], index=pd.DatetimeIndex(["2024-01-02"], tz="UTC"))})
+    with pytest.raises(ValueError):
+        SharedPanel.create({"x": np.zeros((2, 2, 2))})
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import artifacts, calendar
+from core.rolling import RollingStore
+from models.namm50 import signal
+
+WEIGHTS = {"NAAM": 0.4, "FRED": 0.3, "NDX50": 0.2, "UNRATE": 0.1}
+
+
+def _rows(dates, seed, gaps=False):
+    rng = np.random.default_rng(seed)
+    vals = 50 + np.cumsum(rng.normal(0, 1, len(dates)))
+    rows = [[d.strftime("%Y-%m-%d"), round(float(v), 4)] for d, v in zip(dates, vals)]
+    if gaps:
+        for r in rows[5::17]:
+            r[1] = None
+    return rows
+
+
+def _factors(end="2024-06-28"):
+    start = "2019-01-01"
+    return {
+        "naaim_exposure": {"series": _rows(pd.date_range(start, end, freq="W-WED"), 0)},
+        "fred_macro": {"series": _rows(pd.date_range(start, end, freq="D"), 1, gaps=True)},
+        "ndx_breadth": {"series": _rows(pd.bdate_range(start, end), 2)},
+        "unrate": {"series": _rows(pd.date_range(start, end, freq="MS"), 3)},
+    }
+
+
+def _cut(factors, end):
+    return {k: {"series": [r for r in v["series"] if r[0] <= end]} for k, v in factors.items()}
+
+
+def test_z_matches_live_rolling_state(tmp_path):
+    factors = _factors()
+    cols = signal.z_columns(factors)
+    st = RollingStore(str(tmp_path / "state.json"))
+    for fid, spec in factors.items():
+        live = signal.incremental_z(st, fid, spec["series"])
+        assert abs(cols[fid].iloc[-1] - live) < 1e-8
+        # and the expanding-then-rolling z for an earlier row, as the live signal saw it then
+        n = min(100, len(spec["series"]) - 5)
+        st2 = RollingStore(str(tmp_path / f"{fid}.json"))
+        early = signal.incremental_z(st2, fid, spec["series"][:n])
+        assert abs(cols[fid][cols[fid].index <= spec["series"][n - 1][0]].iloc[-1] - early) < 1e-8
+
+
+def test_history_is_point_in_time():
+    factors = _factors()
+    idx, score, used = signal.score_history(factors, WEIGHTS, end="2024-06-28")
+    assert idx.equals(calendar.sessions(idx[0], "2024-06-28")) and used.max() == 4
+    # what the history shows for a session never changes once later rows arrive
+    for day in ("2021-03-03", "2023-11-15", "2024-06-12"):
+        i, s, _ = signal.score_history(_cut(factors, day), WEIGHTS, end=day)
+        assert i[-1] == pd.Timestamp(day) and np.isclose(s[-1], score[idx.get_loc(i[-1])])
+    # NAAIM dated Wednesday 2024-06-12 enters on Thursday
+    wed = _cut(factors, "2024-06-12")
+    before = _cut(factors, "2024-06-11")
+    wed["naaim_exposure"], before["naaim_exposure"] = before["naaim_exposure"], wed["naaim_exposure"]
+    _, s1, _ = signal.score_history(wed, WEIGHTS, end="2024-06-12")
+    _, s2, _ = signal.score_history(before, WEIGHTS, end="2024-06-13")
+    assert np.isclose(s1[-1], score[idx.get_loc(pd.Timestamp("2024-06-12"))])
+    assert not np.isclose(s2[-1], s1[-1])
+
+
+def test_incremental_extension_equals_full_rebuild():
+    factors = _factors("2024-06-28")
+    full = signal.history(factors, WEIGHTS, end="2024-06-28")
+    assert full["update"]["mode"] == "full"
+    prev = json.loads(json.dumps(signal.history(_cut(factors, "2024-03-15"), WEIGHTS, end="2024-03-15")))
+    ext = signal.history(factors, WEIGHTS, prev, end="2024-06-28")
+    assert ext["update"]["mode"] == "incremental" and ext["update"]["added"] > 60
+    assert ext["dates"] == full["dates"] and ext["stance"] == full["stance"]
+    np.testing.assert_allclose(ext["score"], full["score"], atol=1e-6)
+    assert ext["factors_used"] == full["factors_used"]
+    # new weights rebuild from scratch
+    assert signal.history(_factors(), dict(WEIGHTS, NAAM=0.5), full, end="2024-06-28")["update"]["mode"] == "full"
+
+
+def _revised(factors, fid, date, delta=1.0):
+    out = json.loads(json.dumps(factors))
+    for r in out[fid]["series"]:
+        if r[0] == date:
+            r[1] += delta
+    return out
+
+
+def test_revision_before_redo_window_rebuilds_history():
+    factors = _factors("2024-06-28")
+    prev = json.loads(json.dumps(signal.history(factors, WEIGHTS, end="2024-06-28")))
+    assert prev["inputs"]["before"] < "2024-05-01"
+    # a revision inside the redo window is simply redone
+    late = _revised(factors, "unrate", "2024-06-01")
+    ext = signal.history(late, WEIGHTS, prev, end="2024-06-28")
+    assert ext["update"]["mode"] == "incremental"
+    np.testing.assert_allclose(ext["score"], signal.history(late, WEIGHTS, end="2024-06-28")["score"], atol=1e-6)
+    # one to an earlier row, or a back-filled old row, changes kept sessions: full rebuild
+    early = _revised(factors, "unrate", "2023-06-01")
+    ext = signal.history(early, WEIGHTS, prev, end="2024-06-28")
+    assert ext["update"]["mode"] == "full"
+    assert ext["score"] != prev["score"]
+    backfill = json.loads(json.dumps(factors))
+    backfill["naaim_exposure"]["series"].insert(0, ["2018-12-26", 40.0])
+    assert signal.history(backfill, WEIGHTS, prev, end="2024-06-28")["update"]["mode"] == "full"
+
+
+def test_main_publishes_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "MANIFEST", str(tmp_path / "manifest.json"))
+    fact, model = tmp_path / "factors.json", tmp_path / "model.json"
+    fact.write_text(json.dumps({"factors": _factors()}))
+    model.write_text(json.dumps({"weights": WEIGHTS}))
+    for name, path in {"FACT": fact, "MODEL": model, "OUT": tmp_path / "sig.json", "STATE": tmp_path / "st.json",
+                       "HISTORY_JSON": tmp_path / "hist.json", "HISTORY_CSV": tmp_path / "hist.csv"}.items():
+        monkeypatch.setattr(signal, name, str(path))
+    signal.main()
+    hist = json.loads((tmp_path / "hist.json").read_text())
+    csv = pd.read_csv(tmp_path / "hist.csv")
+    assert len(hist["dates"]) == len(csv) > 1000
+    assert set(hist["stance"]) <= {"Risk-On", "Risk-Off", "Neutral"}
+    signal.main()
+    assert json.loads((tmp_path / "hist.json").read_text())["dates"] == hist["dates"]
+
+
+def test_search_ranks_on_live_z(tmp_path, monkeypatch):
+    from core import backtest
+    from models.namm50 import train
+    factors = {k: v for k, v in _factors().items() if k != "unrate"}
+    path = tmp_path / "factors.json"
+    path.write_text(json.dumps({"factors": factors}))
+    zf = train.load_z_frame(str(path))
+    assert list(zf.columns) == ["NAAM", "FRED", "NDX50"]
+    seen = []
+    norm = backtest.normalize
+    monkeypatch.setattr(backtest, "normalize", lambda X, **kw: seen.append(norm(X, **kw)) or seen[-1])
+    monkeypatch.setattr(train, "GRID_LEVELS", 2)
+    close = pd.Series(100 + np.arange(len(zf)) * 0.01, index=zf.index)
+    train.train_weights(zf, close, mode="grid")
+    # the z the search saw at the last session is the live signal's z for each factor
+    st = RollingStore(str(tmp_path / "state.json"))
+    live = [signal.incremental_z(st, fid, factors[fid]["series"]) for fid in factors]
+    np.testing.assert_allclose(seen[0][-1], live, atol=1e-8)
+
+
+def test_incremental_redoes_sessions_a_lagged_source_fills_later():
+    days = pd.bdate_range("2019-01-01", "2024-07-01")
+    full = {"vix_cls": {"series": _rows(days, 4)}, "dgs10": {"series": _rows(days, 5)}}
+    w = {"VIXCLS": 0.5, "DGS10": 0.5}
+    # run 1: dgs10 ends two days before vix_cls
+    first = {"vix_cls": {"series": [r for r in full["vix_cls"]["series"] if r[0] <= "2024-06-28"]},
+             "dgs10": {"series": [r for r in full["dgs10"]["series"] if r[0] <= "2024-06-26"]}}
+    prev = json.loads(json.dumps(signal.history(first, w, end="2024-06-28")))
+    # run 2: the missing dgs10 rows arrive and the history extends to 2024-07-01
+    ext = signal.history(full, w, prev, end="2024-07-01")
+    rebuilt = signal.history(full, w, end="2024-07-01")
+    assert ext["update"]["mode"] == "incremental" and ext["update"]["added"] == 1
+    assert ext["update"]["redone"] > 30
+    assert ext["dates"] == rebuilt["dates"] and ext["stance"] == rebuilt["stance"]
+    np.testing.assert_allclose(ext["score"], rebuilt["score"], atol=1e-6)
+    i = ext["dates"].index("2024-06-28")
+    assert not np.isclose(prev["score"][prev["dates"].index("2024-06-28")], ext["score"][i])
+
+
+def test_search_keeps_default_weights_without_a_finite_sharpe(monkeypatch):
+    from models.namm50 import train
+    board = pd.DataFrame({"NAAM": [-0.5, 1.0], "FRED": [1.5, 0.0], "sharpe": np.nan, "gross_sharpe": np.nan,
+                          "turnover": 0.0})
+    monkeypatch.setattr(train, "search", lambda *a, **k: {"leaderboard": board, "seconds": 0.1, "throughput": 20.0})
+    idx = calendar.sessions("2023-01-03", "2023-12-29")
+    zf = pd.DataFrame({"NAAM": 0.1, "FRED": 0.5}, index=idx)
+    best, _, _ = train.train_weights(zf, pd.Series(100.0, index=idx), mode="grid")
+    assert best == {**{k: 0.0 for k in train.SEARCH_KEYS}, **train.DEFAULT_WEIGHTS}
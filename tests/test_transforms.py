@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core import transforms
+from core.transforms import compute, compute_registry, registry_specs, wilder
+
+
+def _panel(n=600, tickers=("QQQ", "SPY", "IWM"), seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2015-01-01", periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n, len(tickers))), axis=0))
+    close[:40, -1] = np.nan
+    hl = np.abs(rng.normal(0, 0.005, close.shape))
+    mk = lambda a: pd.DataFrame(a, index=idx, columns=list(tickers))
+    return {"close": mk(close), "high": mk(close * (1 + hl)), "low": mk(close * (1 - hl))}
+
+
+def _wilder_loop(col, n):
+    out, avg, seen = np.full(len(col), np.nan), None, []
+    for t, v in enumerate(col):
+        if avg is None:
+            if np.isfinite(v):
+                seen.append(v)
+            if len(seen) == n:
+                avg = np.mean(seen)
+                out[t] = avg
+        else:
+            if np.isfinite(v):
+                avg += (v - avg) / n
+            out[t] = avg
+    return out
+
+
+def test_wilder_matches_recursive_definition():
+    x = np.random.default_rng(1).normal(size=(200, 3))
+    x[:7, 1] = np.nan
+    x[30:33, 2] = np.nan
+    w = wilder(x, 14)
+    for j in range(3):
+        np.testing.assert_allclose(w[:, j], _wilder_loop(x[:, j], 14), atol=1e-12, equal_nan=True)
+
+
+def test_transforms_match_per_series_pandas():
+    p = _panel()
+    specs = {"rsi_qqq": ("QQQ", "rsi_14"), "rsi_iwm": ("IWM", "rsi_14"), "atr_spy": ("SPY", "atrp_14"),
+             "mom_qqq": ("QQQ", "mom_12m_1m"), "vol_spy": ("SPY", "vol_20"), "gap": ("IWM", "sma_gap_50"),
+             "dd": ("QQQ", "dd_100"), "r5": ("SPY", "ret_5")}
+    out = compute(p, specs)
+    assert list(out.columns) == list(specs)
+    c = p["close"]
+    d = c["IWM"].diff().to_numpy()
+    up = _wilder_loop(np.where(np.isfinite(d), np.maximum(d, 0), np.nan), 14)
+    dn = _wilder_loop(np.where(np.isfinite(d), np.maximum(-d, 0), np.nan), 14)
+    np.testing.assert_allclose(out["rsi_iwm"], 100 - 100 / (1 + up / dn), atol=1e-9, equal_nan=True)
+    h, l, pc = p["high"]["SPY"], p["low"]["SPY"], c["SPY"].shift(1)
+    tr = pd.concat([h - l, (h - pc).abs(), (l - pc).abs()], axis=1).max(axis=1).where(pc.notna())
+    np.testing.assert_allclose(out["atr_spy"], _wilder_loop(tr.to_numpy(), 14) / c["SPY"] * 100, atol=1e-9,
+                               equal_nan=True)
+    pd.testing.assert_series_equal(out["mom_qqq"], c["QQQ"].shift(21) / c["QQQ"].shift(252) - 1, check_names=False)
+    pd.testing.assert_series_equal(out["vol_spy"], c["SPY"].pct_change().rolling(20).std() * np.sqrt(252),
+                                   check_names=False)
+    pd.testing.assert_series_equal(out["gap"], c["IWM"] / c["IWM"].rolling(50).mean() - 1, check_names=False)
+    pd.testing.assert_series_equal(out["dd"], c["QQQ"] / c["QQQ"].rolling(100).max() - 1, check_names=False)
+    assert abs(out["r5"].iloc[-1] - (c["SPY"].iloc[-1] / c["SPY"].iloc[-6] - 1)) < 1e-12
+
+
+def test_registry_loads_each_ticker_once(tmp_path):
+    reg = {"factors": {"a": {"source": "prices", "ticker": "QQQ", "transform": "rsi_14"},
+                       "b": {"source": "prices", "ticker": "QQQ", "transform": "atrp_14"},
+                       "c": {"source": "prices", "ticker": "SPY", "transform": "rsi_14"},
+                       "d": {"source": "fred", "code": "DGS10"}}}
+    path = str(tmp_path / "registry.yml")
+    with open(path, "w") as f:
+        json.dump(reg, f)
+    calls = []
+
+    def loader(tickers):
+        calls.append(list(tickers))
+        return _panel(tickers=("QQQ", "SPY"))
+    out = compute_registry(path, loader=loader)
+    assert calls == [["QQQ", "SPY"]] and list(out.columns) == ["a", "b", "c"]
+    assert set(registry_specs()) >= {"mom_qqq_12m1m", "rsi_qqq_14", "rsi_spy_14", "atr_qqq_14"}
+    try:
+        transforms.resolve("nope_3")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown transform accepted")
+    for name in ("vol_1", "vol_0", "rsi_0"):
+        try:
+            transforms.resolve(name)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{name} accepted")
+    transforms.resolve("vol_2")
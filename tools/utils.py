@@ -1,3 +1,30 @@
 
 # Backward-compat shim to core.utils
+import os
 from core.utils import ensure_dir, ts_now_iso, write_json, zscore
+
+
+def safe_write_csv(df, path: str) -> None:
+    """Write a DataFrame (date as a column) via a temp file, so readers never see half a file."""
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def write_placeholder_csv(path: str, columns) -> None:
+    """Header-only CSV so downstream readers find the file."""
+    ensure_dir(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(columns) + "\n")
+
+
+def load_prev_csv(path: str):
+    """The previous CSV as a DataFrame, or None if it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    import pandas as pd  # lazy
+    try:
+        return pd.read_csv(path)
+    except Exception:
+        return None